@@ -156,12 +156,66 @@ class AI:
 
         return file
 
-    def get_n_analyses_from_openai(self, telemetry_objects: list):
+    def upload_image_bytes(
+        self, image_bytes: bytes, filename: str, mime_type: str = "image/jpeg"
+    ):
+        """
+        Upload an in-memory image to OpenAI and return its file object.
+
+        Args:
+            image_bytes (bytes): Encoded image data.
+            filename (str): Name to give the uploaded file.
+            mime_type (str): Content type of ``image_bytes``.
+
+        Returns:
+            FileObject: The uploaded OpenAI file.
+        """
+        file = self.client.files.create(
+            file=(filename, image_bytes, mime_type), purpose="vision"
+        )
+
+        return file
+
+    def upload_telemetry_object(self, telemetry_object):
+        """
+        Upload one telemetry object's frame, from memory when it was streamed.
+
+        A reduced AI payload is sent instead of the frame when one was prepared,
+        and dropped once uploaded. Objects that already have an OpenAI file ID
+        are left alone.
+
+        Returns:
+            tuple: ``(filepath, file_id)``; ``file_id`` is None if the upload failed.
+        """
+        if telemetry_object.openai_file_id:
+            return telemetry_object.filepath, telemetry_object.openai_file_id
+        try:
+            if getattr(telemetry_object, "payload_bytes", None):
+                file = self.upload_image_bytes(
+                    telemetry_object.payload_bytes,
+                    telemetry_object.payload_filename,
+                    telemetry_object.payload_mime_type,
+                )
+                telemetry_object.payload_bytes = None
+            elif getattr(telemetry_object, "image_bytes", None):
+                file = self.upload_image_bytes(
+                    telemetry_object.image_bytes, telemetry_object.filename
+                )
+            else:
+                file = self.upload_image(telemetry_object.filepath)
+            telemetry_object.openai_file_id = file.id
+            return telemetry_object.filepath, file.id
+        except Exception as e:
+            logger.ai(f"Failed to upload {telemetry_object.filepath}: {e}")
+            return telemetry_object.filepath, None
+
+    def get_n_analyses_from_openai(self, telemetry_objects: list, assistant_id=None):
         """
         Analyze a batch of telemetry objects using OpenAI and return the populated objects.
 
         Args:
             telemetry_objects (list): List of telemetry objects.
+            assistant_id (str): Assistant to run; defaults to ``self.current_assistant_id``.
 
         Returns:
             list: Telemetry objects with analysis results populated.
@@ -191,10 +245,13 @@ class AI:
 
             # Add file references to the message
             for obj in telemetry_objects:
+                image_file = {"file_id": obj.openai_file_id}
+                if getattr(obj, "payload_detail", None):
+                    image_file["detail"] = obj.payload_detail
                 user_message_content.append(
                     {
                         "type": "image_file",
-                        "image_file": {"file_id": obj.openai_file_id},
+                        "image_file": image_file,
                     }
                 )
 
@@ -219,7 +276,8 @@ class AI:
             """
             try:
                 run = self.client.beta.threads.runs.create_and_poll(
-                    thread_id=thread_id, assistant_id=self.current_assistant_id
+                    thread_id=thread_id,
+                    assistant_id=assistant_id or self.current_assistant_id,
                 )
                 # Extract token usage if available
                 total_tokens = run.usage.total_tokens if run.usage else 0
@@ -306,23 +364,14 @@ class AI:
             dict: Mapping of filenames to OpenAI file IDs.
         """
 
-        def _upload_file_to_openai(telemetry_object):
-            try:
-                file = self.upload_image(telemetry_object.filepath)
-                telemetry_object.openai_file_id = file.id
-                return telemetry_object.filepath, file.id
-            except Exception as e:
-                logger.ai(f"Failed to upload {telemetry_object.filepath}: {e}")
-                return telemetry_object.filepath, None
-
         if multithreaded:
             from concurrent.futures import ThreadPoolExecutor
 
             with ThreadPoolExecutor(max_workers=20) as executor:
-                executor.map(_upload_file_to_openai, telemetry_objects)
+                executor.map(self.upload_telemetry_object, telemetry_objects)
         else:
             for telemetry_object in telemetry_objects:
-                _upload_file_to_openai(telemetry_object)
+                self.upload_telemetry_object(telemetry_object)
 
     def run_all_analyses(
         self,
@@ -344,7 +393,7 @@ class AI:
         """
 
         def _process_batch(batch):
-            result = self.get_n_analyses_from_openai(batch)
+            result = self.get_n_analyses_from_openai(batch, assistant_id)
             return result if result is not None else []
 
         # Create batches
@@ -353,18 +402,21 @@ class AI:
             for i in range(0, len(telemetry_objects), batch_size)
         ]
 
+        # Resolved locally so concurrent runs with different assistants don't mix
+        assistant_id = self.current_assistant_id
         if assistant == "batch":
             if not self.batch_assistant_id:
                 self.create_assistant(type="batch")
-            self.current_assistant_id = self.batch_assistant_id
+            assistant_id = self.batch_assistant_id
         elif assistant == "greenway":
             if not self.greenway_assistant_id:
                 self.create_assistant(type="greenway")
-            self.current_assistant_id = self.greenway_assistant_id
+            assistant_id = self.greenway_assistant_id
         elif assistant == "checker":
             if not self.checker_assistant_id:
                 self.create_assistant(type="checker")
-            self.current_assistant_id = self.checker_assistant_id
+            assistant_id = self.checker_assistant_id
+        self.current_assistant_id = assistant_id
 
         if multithreaded:
             from concurrent.futures import ThreadPoolExecutor
@@ -0,0 +1,469 @@
+# avl.py
+import os
+import re
+import csv
+import json
+import datetime
+from functools import lru_cache
+import numpy as np
+from logging_config import logger
+from sampling import haversine_m
+from telemetry import GPS_QUALITY_THRESHOLDS, Track, to_datetime
+
+# Column names tried, in order, for each channel of an AVL export (case-insensitive)
+AVL_FIELDS = {
+    "time": (
+        "timestamp",
+        "time",
+        "datetime",
+        "date_time",
+        "gps_time",
+        "event_time",
+        "recorded_at",
+    ),
+    "lat": ("lat", "latitude"),
+    "lon": ("lon", "lng", "long", "longitude"),
+    "speed": ("speed_ms", "speed_kph", "speed_kmh", "speed_mph", "speed"),
+    "dop": ("hdop", "pdop", "dop"),
+    "vehicle": (
+        "vehicle",
+        "vehicle_id",
+        "unit",
+        "unit_id",
+        "asset",
+        "asset_id",
+        "truck",
+    ),
+}
+# m/s per unit, by speed column suffix; a bare 'speed' column uses $AVL_SPEED_UNIT
+SPEED_UNITS = {"ms": 1.0, "kph": 1 / 3.6, "kmh": 1 / 3.6, "mph": 0.44704}
+AVL_FIX = 3  # Telematics units only log positions they have a fix for
+AVL_MAX_GAP_S = 30.0  # They report every 10-30 s, not every second like the GoPro
+AVL_WINDOW_MARGIN_S = 120.0  # AVL history kept around a recording window
+CLOCK_OFFSET_SEARCH_S = 600.0  # Offsets tried by estimate_clock_offset, either way
+CLOCK_OFFSET_STEP_S = 1.0
+CLOCK_OFFSET_MAX_ERROR_M = 50.0  # A best fit worse than this is not trusted
+CLOCK_OFFSET_SAMPLES = 300  # Reference fixes compared per candidate offset
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+UTC_OFFSET = re.compile(r"\d[+-]\d{2}:?\d{2}$")
+
+
+def parse_times(values) -> np.ndarray:
+    """
+    Parse AVL timestamps to UTC ``datetime64[ms]``.
+
+    Accepts ISO 8601 text (with or without a UTC offset; naive times are
+    taken as UTC) and Unix epoch seconds or milliseconds.
+
+    Args:
+        values (list): Timestamps as text or numbers.
+
+    Returns:
+        np.ndarray: ``datetime64[ms]``, NaT where a value cannot be parsed.
+    """
+    texts = [str(value).strip() for value in values]
+    if all(ISO_DATE.match(text) and not UTC_OFFSET.search(text) for text in texts):
+        try:
+            return np.array(
+                [text.removesuffix("Z") for text in texts], dtype="datetime64[ms]"
+            )
+        except ValueError:
+            pass  # Epochs or odd formats; parse one at a time
+
+    times = np.full(len(texts), np.datetime64("NaT", "ms"))
+    for i, text in enumerate(texts):
+        try:
+            number = float(text)
+            times[i] = np.datetime64(
+                int(number if number > 1e11 else number * 1000), "ms"
+            )
+            continue
+        except ValueError:
+            pass
+        try:
+            parsed = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        times[i] = np.datetime64(parsed, "ms")
+    return times
+
+
+def _read_rows(path) -> list:
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as avl_file:
+            return list(csv.DictReader(avl_file))
+
+    with open(path) as avl_file:
+        data = json.load(avl_file)
+    if isinstance(data, dict) and data.get("type") == "FeatureCollection":
+        rows = []
+        for feature in data["features"]:
+            lon, lat = feature["geometry"]["coordinates"][:2]
+            rows.append({**(feature.get("properties") or {}), "lat": lat, "lon": lon})
+        return rows
+    if isinstance(data, dict):
+        # Wrapped exports: the first list of records, e.g. {"data": [...]}
+        data = next((value for value in data.values() if isinstance(value, list)), [])
+    return data
+
+
+def _field(columns, channel):
+    return next((name for name in AVL_FIELDS[channel] if name in columns), None)
+
+
+def _numbers(rows, name) -> np.ndarray:
+    if name is None:
+        return np.full(len(rows), np.nan)
+    values = np.full(len(rows), np.nan)
+    for i, row in enumerate(rows):
+        try:
+            values[i] = float(row[name])
+        except (TypeError, ValueError, KeyError):
+            pass  # Blank cells and placeholders
+    return values
+
+
+def read_avl(path, vehicle: str = None) -> Track:
+    """
+    Read a telematics (AVL) export into a Track.
+
+    CSV, JSON lists of records and GeoJSON FeatureCollections are read;
+    columns are matched by the names in ``AVL_FIELDS``. A directory is read
+    as one log of all the exports in it.
+
+    Args:
+        path (str): Export file, or a directory of them.
+        vehicle (str): Keep only this vehicle's rows, when the export has a
+            vehicle column.
+
+    Returns:
+        Track: Points sorted by time, with no video offsets and no base time.
+    """
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.lower().endswith((".csv", ".json", ".geojson"))
+        )
+        tracks = [read_avl(file, vehicle) for file in files]
+        return Track.concatenate(tracks) if tracks else _empty_track(path)
+
+    rows = [
+        {str(k).strip().lower(): v for k, v in row.items()} for row in _read_rows(path)
+    ]
+    columns = set().union(*rows) if rows else set()
+    time_field, lat_field, lon_field = (
+        _field(columns, c) for c in ("time", "lat", "lon")
+    )
+    if rows and None in (time_field, lat_field, lon_field):
+        raise ValueError(
+            f"{path} has no recognizable time, latitude and longitude columns: "
+            f"{sorted(columns)}"
+        )
+
+    vehicle_field = _field(columns, "vehicle")
+    if vehicle is not None and vehicle_field is not None:
+        rows = [row for row in rows if str(row.get(vehicle_field)) == str(vehicle)]
+    elif (
+        vehicle_field is not None and len({row.get(vehicle_field) for row in rows}) > 1
+    ):
+        logger.warning(
+            f"{path} holds several vehicles and none was chosen; set $AVL_VEHICLE_ID."
+        )
+
+    speed_field = _field(columns, "speed")
+    unit = (
+        speed_field.rsplit("_", 1)[-1] if speed_field and "_" in speed_field else None
+    )
+    unit = unit or os.getenv("AVL_SPEED_UNIT", "mph")
+
+    time = parse_times([row.get(time_field) for row in rows])
+    lat = _numbers(rows, lat_field)
+    lon = _numbers(rows, lon_field)
+    speed = _numbers(rows, speed_field) * SPEED_UNITS[unit]
+    dop = _numbers(rows, _field(columns, "dop"))
+
+    valid = ~np.isnat(time) & np.isfinite(lat) & np.isfinite(lon)
+    order = np.argsort(time[valid], kind="stable")
+    keep = np.flatnonzero(valid)[order]
+    keep = keep[np.unique(time[keep], return_index=True)[1]]  # One point per time
+    logger.info(
+        f"Read {len(keep)} AVL points from {path} ({len(rows) - len(keep)} unusable)."
+    )
+    return Track(
+        time=time[keep],
+        lat=lat[keep],
+        lon=lon[keep],
+        speed_2d=speed[keep],
+        fix=np.full(len(keep), AVL_FIX, dtype=np.int8),
+        dop=dop[keep],
+        source=path,
+    )
+
+
+def _empty_track(source) -> Track:
+    return Track(
+        time=np.zeros(0, dtype="datetime64[ms]"), lat=[], lon=[], source=source
+    )
+
+
+def _select(track: Track, mask) -> Track:
+    return Track(
+        time=track.time[mask],
+        lat=track.lat[mask],
+        lon=track.lon[mask],
+        altitude=track.altitude[mask],
+        speed_2d=track.speed_2d[mask],
+        speed_3d=track.speed_3d[mask],
+        fix=track.fix[mask],
+        dop=track.dop[mask],
+        offset=track.offset[mask],
+        base_time=track.base_time,
+        source=track.source,
+    )
+
+
+def estimate_clock_offset(
+    avl: Track,
+    reference: Track,
+    search_s=CLOCK_OFFSET_SEARCH_S,
+    step_s=CLOCK_OFFSET_STEP_S,
+    max_error_m=CLOCK_OFFSET_MAX_ERROR_M,
+):
+    """
+    Find how far the AVL clock lags the reference (GoPro GPS) clock.
+
+    Every candidate offset is scored at once: the AVL track is interpolated
+    at the trusted reference fix times shifted by each candidate (one
+    flattened ``np.interp``), and the candidate with the smallest median
+    distance to the reference positions wins.
+
+    Args:
+        avl (Track): The AVL track.
+        reference (Track): A GoPro track, trusted fixes only are used.
+        search_s (float): Largest offset tried, either way.
+        step_s (float): Spacing of the candidate offsets.
+        max_error_m (float): Best median distance still accepted.
+
+    Returns:
+        tuple: ``(offset_s, median_m)``, where ``avl.time + offset_s`` is on
+        the reference clock, or None if the tracks do not overlap well enough.
+    """
+    trusted = reference.gps_issues() == None  # noqa: E711 (elementwise)
+    if len(avl) < 2 or trusted.sum() < 2:
+        return None
+    picks = np.flatnonzero(trusted)
+    picks = picks[
+        np.linspace(0, len(picks) - 1, min(len(picks), CLOCK_OFFSET_SAMPLES)).astype(
+            int
+        )
+    ]
+    reference_ms = reference.time[picks].astype(np.int64).astype(np.float64)
+    avl_ms = avl.time.astype(np.int64).astype(np.float64)
+
+    candidates = np.arange(-search_s, search_s + step_s / 2, step_s)
+    # AVL time of each reference fix under each candidate offset
+    queries = (reference_ms[None, :] - candidates[:, None] * 1000).ravel()
+    lat = np.interp(queries, avl_ms, avl.lat)
+    lon = np.interp(queries, avl_ms, avl.lon)
+    count = len(candidates)
+    distance = haversine_m(
+        lat,
+        lon,
+        np.tile(reference.lat[picks], count),
+        np.tile(reference.lon[picks], count),
+    )
+    distance[(queries < avl_ms[0]) | (queries > avl_ms[-1])] = (
+        np.nan
+    )  # No extrapolation
+    distance = distance.reshape(count, len(picks))
+
+    covered = np.sum(np.isfinite(distance), axis=1) >= max(2, len(picks) // 2)
+    if not covered.any():
+        return None
+    median = np.full(count, np.inf)
+    median[covered] = np.nanmedian(distance[covered], axis=1)
+    best = int(np.argmin(median))
+    if median[best] > max_error_m:
+        return None
+    return float(candidates[best]), float(median[best])
+
+
+def fill_gaps(
+    primary: Track,
+    fallback: Track,
+    thresholds: dict = None,
+    base_time: datetime.datetime = None,
+) -> Track:
+    """
+    Trusted points of ``primary``, plus ``fallback`` points wherever
+    ``primary`` has no trusted fix within ``max_gap_s``.
+
+    Args:
+        primary (Track): The GoPro track, or None.
+        fallback (Track): AVL points on the same timeline.
+        thresholds (dict): Overrides for ``telemetry.GPS_QUALITY_THRESHOLDS``.
+        base_time (datetime): Base time of the merged track; defaults to
+            ``primary``'s.
+
+    Returns:
+        Track: The merged track, sorted by time.
+    """
+    if primary is None or not len(primary):
+        return fallback
+    limits = {**GPS_QUALITY_THRESHOLDS, **(thresholds or {})}
+    trusted = _select(primary, primary.gps_issues(limits) == None)  # noqa: E711
+    near = np.zeros(len(fallback), dtype=bool)
+    if len(trusted):
+        after = np.minimum(
+            np.searchsorted(trusted.time, fallback.time), len(trusted) - 1
+        )
+        before = np.maximum(after - 1, 0)
+        gap = (
+            np.minimum(
+                np.abs(fallback.time - trusted.time[before]),
+                np.abs(trusted.time[after] - fallback.time),
+            ).astype(np.float64)
+            / 1000
+        )
+        near = gap <= limits["max_gap_s"]
+    filled = _select(fallback, ~near)
+    logger.info(
+        f"Kept {len(trusted)} of {len(primary)} GoPro fixes and filled the gaps "
+        f"with {len(filled)} AVL points."
+    )
+    return Track.concatenate(
+        [trusted, filled], base_time=base_time or primary.base_time
+    )
+
+
+class AvlSource:
+    """
+    A truck's telematics (AVL) GPS log, the fallback telemetry source when a
+    GoPro has no usable GPS of its own.
+
+    The export is read once. For each recording, the points around its
+    window are moved onto the video's clock and returned as a ``Track``
+    with video offsets, so frames join to them exactly as to a GoPro track.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        vehicle: str = None,
+        clock_offset_s: float = None,
+        max_gap_s: float = AVL_MAX_GAP_S,
+    ):
+        """
+        Args:
+            path (str): AVL export file, or a directory of exports.
+            vehicle (str): Vehicle ID to keep, for fleet-wide exports.
+            clock_offset_s (float): Seconds the video clock runs ahead of the
+                AVL clock. None estimates it from the GoPro track when there
+                is one, and assumes 0 when there is not.
+            max_gap_s (float): Frames further than this from an AVL point
+                have no position (replaces the GoPro's ``max_gap_s``).
+        """
+        self.path = path
+        self.vehicle = vehicle
+        self.clock_offset_s = clock_offset_s
+        self.max_gap_s = max_gap_s
+        self._track = None
+
+    @property
+    def track(self) -> Track:
+        """The whole export, read on first use."""
+        if self._track is None:
+            self._track = read_avl(self.path, self.vehicle)
+        return self._track
+
+    def clock_offset(self, reference: Track = None) -> float:
+        """
+        The configured clock offset, else one estimated from ``reference``, else 0.
+
+        Args:
+            reference (Track): GoPro track of the recording, if any.
+
+        Returns:
+            float: Seconds to add to AVL times to put them on the video clock.
+        """
+        if self.clock_offset_s is not None:
+            return self.clock_offset_s
+        if reference is not None and len(reference):
+            estimate = estimate_clock_offset(self.track, reference)
+            if estimate is not None:
+                offset, error = estimate
+                logger.info(
+                    f"AVL clock is {offset:+.0f} s from the GoPro GPS "
+                    f"(median {error:.1f} m apart after alignment)."
+                )
+                return offset
+            logger.warning(
+                "Could not align the AVL log to the GoPro track; assuming 0 s."
+            )
+        return 0.0
+
+    def track_for(self, base_time, duration_s: float, reference: Track = None) -> Track:
+        """
+        AVL points for one recording, on its frame timeline.
+
+        Args:
+            base_time (datetime): Video clock time of offset 0: the GoPro
+                track's base time, or the video's creation time.
+            duration_s (float): Length of the recording.
+            reference (Track): GoPro track of the recording, to estimate the
+                clock offset from.
+
+        Returns:
+            Track: Points within the window plus ``AVL_WINDOW_MARGIN_S`` on
+            either side, with ``offset`` in seconds from ``base_time``.
+        """
+        shift = np.timedelta64(int(round(self.clock_offset(reference) * 1000)), "ms")
+        start = np.datetime64(base_time, "ms")
+        margin = np.timedelta64(int(AVL_WINDOW_MARGIN_S * 1000), "ms")
+        end = start + np.timedelta64(int(np.ceil(duration_s * 1000)), "ms")
+        window = self.track.between(
+            to_datetime(start - margin - shift), to_datetime(end + margin - shift)
+        )
+        if len(window) < 2:
+            raise ValueError(
+                f"The AVL log {self.path} has no points between {to_datetime(start - shift)} "
+                f"and {to_datetime(end - shift)} (AVL clock)."
+            )
+        time = window.time + shift
+        return Track(
+            time=time,
+            lat=window.lat,
+            lon=window.lon,
+            speed_2d=window.speed_2d,
+            fix=window.fix,
+            dop=window.dop,
+            offset=(time - start).astype(np.float64) / 1000,
+            base_time=to_datetime(start),
+            source=f"avl:{self.path}",
+        )
+
+
+@lru_cache(maxsize=4)
+def load_avl_source(path: str = None) -> AvlSource:
+    """
+    The AvlSource for a telematics export, built once per process.
+
+    Args:
+        path (str): Defaults to $AVL_EXPORT.
+
+    Returns:
+        AvlSource: The source, or None if no export is configured.
+    """
+    path = path or os.getenv("AVL_EXPORT")
+    if not path:
+        return None
+    clock_offset = os.getenv("AVL_CLOCK_OFFSET_S")
+    return AvlSource(
+        path,
+        vehicle=os.getenv("AVL_VEHICLE_ID"),
+        clock_offset_s=float(clock_offset) if clock_offset else None,
+        max_gap_s=float(os.getenv("AVL_MAX_GAP_S", AVL_MAX_GAP_S)),
+    )
@@ -0,0 +1,574 @@
+# benchmarks.py
+"""
+Ad-hoc performance benchmarks for the processing pipeline.
+
+Usage:
+    python benchmarks.py sampling unprocessed_videos/GX010229.MP4
+    python benchmarks.py v2_sampling v2_input/clip.mp4 1
+    python benchmarks.py gps_join 100000 1000000
+    python benchmarks.py track_store 30 20 3600
+    python benchmarks.py map_matching 100000
+    python benchmarks.py frame_table 50000
+    python benchmarks.py imu_jolts 3600
+    python benchmarks.py avl_alignment 3600 37
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import datetime
+import json
+import tracemalloc
+
+import numpy as np
+
+from processing import Processor, TelemetryObject
+from sampling import get_sampler
+from telemetry import Track, read_gpx
+from track_store import TrackStore
+from map_matching import RoadMatcher
+from telemetry import compute_heading
+from frame_table import FrameTable, frame_records
+from imu import ImuTrack, detect_jolts
+from avl import estimate_clock_offset
+from video_info import VideoInfo
+from v2_database import create_points_table
+from v2_processing import SAMPLING_METHODS, VideoProcessor
+
+
+def benchmark_sampling_strategies(
+    video_path,
+    frame_counts=(10, 100, 1000),
+    strategies=("select", "stride", "fps", "timestamps"),
+    output_folder="bench_frames",
+):
+    """
+    Time frame extraction for each sampling strategy at several frame counts.
+
+    Frames are spread evenly over the whole video so every strategy decodes the
+    same span of footage.
+
+    Args:
+        video_path (str): Path to the video file.
+        frame_counts (tuple): Number of frames to extract per run.
+        strategies (tuple): Sampling strategy names from ``sampling.SAMPLERS``.
+        output_folder (str): Scratch directory, emptied between runs.
+
+    Returns:
+        list[dict]: One row per (strategy, frame count) with seconds elapsed.
+    """
+    info = VideoInfo.load(video_path, Processor.FFPROBE_PATH)
+    fps = info.fps
+    total_frames = info.frame_count
+    duration = total_frames / fps
+
+    results = []
+    for count in frame_counts:
+        frame_rate = count / duration
+        timestamps = [i / frame_rate for i in range(count)]
+        for strategy in strategies:
+            shutil.rmtree(output_folder, ignore_errors=True)
+            sampler = get_sampler(
+                strategy, frame_rate=frame_rate, timestamps=timestamps
+            )
+
+            start = time.time()
+            frames = sampler.extract(
+                video_path,
+                fps=fps,
+                total_frames=total_frames,
+                output_folder=output_folder,
+                max_frames=count,
+                ffmpeg_path=Processor.FFMPEG_PATH,
+            )
+            elapsed = time.time() - start
+
+            results.append(
+                {
+                    "strategy": strategy,
+                    "requested": count,
+                    "extracted": len(frames),
+                    "seconds": elapsed,
+                }
+            )
+            print(
+                f"{strategy:>10} | {count:>6} frames requested | "
+                f"{len(frames):>6} extracted | {elapsed:8.2f} s"
+            )
+
+    shutil.rmtree(output_folder, ignore_errors=True)
+    return results
+
+
+def benchmark_v2_sampling(video_path, seconds_per_frame=1, methods=SAMPLING_METHODS):
+    """
+    Compare the v2 VideoProcessor sampling methods, including the sqlite writes.
+
+    Each method writes into its own scratch folder and database. Throughput is
+    reported both as source frames covered per second (how fast the video is
+    walked) and as saved frames per second.
+
+    Args:
+        video_path (str): Path to the video file.
+        seconds_per_frame (float): Sampling interval passed to the processor.
+        methods (tuple): Names from ``v2_processing.SAMPLING_METHODS``.
+
+    Returns:
+        list[dict]: One row per method with seconds elapsed and frame rates.
+    """
+    seconds_per_frame = float(seconds_per_frame)
+    info = VideoInfo.load(video_path, Processor.FFPROBE_PATH)
+
+    results = []
+    for method in methods:
+        with tempfile.TemporaryDirectory(prefix="bench_v2_") as scratch:
+            db_path = os.path.join(scratch, "points.db")
+            create_points_table(db_path)
+
+            start = time.time()
+            rows = VideoProcessor.extract_frame_per_x_seconds(
+                video_path, seconds_per_frame, scratch, method=method, db_path=db_path
+            )
+            elapsed = time.time() - start
+
+        results.append(
+            {
+                "method": method,
+                "saved": len(rows),
+                "seconds": elapsed,
+                "source_fps": info.frame_count / elapsed,
+                "saved_fps": len(rows) / elapsed,
+            }
+        )
+        print(
+            f"{method:>6} | {len(rows):>6} frames saved | {elapsed:8.2f} s | "
+            f"{info.frame_count / elapsed:8.1f} source fps | {len(rows) / elapsed:6.1f} saved fps"
+        )
+
+    return results
+
+
+def benchmark_gps_join(frames=100_000, trackpoints=1_000_000, legacy_frames=100):
+    """
+    Time the vectorized frame-to-track join against the per-frame bisect lookup.
+
+    The track is synthetic 18 Hz GPS. The per-frame lookup rebuilds its
+    timestamp list on every call, so it only runs on ``legacy_frames`` frames
+    and its time is scaled up to the full frame count.
+
+    Args:
+        frames (int): Number of frame offsets to join.
+        trackpoints (int): Number of trackpoints in the synthetic track.
+        legacy_frames (int): Frames to time through the per-frame lookup.
+
+    Returns:
+        dict: Seconds for each approach and the resulting speedup.
+    """
+    frames, trackpoints, legacy_frames = (
+        int(frames),
+        int(trackpoints),
+        int(legacy_frames),
+    )
+    base_time = datetime.datetime(2025, 1, 1, 12)
+    step_ms = 1000 / 18
+    duration_s = trackpoints * step_ms / 1000
+    rng = np.random.default_rng(0)
+    track = Track(
+        time=np.datetime64(base_time, "ms")
+        + (np.arange(trackpoints) * step_ms).astype("timedelta64[ms]"),
+        lat=44.0 + np.cumsum(rng.normal(0, 1e-6, trackpoints)),
+        lon=-73.0 + np.cumsum(rng.normal(0, 1e-6, trackpoints)),
+        speed_2d=rng.uniform(0, 20, trackpoints),
+        base_time=base_time,
+    )
+    offsets = np.sort(rng.uniform(0, duration_s, frames))
+
+    start = time.perf_counter()
+    track.join(offsets)
+    batch_seconds = time.perf_counter() - start
+
+    records = track.to_records()
+    # The lookup uses no instance state; skip __init__, which needs ffmpeg and API keys
+    processor = Processor.__new__(Processor)
+    start = time.perf_counter()
+    for offset in offsets[:legacy_frames]:
+        target = base_time + datetime.timedelta(seconds=float(offset))
+        processor.get_telemetry_for_timestamp_binary(
+            target.strftime("%Y-%m-%dT%H:%M:%SZ"), records
+        )
+    legacy_seconds = (time.perf_counter() - start) * frames / max(legacy_frames, 1)
+
+    print(f"{frames} frames x {trackpoints} trackpoints")
+    print(f"  batch join:       {batch_seconds:10.3f} s")
+    print(f"  per-frame bisect: {legacy_seconds:10.3f} s (from {legacy_frames} frames)")
+    print(f"  speedup:          {legacy_seconds / batch_seconds:10.0f}x")
+    return {
+        "batch_seconds": batch_seconds,
+        "legacy_seconds": legacy_seconds,
+        "speedup": legacy_seconds / batch_seconds,
+    }
+
+
+def benchmark_track_store(days=30, vehicles=20, points=3600, folder="bench_tracks"):
+    """
+    Time opening a month of fleet tracks from ``.track`` files, against
+    parsing the same tracks from GPX.
+
+    One synthetic 18 Hz track is written per vehicle per day. GPX parsing is
+    timed on one file and scaled up to the whole month.
+
+    Args:
+        days (int): Days of tracks.
+        vehicles (int): Tracks per day.
+        points (int): Trackpoints per track.
+        folder (str): Scratch directory, removed afterwards.
+
+    Returns:
+        dict: Seconds to open the month, one day, and the GPX estimate.
+    """
+    days, vehicles, points = int(days), int(vehicles), int(points)
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+    first_day = datetime.datetime(2025, 1, 1, 8)
+    rng = np.random.default_rng(0)
+    for day in range(days):
+        for vehicle in range(vehicles):
+            start = first_day + datetime.timedelta(days=day, minutes=vehicle)
+            track = Track(
+                time=np.datetime64(start, "ms")
+                + (np.arange(points) * 1000 / 18).astype("timedelta64[ms]"),
+                lat=44.0 + np.cumsum(rng.normal(0, 1e-6, points)),
+                lon=-73.0 + np.cumsum(rng.normal(0, 1e-6, points)),
+                base_time=start,
+            )
+            track.save(os.path.join(folder, f"V{vehicle:03d}_{day:02d}.track"))
+    gpx_path = os.path.join(folder, "sample.gpx")
+    track.write_gpx(gpx_path)
+
+    start = time.perf_counter()
+    month = TrackStore(folder).load_range(
+        first_day, first_day + datetime.timedelta(days=days)
+    )
+    month_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    day = TrackStore(folder).load_day(
+        first_day.date() + datetime.timedelta(days=days // 2)
+    )
+    day_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_gpx(gpx_path)
+    gpx_seconds = (time.perf_counter() - start) * days * vehicles
+
+    total_points = sum(len(track) for track in month.values())
+    print(f"{len(month)} tracks, {total_points} trackpoints")
+    print(f"  open month from .track: {month_seconds * 1000:10.1f} ms")
+    print(
+        f"  open one day:           {day_seconds * 1000:10.1f} ms ({len(day)} tracks)"
+    )
+    print(f"  parse month from GPX:   {gpx_seconds * 1000:10.1f} ms (estimated)")
+    shutil.rmtree(folder, ignore_errors=True)
+    return {
+        "month_seconds": month_seconds,
+        "day_seconds": day_seconds,
+        "gpx_seconds": gpx_seconds,
+    }
+
+
+def benchmark_map_matching(points=100_000, grid=60, block_m=120.0):
+    """
+    Time offline map-matching of a GPS trace against a synthetic street grid.
+
+    The grid has ``grid`` east-west and ``grid`` north-south streets, each
+    split into one segment per block. The trace drives along the east-west
+    streets with a few meters of drifting GPS error, so crossing streets
+    near intersections test the heading term.
+
+    Args:
+        points (int): Trace points to match.
+        grid (int): Streets in each direction.
+        block_m (float): Block length in meters.
+
+    Returns:
+        dict: Segments, points, seconds, points per minute and match rate.
+    """
+    points, grid, block_m = int(points), int(grid), float(block_m)
+    lat0, lon0 = 35.79, -78.78
+    dlat = block_m / 110_540.0
+    dlon = block_m / (111_320.0 * np.cos(np.radians(lat0)))
+
+    features = []
+    for i in range(grid):
+        for j in range(grid - 1):
+            for name, coords in (
+                (
+                    f"East St {i}",
+                    [
+                        [lon0 + j * dlon, lat0 + i * dlat],
+                        [lon0 + (j + 1) * dlon, lat0 + i * dlat],
+                    ],
+                ),
+                (
+                    f"North St {i}",
+                    [
+                        [lon0 + i * dlon, lat0 + j * dlat],
+                        [lon0 + i * dlon, lat0 + (j + 1) * dlat],
+                    ],
+                ),
+            ):
+                features.append(
+                    {
+                        "type": "Feature",
+                        "geometry": {"type": "LineString", "coordinates": coords},
+                        "properties": {"OBJECTID": len(features), "FULLNAME": name},
+                    }
+                )
+
+    with tempfile.TemporaryDirectory(prefix="bench_roads_") as scratch:
+        path = os.path.join(scratch, "centerlines.geojson")
+        with open(path, "w") as roads_file:
+            json.dump({"type": "FeatureCollection", "features": features}, roads_file)
+        start = time.perf_counter()
+        matcher = RoadMatcher(path)
+        load_seconds = time.perf_counter() - start
+
+    # Drive east along each street in turn, 1 m per point. GPS error is a
+    # slowly drifting offset of a few meters plus small per-fix jitter.
+    rng = np.random.default_rng(0)
+    along = np.arange(points) % int((grid - 1) * block_m)
+    street = (np.arange(points) // int((grid - 1) * block_m)) % grid
+    drift = np.cumsum(rng.normal(0, 0.05, (points, 2)), axis=0)
+    drift = np.clip(drift - drift.mean(axis=0), -4, 4) + rng.normal(0, 0.3, (points, 2))
+    lats = lat0 + street * dlat + drift[:, 0] / 110_540.0
+    lons = (
+        lon0 + along / (111_320.0 * np.cos(np.radians(lat0))) + drift[:, 1] / 111_320.0
+    )
+    headings = compute_heading(lats, lons)
+
+    start = time.perf_counter()
+    matched = matcher.match(lats, lons, headings)
+    match_seconds = time.perf_counter() - start
+
+    names = matched["street_name"]
+    correct = np.mean([name == f"East St {s}" for name, s in zip(names, street)])
+    per_minute = points / match_seconds * 60
+    print(f"{len(matcher.lines)} segments indexed in {load_seconds:.2f} s")
+    print(
+        f"{points} points matched in {match_seconds:.2f} s ({per_minute:,.0f} points/min)"
+    )
+    print(f"{correct:.1%} matched to the street driven")
+    return {
+        "segments": len(matcher.lines),
+        "points": points,
+        "seconds": match_seconds,
+        "points_per_minute": per_minute,
+        "correct": correct,
+    }
+
+
+def benchmark_frame_table(frames=50_000):
+    """
+    Memory and export time of a run's frames held in a FrameTable, against
+    the same frames as one dict per frame.
+
+    Args:
+        frames (int): Frames in the run.
+
+    Returns:
+        dict: Table bytes, dict-list bytes, and export and JSON seconds.
+    """
+    frames = int(frames)
+    rng = np.random.default_rng(0)
+    labels = ["none", "low", "medium", "high"]
+    base = datetime.datetime(2024, 6, 1, 12, 0, 0)
+
+    table = FrameTable(capacity=frames)
+    objects = []
+    for i in range(frames):
+        obj = TelemetryObject(
+            f"GX010229_{i:06d}.jpg",
+            f"frames/GX010229_{i:06d}.jpg",
+            i * 0.5,
+            None,
+            None,
+            "unprocessed_videos/GX010229.MP4",
+            table=table,
+        )
+        obj.timestamp = (base + datetime.timedelta(seconds=i // 2)).isoformat() + "Z"
+        obj.lat = 35.79 + rng.normal(0, 0.01)
+        obj.lon = -78.78 + rng.normal(0, 0.01)
+        obj.speed = float(rng.uniform(0, 20))
+        obj.heading = float(rng.uniform(0, 360))
+        obj.gps_fix = 3
+        obj.gps_dop = 1.2
+        obj.analysis_results = {
+            "pothole": labels[rng.integers(4)],
+            "pothole_confidence": float(rng.uniform()),
+            "alligator_cracking": labels[rng.integers(4)],
+            "line_cracking": labels[rng.integers(4)],
+            "raveling": labels[rng.integers(4)],
+            "summary": "Minor surface wear.",
+            "estimated_pcr": int(rng.integers(40, 100)),
+        }
+        objects.append(obj)
+
+    start = time.perf_counter()
+    records = frame_records(objects)
+    export_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    json.dumps(records)
+    json_seconds = time.perf_counter() - start
+
+    # The same frames as independent dicts, the way they were held before
+    tracemalloc.start()
+    dicts = json.loads(json.dumps(records))
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del dicts
+
+    table_bytes = table.nbytes()
+    print(
+        f"{frames} frames: table {table_bytes / 1e6:.1f} MB, dicts {dict_bytes / 1e6:.1f} MB"
+    )
+    print(
+        f"Exported to records in {export_seconds * 1000:.0f} ms, JSON in {json_seconds * 1000:.0f} ms"
+    )
+    return {
+        "frames": frames,
+        "table_bytes": table_bytes,
+        "dict_bytes": dict_bytes,
+        "export_seconds": export_seconds,
+        "json_seconds": json_seconds,
+    }
+
+
+def benchmark_imu_jolts(seconds=3600, impacts=200, rate_hz=200):
+    """
+    Time jolt detection on a synthetic drive and check it finds the impacts.
+
+    The accelerometer sees gravity at a tilted mount, road noise, slow
+    braking and roll, and ``impacts`` damped 12 Hz wheel impacts.
+
+    Args:
+        seconds (float): Drive length.
+        impacts (int): Impacts to inject, at least 2 s apart.
+        rate_hz (float): IMU sample rate.
+
+    Returns:
+        dict: Samples, seconds, events found and the share of impacts found.
+    """
+    seconds, impacts, rate_hz = float(seconds), int(impacts), float(rate_hz)
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate_hz)) / rate_hz
+    gravity = np.array([0.3, 9.7, 1.2])
+    gravity *= 9.81 / np.linalg.norm(gravity)
+    accel = np.tile(gravity, (len(t), 1)) + rng.normal(0, 0.4, (len(t), 3))
+    accel[:, 0] += 1.5 * np.sin(2 * np.pi * 0.3 * t)
+    times = np.sort(
+        rng.choice(np.arange(2.0, seconds - 2.0, 2.0), impacts, replace=False)
+    )
+    ring = np.arange(int(0.2 * rate_hz))
+    pulse = np.exp(-ring / (0.04 * rate_hz)) * np.sin(2 * np.pi * 12 * ring / rate_hz)
+    for start in (times * rate_hz).astype(int):
+        accel[start : start + len(ring)] += np.outer(
+            pulse * rng.uniform(6, 15), gravity / 9.81
+        )
+    imu = ImuTrack(t, accel, t, rng.normal(0, 0.02, (len(t), 3)))
+
+    start = time.perf_counter()
+    jolts = detect_jolts(imu)
+    elapsed = time.perf_counter() - start
+
+    found = 0.0
+    if len(jolts["offset"]):
+        nearest = np.abs(jolts["offset"][:, None] - times[None, :]).min(axis=0)
+        found = float(np.mean(nearest < 0.5))
+    print(
+        f"{len(t)} samples ({seconds / 60:.0f} min at {rate_hz:.0f} Hz) in {elapsed * 1000:.0f} ms"
+    )
+    print(
+        f"{len(jolts['offset'])} events for {impacts} impacts; {found:.1%} of impacts found"
+    )
+    return {
+        "samples": len(t),
+        "seconds": elapsed,
+        "events": len(jolts["offset"]),
+        "found": found,
+    }
+
+
+def benchmark_avl_alignment(seconds=3600, clock_offset_s=37, avl_interval_s=15):
+    """
+    Time the AVL clock-offset search and check it recovers a known offset.
+
+    A winding drive is logged by the GoPro once per second and by the AVL
+    unit every ``avl_interval_s`` seconds on a clock ``clock_offset_s`` behind.
+
+    Args:
+        seconds (float): Drive length.
+        clock_offset_s (float): True offset of the AVL clock.
+        avl_interval_s (int): AVL reporting interval.
+
+    Returns:
+        dict: Estimated offset, its median error in meters and seconds taken.
+    """
+    seconds, clock_offset_s = int(float(seconds)), float(clock_offset_s)
+    avl_interval_s = int(avl_interval_s)
+    rng = np.random.default_rng(0)
+    t = np.arange(-900, seconds + 900)
+    angle = np.cumsum(rng.normal(0, 0.05, len(t)))
+    lat = 35.0 + np.cumsum(12 * np.cos(angle)) / 110_540
+    lon = -78.0 + np.cumsum(12 * np.sin(angle)) / (111_320 * np.cos(np.radians(35.0)))
+    base = np.datetime64("2025-01-01T12:00:00", "ms")
+    times = base + (t * 1000).astype("timedelta64[ms]")
+
+    drive = (t >= 0) & (t < seconds)
+    gopro = Track(times[drive], lat[drive], lon[drive], fix=np.full(drive.sum(), 3))
+    ping = slice(None, None, avl_interval_s)
+    lag = np.timedelta64(int(clock_offset_s * 1000), "ms")
+    avl = Track(times[ping] - lag, lat[ping], lon[ping])
+
+    start = time.perf_counter()
+    estimate = estimate_clock_offset(avl, gopro)
+    elapsed = time.perf_counter() - start
+    offset, error = estimate if estimate else (np.nan, np.nan)
+    print(
+        f"Searched offsets for {seconds / 60:.0f} min of driving in {elapsed * 1000:.0f} ms"
+    )
+    print(
+        f"Estimated {offset:+.0f} s (true {clock_offset_s:+.0f} s), median error {error:.1f} m"
+    )
+    return {"offset_s": offset, "median_m": error, "seconds": elapsed}
+
+
+BENCHMARKS = {
+    "sampling": benchmark_sampling_strategies,
+    "v2_sampling": benchmark_v2_sampling,
+    "gps_join": benchmark_gps_join,
+    "track_store": benchmark_track_store,
+    "map_matching": benchmark_map_matching,
+    "frame_table": benchmark_frame_table,
+    "imu_jolts": benchmark_imu_jolts,
+    "avl_alignment": benchmark_avl_alignment,
+}
+
+# Benchmarks whose first argument is an input file
+FILE_BENCHMARKS = {"sampling", "v2_sampling"}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(__doc__)
+        sys.exit(1)
+
+    name, args = sys.argv[1], sys.argv[2:]
+    if name in FILE_BENCHMARKS and not args:
+        print(__doc__)
+        sys.exit(1)
+    if name in FILE_BENCHMARKS and not os.path.exists(args[0]):
+        print(f"File {args[0]} not found.")
+        sys.exit(1)
+    BENCHMARKS[name](*args)
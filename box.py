@@ -30,6 +30,7 @@ from utils import (
 import asyncio
 import geojson
 import re
+from frame_table import frame_features, frame_records
 
 # Load environment variables from .env file
 load_dotenv()
@@ -306,6 +307,7 @@ class Box:
         telemetry_objects: list = None,
         greenway_mode=False,
         video_path: str = None,
+        zip_paths: list = None,
     ):
         telemetry_objects = telemetry_objects or []
         source_video_base = os.path.splitext(os.path.basename(video_path))[0]
@@ -328,9 +330,7 @@ class Box:
 
         if greenway_mode:
             # Convert telemetry objects to GeoJSON Features
-            geojson_features = [
-                telem_obj.to_geojson() for telem_obj in telemetry_objects
-            ]
+            geojson_features = frame_features(telemetry_objects)
             feature_collection = geojson.FeatureCollection(geojson_features)
 
             # Define the GeoJSON file path (local save location)
@@ -386,16 +386,31 @@ class Box:
         # REPLACED WITH THE GROUPED/ZIPPED PROCESS BELOW
         # updated_telemetry_objects = await self.upload_files_to_box_folder(destination_folder_id, prefix_timestamp=timestamp, telemetry_objects=telemetry_objects)
 
-        # Bundle frames into per-video ZIPs and upload
-        grouped = self.group_telem_objects_by_video(telemetry_objects)
-        zip_paths = []
+        # Bundle frames into per-video ZIPs and upload, unless the caller
+        # already built them while the frames were being analyzed
+        grouped = {} if zip_paths else self.group_telem_objects_by_video(telemetry_objects)
+        # Streamed frames live only in memory, so zip them from their bytes
+        frame_bytes = {
+            obj.filename: obj.image_bytes
+            for obj in telemetry_objects
+            if getattr(obj, "image_bytes", None)
+        }
+        zip_paths = list(zip_paths or [])
         for base, items in grouped.items():
             # extract file paths
             fps = [item["filename"] for item in items]
             video_id = re.search(f"([^/]+)(?=\.)", base).group(1)
             zip_name = f"{video_id}_{timestamp}"
-            zip_path = self.create_zip_from_group(group_name=zip_name, file_list=fps)
+            zip_path = self.create_zip_from_group(
+                group_name=zip_name,
+                file_list=fps,
+                frame_bytes=frame_bytes,
+                frames_folder=source_normals_folder,
+            )
             zip_paths.append(zip_path)
+        for obj in telemetry_objects:
+            if getattr(obj, "image_bytes", None):
+                obj.image_bytes = None  # Archived; release the frame memory
         # Upload all ZIP archives
         await self.upload_zip_to_box(zip_paths, destination_folder_id)
         updated_telemetry_objects = telemetry_objects
@@ -403,9 +418,7 @@ class Box:
         logger.info("Saving all telemetry into a single GeoJSON (timelapse mode)...")
 
         # Combine all telemetry objects into one FeatureCollection
-        geojson_features = [
-            telem_obj.to_geojson() for telem_obj in updated_telemetry_objects
-        ]
+        geojson_features = frame_features(updated_telemetry_objects)
         feature_collection = geojson.FeatureCollection(geojson_features)
 
         # Build filename based on source video
@@ -719,14 +732,19 @@ class Box:
         """
         grouped_objects = defaultdict(list)
 
-        for telem_obj in telemetry_objects:
-            source_video = telem_obj.to_dict().get("source_video")
+        for record in frame_records(telemetry_objects):
+            source_video = record.get("source_video")
             if source_video:
-                grouped_objects[source_video].append(telem_obj.to_dict())
+                grouped_objects[source_video].append(record)
         return dict(grouped_objects)
 
     def create_zip_from_group(
-        self, group_name: str, file_list: list, output_dir: str = "zipped_files"
+        self,
+        group_name: str,
+        file_list: list,
+        output_dir: str = "zipped_files",
+        frame_bytes: dict = None,
+        frames_folder: str = "frames",
     ) -> str:
         """
         Creates a zip file from a list of file paths for a specific group.
@@ -735,6 +753,9 @@ class Box:
             group_name (str): The name of the group to create a zip file for.
             file_list (list): A list of file paths to include in the zip file.
             output_dir (str): The directory to save the zip file in. Defaults to 'zipped_files'.
+            frame_bytes (dict): Optional mapping of file name to in-memory JPEG bytes,
+                used instead of reading the file from disk.
+            frames_folder (str): Folder the frame files are read from.
 
         Returns:
             str: The path to the created zip file.
@@ -755,8 +776,11 @@ class Box:
 
         with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED) as zipf:
             for file_path in file_list:
-                full_path = os.path.join("frames", file_path)
-                if os.path.exists(full_path):
+                full_path = os.path.join(frames_folder, file_path)
+                in_memory = (frame_bytes or {}).get(os.path.basename(file_path))
+                if in_memory:
+                    zipf.writestr(os.path.basename(file_path), in_memory)
+                elif os.path.exists(full_path):
                     zipf.write(full_path, arcname=os.path.basename(file_path))
                 else:
                     print(f"File {full_path} does not exist. Skipping.")
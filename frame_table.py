@@ -0,0 +1,387 @@
+# frame_table.py
+import sys
+import threading
+import numpy as np
+
+# Column layout. Floats use NaN and integers a sentinel for "not set";
+# row views turn both back into None.
+FLOAT_COLUMNS = (
+    "lat",
+    "lon",
+    "offset",
+    "speed",
+    "heading",
+    "gps_dop",
+    "offset_m",
+    "jolt",
+)
+INT_COLUMNS = {"gps_fix": np.int8}
+TIME_COLUMNS = ("time",)
+# Repeated strings share one object per table
+INTERNED_COLUMNS = (
+    "timestamp",
+    "source_video",
+    "street_name",
+    "payload_mime_type",
+    "payload_detail",
+    "gps_issue",
+)
+OBJECT_COLUMNS = (
+    "filename",
+    "filepath",
+    "openai_file_id",
+    "box_file_id",
+    "box_file_url",
+    "duplicate_of",
+    "segment_id",
+    "image_bytes",
+    "payload_bytes",
+    "payload_filename",
+)
+
+# analysis_results keys stored as columns; anything else goes in a per-row dict
+ANALYSIS_CATEGORIES = (
+    "pothole",
+    "alligator_cracking",
+    "line_cracking",
+    "raveling",
+    "skipped_reason",
+)
+ANALYSIS_NUMBERS = {"pothole_confidence": float, "estimated_pcr": int}
+ANALYSIS_TEXT = ("summary",)
+
+INT_MISSING = -1
+PCR_MISSING = np.iinfo(np.int32).min
+
+# Order of the keys in exported records, matching TelemetryObject.to_dict
+RECORD_FIELDS = (
+    "filename",
+    "filepath",
+    "source_video",
+    "timestamp",
+    "lat",
+    "lon",
+    "openai_file_id",
+    "box_file_id",
+    "box_file_url",
+    "analysis_results",
+    "duplicate_of",
+    "speed",
+    "heading",
+    "gps_fix",
+    "gps_dop",
+    "segment_id",
+    "street_name",
+    "offset_m",
+    "jolt",
+    "gps_issue",
+)
+FEATURE_FIELDS = tuple(
+    name for name in RECORD_FIELDS if name not in ("lat", "lon", "analysis_results")
+)
+
+
+class FrameTable:
+    """
+    Columnar storage for the frames of a pipeline run.
+
+    Coordinates, GPS channels and times are NumPy arrays; AI severity labels
+    are small integer codes into a per-table vocabulary; repeated strings
+    (source video, timestamps, street names) are interned. ``TelemetryObject``
+    instances are row views into a table, so the per-frame API stays the
+    same while the data lives in a few arrays that export in bulk.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.size = 0
+        self.capacity = max(capacity, 1)
+        self.vocabulary = {name: [] for name in ANALYSIS_CATEGORIES}
+        self._codes = {name: {} for name in ANALYSIS_CATEGORIES}
+        self._lock = threading.Lock()  # Writers may run in upload threads
+        self.columns = {}
+        for name in FLOAT_COLUMNS:
+            self.columns[name] = np.full(self.capacity, np.nan)
+        for name, dtype in INT_COLUMNS.items():
+            self.columns[name] = np.full(self.capacity, INT_MISSING, dtype=dtype)
+        for name in TIME_COLUMNS:
+            self.columns[name] = np.full(
+                self.capacity, np.datetime64("NaT", "ms"), "datetime64[ms]"
+            )
+        for name in (
+            INTERNED_COLUMNS + OBJECT_COLUMNS + ANALYSIS_TEXT + ("analysis_extra",)
+        ):
+            self.columns[name] = np.full(self.capacity, None, dtype=object)
+        for name in ANALYSIS_CATEGORIES:
+            self.columns[name] = np.full(self.capacity, INT_MISSING, dtype=np.int8)
+        self.columns["pothole_confidence"] = np.full(self.capacity, np.nan)
+        self.columns["estimated_pcr"] = np.full(
+            self.capacity, PCR_MISSING, dtype=np.int32
+        )
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self, capacity):
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self.capacity] = column
+            grown[self.capacity :] = _missing(column)
+            self.columns[name] = grown
+        self.capacity = capacity
+
+    def append(self, **values) -> int:
+        """
+        Add a row.
+
+        Args:
+            **values: Initial values, by row-view attribute name.
+
+        Returns:
+            int: The new row's index.
+        """
+        with self._lock:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            row = self.size
+            self.size += 1
+        for name, value in values.items():
+            self.set(row, name, value)
+        return row
+
+    def get(self, row: int, name: str):
+        """Read one cell as a plain Python value (None when not set)."""
+        value = self.columns[name][row]
+        if name in FLOAT_COLUMNS:
+            return None if np.isnan(value) else float(value)
+        if name in INT_COLUMNS:
+            return None if value == INT_MISSING else int(value)
+        if name in TIME_COLUMNS:
+            return None if np.isnat(value) else value
+        return value
+
+    def set(self, row: int, name: str, value):
+        """Write one cell; None clears it."""
+        if name in FLOAT_COLUMNS:
+            value = np.nan if value is None else float(value)
+        elif name in INT_COLUMNS:
+            value = INT_MISSING if value is None else int(value)
+        elif name in TIME_COLUMNS:
+            value = (
+                np.datetime64("NaT", "ms")
+                if value is None
+                else np.datetime64(value, "ms")
+            )
+        elif name in INTERNED_COLUMNS and isinstance(value, str):
+            value = sys.intern(value)
+        with self._lock:
+            self.columns[name][row] = value
+
+    def set_many(self, rows, name: str, values):
+        """Write a column for many rows at once (NaN / None mean not set)."""
+        rows = np.asarray(rows, dtype=np.intp)
+        column = self.columns[name]
+        if name in INTERNED_COLUMNS:
+            values = [sys.intern(v) if isinstance(v, str) else v for v in values]
+        elif name in INT_COLUMNS:
+            values = [INT_MISSING if v is None else v for v in values]
+        with self._lock:
+            self.columns[name][rows] = np.asarray(values, dtype=column.dtype)
+
+    def _code(self, name, label) -> int:
+        codes = self._codes[name]
+        if label not in codes:
+            if len(codes) >= np.iinfo(np.int8).max:
+                raise ValueError(
+                    f"Too many distinct {name} values for a category column."
+                )
+            codes[label] = len(codes)
+            self.vocabulary[name].append(label)
+        return codes[label]
+
+    def get_analysis(self, row: int) -> dict:
+        """Rebuild the ``analysis_results`` dict of a row."""
+        analysis = {}
+        for name in ANALYSIS_CATEGORIES:
+            code = self.columns[name][row]
+            if code != INT_MISSING:
+                analysis[name] = self.vocabulary[name][code]
+        confidence = self.columns["pothole_confidence"][row]
+        if not np.isnan(confidence):
+            analysis["pothole_confidence"] = float(confidence)
+        pcr = self.columns["estimated_pcr"][row]
+        if pcr != PCR_MISSING:
+            analysis["estimated_pcr"] = int(pcr)
+        for name in ANALYSIS_TEXT:
+            if self.columns[name][row] is not None:
+                analysis[name] = self.columns[name][row]
+        extra = self.columns["analysis_extra"][row]
+        if extra:
+            analysis.update(extra)
+        return analysis
+
+    def set_analysis(self, row: int, analysis: dict):
+        """Replace the ``analysis_results`` of a row."""
+        analysis = dict(analysis or {})
+        with self._lock:
+            for name in ANALYSIS_CATEGORIES:
+                label = analysis.get(name)
+                if isinstance(label, str):
+                    self.columns[name][row] = self._code(name, analysis.pop(name))
+                else:
+                    self.columns[name][row] = INT_MISSING
+            for name, kind in ANALYSIS_NUMBERS.items():
+                value = analysis.get(name)
+                # Exact type only (bool is an int), so values round-trip unchanged
+                if type(value) is kind and (
+                    not np.isnan(value)
+                    if kind is float
+                    else PCR_MISSING < value <= np.iinfo(np.int32).max
+                ):
+                    self.columns[name][row] = analysis.pop(name)
+                else:
+                    self.columns[name][row] = np.nan if kind is float else PCR_MISSING
+            for name in ANALYSIS_TEXT:
+                value = analysis.get(name)
+                self.columns[name][row] = (
+                    analysis.pop(name) if isinstance(value, str) else None
+                )
+            self.columns["analysis_extra"][row] = analysis or None
+
+    def _column_values(self, name, rows) -> list:
+        values = self.columns[name][rows]
+        if name in FLOAT_COLUMNS:
+            return [None if v != v else v for v in values.tolist()]
+        if name in INT_COLUMNS:
+            return [None if v == INT_MISSING else v for v in values.tolist()]
+        return values.tolist()
+
+    def _timestamps(self, rows) -> list:
+        # The GPX timestamp once coordinates are joined, else the video offset
+        return [
+            text if text is not None else offset
+            for text, offset in zip(
+                self.columns["timestamp"][rows].tolist(),
+                self._column_values("offset", rows),
+            )
+        ]
+
+    def to_columns(self, rows=None) -> dict:
+        """
+        Export as one list per field, the cheapest form to serialize.
+
+        Args:
+            rows (array-like): Row indices; defaults to every row.
+
+        Returns:
+            dict: Field name -> list of values, with analysis_results as a list of dicts.
+        """
+        rows = np.arange(self.size) if rows is None else np.asarray(rows, dtype=np.intp)
+        columns = {}
+        for name in RECORD_FIELDS:
+            if name == "timestamp":
+                columns[name] = self._timestamps(rows)
+            elif name == "analysis_results":
+                columns[name] = [self.get_analysis(row) for row in rows.tolist()]
+            else:
+                columns[name] = self._column_values(name, rows)
+        return columns
+
+    def to_records(self, rows=None) -> list:
+        """
+        Export as a list of dicts, identical to ``TelemetryObject.to_dict`` per row.
+
+        Args:
+            rows (array-like): Row indices; defaults to every row.
+
+        Returns:
+            list[dict]: One dict per row.
+        """
+        columns = self.to_columns(rows)
+        return [dict(zip(RECORD_FIELDS, values)) for values in zip(*columns.values())]
+
+    def to_features(self, rows=None) -> list:
+        """
+        Export as GeoJSON Feature dicts, identical to ``TelemetryObject.to_geojson``.
+
+        Args:
+            rows (array-like): Row indices; defaults to every row.
+
+        Returns:
+            list[dict]: One Point feature per row.
+        """
+        columns = self.to_columns(rows)
+        features = []
+        for i, (lat, lon) in enumerate(zip(columns["lat"], columns["lon"])):
+            if lat is None or lon is None:
+                raise ValueError(
+                    f"Telemetry object {columns['filename'][i]} is missing coordinates."
+                )
+            properties = {name: columns[name][i] for name in FEATURE_FIELDS}
+            properties.update(columns["analysis_results"][i])
+            features.append(
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                    "properties": properties,
+                }
+            )
+        return features
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the table, including string and dict objects."""
+        total = 0
+        for name, column in self.columns.items():
+            total += column.nbytes
+            if column.dtype == object:
+                unique = {
+                    id(v): v for v in column[: self.size].tolist() if v is not None
+                }
+                total += sum(sys.getsizeof(v) for v in unique.values())
+        return total
+
+
+def _missing(column):
+    if column.dtype == object:
+        return None
+    if column.dtype.kind == "f":
+        return np.nan
+    if column.dtype.kind == "M":
+        return np.datetime64("NaT", "ms")
+    if column.dtype == np.int32:
+        return PCR_MISSING
+    return INT_MISSING
+
+
+def table_runs(objects):
+    """
+    Split telemetry objects into runs of consecutive objects sharing a table.
+
+    Args:
+        objects (list): TelemetryObject row views.
+
+    Yields:
+        tuple: (table, row indices, slice of ``objects``), in input order.
+    """
+    start = 0
+    for i in range(1, len(objects) + 1):
+        if i == len(objects) or objects[i].table is not objects[start].table:
+            yield objects[start].table, [obj.row for obj in objects[start:i]], slice(
+                start, i
+            )
+            start = i
+
+
+def frame_records(objects) -> list:
+    """``to_dict()`` for many telemetry objects, exported a table at a time."""
+    records = []
+    for table, rows, _ in table_runs(objects):
+        records.extend(table.to_records(rows))
+    return records
+
+
+def frame_features(objects) -> list:
+    """``to_geojson()`` for many telemetry objects, as plain GeoJSON Feature dicts."""
+    features = []
+    for table, rows, _ in table_runs(objects):
+        features.extend(table.to_features(rows))
+    return features
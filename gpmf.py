@@ -0,0 +1,433 @@
+# gpmf.py
+"""
+Read GoPro GPMF telemetry straight from the MP4, without ffmpeg or gopro2gpx.
+
+The GPMD track's sample table (stsz/stco/stsc/stts) is read from a memory map
+of the file, then each telemetry payload is decoded from its KLV structure:
+a 4-byte FourCC key, a 1-byte type, a 1-byte struct size and a 2-byte repeat
+count, followed by the data padded to 4 bytes. Type 0 means nested KLVs.
+"""
+
+import datetime
+import mmap
+import struct
+import numpy as np
+from logging_config import logger
+from telemetry import Track, to_datetime
+from imu import ImuTrack
+
+# GPMF type characters -> big-endian numpy dtypes
+GPMF_TYPES = {
+    "b": ">i1",
+    "B": ">u1",
+    "s": ">i2",
+    "S": ">u2",
+    "l": ">i4",
+    "L": ">u4",
+    "j": ">i8",
+    "J": ">u8",
+    "f": ">f4",
+    "d": ">f8",
+    "q": ">u4",  # Q15.16 fixed point, scaled by the caller
+    "Q": ">u8",
+}
+
+GPS_EPOCH = np.datetime64("2000-01-01T00:00:00", "ms")
+
+IMU_KEYS = (b"ACCL", b"GYRO")
+
+
+def iter_boxes(buffer, start, end):
+    """
+    Yield ``(type, payload_start, box_end)`` for each MP4 box in a range.
+
+    Args:
+        buffer: Memory map or bytes of the file.
+        start (int): Offset of the first box header.
+        end (int): Offset the boxes end at.
+    """
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", buffer, offset)
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", buffer, offset + 8)
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header:
+            break
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def find_box(buffer, start, end, box_type):
+    """Return ``(payload_start, box_end)`` of the first child box of a type, or None."""
+    for child_type, payload_start, box_end in iter_boxes(buffer, start, end):
+        if child_type == box_type:
+            return payload_start, box_end
+    return None
+
+
+def _full_box_table(buffer, box, dtype, columns):
+    """Read the entry table of a FullBox that starts with version/flags and a count."""
+    payload_start, _ = box
+    (count,) = struct.unpack_from(">I", buffer, payload_start + 4)
+    table = np.frombuffer(
+        buffer, dtype=dtype, count=count * columns, offset=payload_start + 8
+    )
+    return table.reshape(count, columns) if columns > 1 else table
+
+
+def read_gpmd_samples(buffer, stream_index=None):
+    """
+    Locate the GPMD track and list its samples.
+
+    Args:
+        buffer: Memory map or bytes of the MP4 file.
+        stream_index (int): Track number to use (ffprobe stream index). By
+            default the first track whose sample description is 'gpmd'.
+
+    Returns:
+        tuple: ``(offsets, sizes, start_seconds, end_seconds)`` NumPy arrays,
+        one entry per telemetry payload.
+    """
+    moov = find_box(buffer, 0, len(buffer), b"moov")
+    if moov is None:
+        raise ValueError("MP4 file has no moov box.")
+
+    tracks = [
+        (payload_start, box_end)
+        for box_type, payload_start, box_end in iter_boxes(buffer, *moov)
+        if box_type == b"trak"
+    ]
+    if stream_index is not None:
+        tracks = tracks[stream_index : stream_index + 1]
+
+    for trak in tracks:
+        mdia = find_box(buffer, *trak, b"mdia")
+        stbl = find_box(buffer, *find_box(buffer, *mdia, b"minf"), b"stbl")
+        stsd = find_box(buffer, *stbl, b"stsd")
+        if buffer[stsd[0] + 12 : stsd[0] + 16] != b"gpmd":
+            continue
+
+        mdhd = find_box(buffer, *mdia, b"mdhd")
+        version = buffer[mdhd[0]]
+        (timescale,) = struct.unpack_from(
+            ">I", buffer, mdhd[0] + (20 if version else 12)
+        )
+
+        stsz = find_box(buffer, *stbl, b"stsz")
+        sample_size, sample_count = struct.unpack_from(">II", buffer, stsz[0] + 4)
+        if sample_size:
+            sizes = np.full(sample_count, sample_size, dtype=np.int64)
+        else:
+            sizes = np.frombuffer(
+                buffer, dtype=">u4", count=sample_count, offset=stsz[0] + 12
+            ).astype(np.int64)
+
+        stco = find_box(buffer, *stbl, b"stco")
+        if stco is not None:
+            chunk_offsets = _full_box_table(buffer, stco, ">u4", 1).astype(np.int64)
+        else:
+            chunk_offsets = _full_box_table(
+                buffer, find_box(buffer, *stbl, b"co64"), ">u8", 1
+            ).astype(np.int64)
+
+        # stsc runs: (first_chunk, samples_per_chunk, description index)
+        stsc = _full_box_table(buffer, find_box(buffer, *stbl, b"stsc"), ">u4", 3)
+        first_chunks = stsc[:, 0].astype(np.int64) - 1
+        run_lengths = np.diff(np.append(first_chunks, len(chunk_offsets)))
+        samples_per_chunk = np.repeat(stsc[:, 1].astype(np.int64), run_lengths)
+
+        sample_chunks = np.repeat(np.arange(len(chunk_offsets)), samples_per_chunk)
+        sample_chunks = sample_chunks[:sample_count]
+        ends = np.cumsum(sizes)
+        chunk_first_sample = np.cumsum(samples_per_chunk) - samples_per_chunk
+        within_chunk = ends - sizes - (ends - sizes)[chunk_first_sample[sample_chunks]]
+        offsets = chunk_offsets[sample_chunks] + within_chunk
+
+        stts = _full_box_table(buffer, find_box(buffer, *stbl, b"stts"), ">u4", 2)
+        deltas = np.repeat(stts[:, 1].astype(np.int64), stts[:, 0].astype(np.int64))
+        end_ticks = np.cumsum(deltas[:sample_count])
+        start_seconds = (end_ticks - deltas[:sample_count]) / timescale
+        end_seconds = end_ticks / timescale
+
+        return offsets, sizes, start_seconds, end_seconds
+
+    raise ValueError("MP4 file has no GPMD telemetry track.")
+
+
+def iter_klv(buffer, start, end):
+    """
+    Yield ``(key, type, struct_size, repeat, data_start)`` for each KLV in a range.
+    """
+    offset = start
+    while offset + 8 <= end:
+        key = bytes(buffer[offset : offset + 4])
+        if key == b"\x00\x00\x00\x00":
+            break
+        type_char = chr(buffer[offset + 4])
+        struct_size = buffer[offset + 5]
+        (repeat,) = struct.unpack_from(">H", buffer, offset + 6)
+        length = struct_size * repeat
+        yield key, type_char, struct_size, repeat, offset + 8
+        offset += 8 + ((length + 3) & ~3)
+
+
+def read_values(buffer, type_char, struct_size, repeat, data_start, type_string=None):
+    """
+    Decode a KLV's data into a NumPy array with one row per repeat.
+
+    Complex types ('?') are decoded with the preceding TYPE string into a
+    structured array. Strings are returned as bytes.
+    """
+    if type_char in ("c", "U"):
+        return bytes(buffer[data_start : data_start + struct_size * repeat])
+    if type_char == "?":
+        dtype = np.dtype([(f"f{i}", GPMF_TYPES[c]) for i, c in enumerate(type_string)])
+        return np.frombuffer(buffer, dtype=dtype, count=repeat, offset=data_start)
+
+    dtype = np.dtype(GPMF_TYPES[type_char])
+    columns = struct_size // dtype.itemsize
+    values = np.frombuffer(
+        buffer, dtype=dtype, count=repeat * columns, offset=data_start
+    )
+    return values.reshape(repeat, columns) if columns > 1 else values
+
+
+def parse_gpsu(value: bytes) -> np.datetime64:
+    """Parse a GPSU 'yymmddhhmmss.sss' UTC string."""
+    text = value.decode("ascii", errors="ignore").strip("\x00 ")
+    parsed = datetime.datetime.strptime(text, "%y%m%d%H%M%S.%f")
+    return np.datetime64(parsed, "ms")
+
+
+def iter_streams(buffer, start, end):
+    """Yield ``(strm_start, strm_end)`` for each STRM inside the DEVCs of a payload."""
+    for key, type_char, devc_size, devc_repeat, data_start in iter_klv(
+        buffer, start, end
+    ):
+        if key != b"DEVC" or type_char != "\x00":
+            continue
+        devc_end = data_start + devc_size * devc_repeat
+        for strm_key, strm_type, strm_size, strm_repeat, strm_start in iter_klv(
+            buffer, data_start, devc_end
+        ):
+            if strm_key == b"STRM" and strm_type == "\x00":
+                yield strm_start, strm_start + strm_size * strm_repeat
+
+
+def parse_imu_payload(buffer, start, end) -> dict:
+    """
+    Decode the accelerometer and gyroscope streams in one telemetry payload.
+
+    Args:
+        buffer: Memory map or bytes of the MP4 file.
+        start (int): Payload offset.
+        end (int): Payload end offset.
+
+    Returns:
+        dict: ``{"ACCL": rows, "GYRO": rows}`` for the streams present, each
+        a scaled N x 3 array (m/s^2 and rad/s).
+    """
+    sensors = {}
+    for strm_start, strm_end in iter_streams(buffer, start, end):
+        scale = 1.0
+        for k, t, size, repeat, d in iter_klv(buffer, strm_start, strm_end):
+            if k == b"SCAL":
+                scale = read_values(buffer, t, size, repeat, d).astype(np.float64)
+            elif k in IMU_KEYS:
+                values = read_values(buffer, t, size, repeat, d)
+                sensors[k.decode()] = values.astype(np.float64).reshape(-1, 3) / scale
+    return sensors
+
+
+def parse_gps_payload(buffer, start, end) -> list:
+    """
+    Decode the GPS streams in one telemetry payload.
+
+    Args:
+        buffer: Memory map or bytes of the MP4 file.
+        start (int): Payload offset.
+        end (int): Payload end offset.
+
+    Returns:
+        list[dict]: One dict per GPS stream found, with ``rows`` (scaled
+        N x k array), ``kind`` ('GPS5' or 'GPS9') and per-payload ``gpsu``,
+        ``fix`` and ``dop`` where present.
+    """
+    streams = []
+    for strm_start, strm_end in iter_streams(buffer, start, end):
+        stream = {}
+        scale = 1.0
+        type_string = None
+        for k, t, size, repeat, d in iter_klv(buffer, strm_start, strm_end):
+            if k == b"SCAL":
+                scale = read_values(buffer, t, size, repeat, d).astype(np.float64)
+            elif k == b"TYPE":
+                type_string = (
+                    read_values(buffer, t, size, repeat, d)
+                    .decode("ascii")
+                    .rstrip("\x00")
+                )
+            elif k == b"GPSU":
+                stream["gpsu"] = parse_gpsu(read_values(buffer, t, size, repeat, d))
+            elif k == b"GPSF":
+                stream["fix"] = int(read_values(buffer, t, size, repeat, d)[0])
+            elif k == b"GPSP":
+                stream["dop"] = float(read_values(buffer, t, size, repeat, d)[0]) / 100
+            elif k in (b"GPS5", b"GPS9"):
+                values = read_values(buffer, t, size, repeat, d, type_string)
+                if values.dtype.names:
+                    values = np.column_stack(
+                        [values[name].astype(np.float64) for name in values.dtype.names]
+                    )
+                stream["kind"] = k.decode()
+                stream["rows"] = values.astype(np.float64) / scale
+        if "rows" in stream:
+            streams.append(stream)
+    return streams
+
+
+def extract_gps_track(mp4_path, stream_index=None) -> Track:
+    """
+    Read the GPS track of a GoPro MP4 into a ``telemetry.Track``.
+
+    GPS5 samples are spread evenly over their payload's duration and timed
+    from the payload's GPSU stamp; GPS9 samples carry their own time, fix
+    and DOP. ``offset`` is seconds into the video from the MP4 sample table.
+
+    Args:
+        mp4_path (str): Path to the MP4 file.
+        stream_index (int): GPMD stream index (e.g. ``VideoInfo.gpmd_stream_index``).
+
+    Returns:
+        Track: Columnar GPS track with ``base_time`` set to the UTC time of
+        video offset 0.
+    """
+    with (
+        open(mp4_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        offsets, sizes, start_seconds, end_seconds = read_gpmd_samples(mm, stream_index)
+
+        columns = {name: [] for name in ("time", "offset", "rows", "fix", "dop")}
+        for offset, size, t_start, t_end in zip(
+            offsets.tolist(), sizes.tolist(), start_seconds, end_seconds
+        ):
+            for stream in parse_gps_payload(mm, offset, offset + size):
+                rows = stream["rows"]
+                n = len(rows)
+                fraction = np.arange(n) / n
+                if stream["kind"] == "GPS9":
+                    # days since 2000, seconds since midnight, DOP, fix
+                    time = (
+                        GPS_EPOCH
+                        + (rows[:, 5] * 86400000).astype("timedelta64[ms]")
+                        + (rows[:, 6] * 1000).astype("timedelta64[ms]")
+                    )
+                    columns["dop"].append(rows[:, 7])
+                    columns["fix"].append(rows[:, 8])
+                else:
+                    if "gpsu" not in stream:
+                        continue
+                    time = stream["gpsu"] + (
+                        fraction * (t_end - t_start) * 1000
+                    ).astype("timedelta64[ms]")
+                    columns["dop"].append(np.full(n, stream.get("dop", np.nan)))
+                    columns["fix"].append(np.full(n, stream.get("fix", 0)))
+                columns["time"].append(time)
+                columns["offset"].append(t_start + fraction * (t_end - t_start))
+                columns["rows"].append(rows[:, :5])
+
+    if not columns["rows"]:
+        raise ValueError(f"No GPS samples found in {mp4_path}.")
+
+    rows = np.concatenate(columns["rows"])
+    time = np.concatenate(columns["time"]).astype("datetime64[ms]")
+    video_offset = np.concatenate(columns["offset"])
+    base_time = time[0] - np.timedelta64(int(round(video_offset[0] * 1000)), "ms")
+
+    track = Track(
+        time=time,
+        lat=rows[:, 0],
+        lon=rows[:, 1],
+        altitude=rows[:, 2],
+        speed_2d=rows[:, 3],
+        speed_3d=rows[:, 4],
+        fix=np.concatenate(columns["fix"]),
+        dop=np.concatenate(columns["dop"]),
+        offset=video_offset,
+        base_time=to_datetime(base_time),
+    )
+    logger.info(
+        f"Read {len(track)} GPS samples from {len(offsets)} GPMF payloads in {mp4_path}."
+    )
+    return track
+
+
+def gps_time_span(mp4_path, stream_index=None) -> tuple:
+    """
+    UTC time of a GoPro MP4's first frame and the length of its telemetry.
+
+    Args:
+        mp4_path (str): Path to the MP4 file.
+        stream_index (int): GPMD stream index (e.g. ``VideoInfo.gpmd_stream_index``).
+
+    Returns:
+        tuple: ``(start, duration_s)``, a timezone-aware datetime and seconds.
+    """
+    track = extract_gps_track(mp4_path, stream_index)
+    with (
+        open(mp4_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        _, _, _, end_seconds = read_gpmd_samples(mm, stream_index)
+    return track.base_time, float(end_seconds[-1])
+
+
+def extract_imu(mp4_path, stream_index=None) -> ImuTrack:
+    """
+    Read the accelerometer and gyroscope samples of a GoPro MP4.
+
+    Samples are spread evenly over their payload's duration, timed from
+    the MP4 sample table like GPS5.
+
+    Args:
+        mp4_path (str): Path to the MP4 file.
+        stream_index (int): GPMD stream index (e.g. ``VideoInfo.gpmd_stream_index``).
+
+    Returns:
+        ImuTrack: The samples, with offsets in seconds into the video.
+    """
+    with (
+        open(mp4_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        offsets, sizes, start_seconds, end_seconds = read_gpmd_samples(mm, stream_index)
+
+        columns = {key.decode(): ([], []) for key in IMU_KEYS}
+        for offset, size, t_start, t_end in zip(
+            offsets.tolist(), sizes.tolist(), start_seconds, end_seconds
+        ):
+            for key, rows in parse_imu_payload(mm, offset, offset + size).items():
+                fraction = np.arange(len(rows)) / len(rows)
+                columns[key][0].append(t_start + fraction * (t_end - t_start))
+                columns[key][1].append(rows)
+
+    if not columns["ACCL"][1]:
+        raise ValueError(f"No accelerometer samples found in {mp4_path}.")
+
+    def _stack(key):
+        times, rows = columns[key]
+        if not rows:
+            return None, None
+        return np.concatenate(times), np.concatenate(rows)
+
+    imu = ImuTrack(*_stack("ACCL"), *_stack("GYRO"))
+    logger.info(
+        f"Read {len(imu)} accelerometer samples ({imu.rate_hz:.0f} Hz) and "
+        f"{len(imu.gyro)} gyro samples from {mp4_path}."
+    )
+    return imu
@@ -0,0 +1,380 @@
+# imaging.py
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import numpy as np
+from PIL import Image
+from logging_config import logger
+
+
+def load_grayscale(source, size) -> np.ndarray:
+    """
+    Decode a frame to a small grayscale array.
+
+    JPEGs are decoded in draft mode, which lets libjpeg scale by 1/2-1/8 in
+    the DCT domain instead of decoding every full-resolution pixel.
+
+    Args:
+        source (bytes | str): Encoded image bytes or a file path.
+        size (tuple): Output ``(width, height)``.
+
+    Returns:
+        np.ndarray: ``(height, width)`` uint8 array.
+    """
+    image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    image.draft("L", (size[0] * 8, size[1] * 8))
+    return np.asarray(image.convert("L").resize(size, Image.BILINEAR))
+
+
+def dhash_frames(sources, hash_size=8, max_workers=8) -> np.ndarray:
+    """
+    Compute difference hashes (dHash) for a list of frames.
+
+    Each frame is reduced to a ``hash_size`` x ``hash_size + 1`` grayscale
+    thumbnail, and each bit records whether a pixel is brighter than its left
+    neighbour. Decoding runs in a thread pool (PIL releases the GIL); the
+    comparison and bit packing are done for all frames at once.
+
+    Args:
+        sources (list): Encoded image bytes or file paths.
+        hash_size (int): Hash side length; the hash has ``hash_size ** 2`` bits.
+        max_workers (int): Decoder threads.
+
+    Returns:
+        np.ndarray: ``(len(sources), hash_size ** 2 / 8)`` uint8 array of packed hashes.
+    """
+    if not sources:
+        return np.zeros((0, hash_size * hash_size // 8), dtype=np.uint8)
+
+    size = (hash_size + 1, hash_size)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pixels = np.stack(
+            list(executor.map(lambda s: load_grayscale(s, size), sources))
+        )
+
+    bits = pixels[:, :, 1:] > pixels[:, :, :-1]
+    return np.packbits(bits.reshape(len(sources), -1), axis=1)
+
+
+def hamming_distance(hash_a, hash_b):
+    """Number of differing bits between packed hashes (broadcasts over rows)."""
+    return np.unpackbits(np.bitwise_xor(hash_a, hash_b), axis=-1).sum(axis=-1)
+
+
+# Frames are only compared while the truck is stopped; a moving truck's frames
+# can look alike (uniform pavement) yet show different road
+DEDUPE_MAX_SPEED_MS = 1.0
+
+
+class NearDuplicateFilter:
+    """
+    Drop frames that look the same as the last frame that was kept.
+
+    Only frames whose speed is at most ``max_speed_ms`` can be dropped; frames
+    without a known speed are always kept. The filter is stateful so it can
+    run over a frame stream, or carry over from one video to the next.
+    """
+
+    def __init__(self, threshold=5, max_speed_ms=DEDUPE_MAX_SPEED_MS):
+        self.threshold = threshold
+        self.max_speed_ms = max_speed_ms
+        self.last_kept_hash = None
+        self.last_kept_key = None
+        self.kept = 0
+        self.dropped = 0
+
+    def check(self, frame_hash, key, speed=None):
+        """
+        Record a frame and decide whether it duplicates the last kept frame.
+
+        Args:
+            frame_hash (np.ndarray): Packed hash from ``dhash_frames``.
+            key: Identifier of the frame, returned for later duplicates.
+            speed (float): Ground speed at the frame in m/s; None if unknown.
+
+        Returns:
+            The key of the kept frame this one duplicates, or None if it is kept.
+        """
+        stopped = (
+            speed is not None and np.isfinite(speed) and speed <= self.max_speed_ms
+        )
+        if (
+            stopped
+            and self.last_kept_hash is not None
+            and hamming_distance(frame_hash, self.last_kept_hash) <= self.threshold
+        ):
+            self.dropped += 1
+            return self.last_kept_key
+
+        self.last_kept_hash = frame_hash
+        self.last_kept_key = key
+        self.kept += 1
+        return None
+
+
+def frame_source(telemetry_object):
+    """In-memory JPEG bytes when the frame was streamed, otherwise its file path."""
+    return getattr(telemetry_object, "image_bytes", None) or telemetry_object.filepath
+
+
+def report_api_calls_saved(stage, kept, dropped, batch_size) -> dict:
+    """
+    Log and return the OpenAI requests avoided by not sending ``dropped`` frames.
+
+    Args:
+        stage (str): Name of the filtering stage, for the log message.
+        kept (int): Frames still sent to the AI.
+        dropped (int): Frames filtered out.
+        batch_size (int): Frames per analysis run.
+
+    Returns:
+        dict: Frames dropped, uploads saved and analysis runs saved.
+    """
+    batches_before = -(-(kept + dropped) // batch_size)
+    batches_after = -(-kept // batch_size)
+    saved = {
+        "frames_dropped": dropped,
+        "uploads_saved": dropped,
+        "analysis_runs_saved": batches_before - batches_after,
+    }
+    logger.info(
+        f"{stage} kept {kept} of {kept + dropped} frames, saving "
+        f"{saved['uploads_saved']} uploads and {saved['analysis_runs_saved']} analysis runs."
+    )
+    return saved
+
+
+# Frames outside these limits skip AI analysis and get a 'skipped_reason'
+QUALITY_THRESHOLDS = {
+    "min_sharpness": 60.0,  # Laplacian variance on the scaled frame
+    "min_brightness": 45.0,  # Mean luminance, 0-255
+    "max_dark_fraction": 0.6,  # Share of pixels below 30
+    "max_clipped_fraction": 0.25,  # Share of pixels at 250 or above
+    "min_saturation": 18.0,  # Mean HSV saturation, 0-255, for a washed-out frame
+    "min_glare_brightness": 170.0,  # Low saturation only counts as glare above this
+    "max_obstruction": 0.35,  # Share of tiles that are flat and dark
+}
+
+
+def laplacian_variance(gray: np.ndarray) -> float:
+    """Variance of the 4-neighbour Laplacian; low values mean a blurry image."""
+    gray = gray.astype(np.float32)
+    laplacian = (
+        gray[:-2, 1:-1]
+        + gray[2:, 1:-1]
+        + gray[1:-1, :-2]
+        + gray[1:-1, 2:]
+        - 4 * gray[1:-1, 1:-1]
+    )
+    return float(laplacian.var())
+
+
+def score_frame_quality(source, width=320, tiles=4) -> dict:
+    """
+    Score a frame for sharpness, exposure, colour and obstruction.
+
+    The frame is decoded in draft mode at roughly ``width`` pixels wide, so
+    the scores do not depend on the source resolution and a frame costs a
+    few milliseconds.
+
+    Args:
+        source (bytes | str): Encoded image bytes or a file path.
+        width (int): Width the frame is scaled to before scoring.
+        tiles (int): Grid size for the obstruction check.
+
+    Returns:
+        dict: sharpness, brightness, dark_fraction, clipped_fraction,
+        saturation and obstruction.
+    """
+    image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    image.draft("RGB", (width, width))
+    image = image.convert("RGB")
+    image = image.resize(
+        (width, max(1, round(image.height * width / image.width))), Image.BILINEAR
+    )
+
+    gray = np.asarray(image.convert("L"))
+    saturation = np.asarray(image.convert("HSV"))[:, :, 1]
+    histogram = np.bincount(gray.ravel(), minlength=256) / gray.size
+
+    # A close object such as the truck's arm fills tiles that are flat and dark
+    rows = np.array_split(np.arange(gray.shape[0]), tiles)
+    cols = np.array_split(np.arange(gray.shape[1]), tiles)
+    blocked = 0
+    for r in rows:
+        for c in cols:
+            tile = gray[r[0] : r[-1] + 1, c[0] : c[-1] + 1]
+            if tile.std() < 8 and tile.mean() < 60:
+                blocked += 1
+
+    return {
+        "sharpness": laplacian_variance(gray),
+        "brightness": float(gray.mean()),
+        "dark_fraction": float(histogram[:30].sum()),
+        "clipped_fraction": float(histogram[250:].sum()),
+        "saturation": float(saturation.mean()),
+        "obstruction": blocked / (tiles * tiles),
+    }
+
+
+def quality_skip_reason(scores: dict, thresholds: dict = None):
+    """
+    Pick the reason a frame should not be analyzed, if any.
+
+    Args:
+        scores (dict): Output of ``score_frame_quality``.
+        thresholds (dict): Overrides for ``QUALITY_THRESHOLDS``.
+
+    Returns:
+        str: 'too_dark', 'obstructed', 'glare' or 'blurry', or None if the frame passes.
+    """
+    limits = {**QUALITY_THRESHOLDS, **(thresholds or {})}
+
+    if (
+        scores["brightness"] < limits["min_brightness"]
+        or scores["dark_fraction"] > limits["max_dark_fraction"]
+    ):
+        return "too_dark"
+    if scores["obstruction"] > limits["max_obstruction"]:
+        return "obstructed"
+    # Gray asphalt is low in saturation too; only a bright, colourless frame is glare
+    washed_out = (
+        scores["saturation"] < limits["min_saturation"]
+        and scores["brightness"] > limits["min_glare_brightness"]
+    )
+    if scores["clipped_fraction"] > limits["max_clipped_fraction"] or washed_out:
+        return "glare"
+    if scores["sharpness"] < limits["min_sharpness"]:
+        return "blurry"
+    return None
+
+
+def score_frames(sources, max_workers=None, chunksize=16) -> list:
+    """
+    Score many frames in a process pool.
+
+    Args:
+        sources (list): Encoded image bytes or file paths.
+        max_workers (int): Worker processes; defaults to the CPU count.
+        chunksize (int): Frames sent to a worker at a time.
+
+    Returns:
+        list[dict]: Scores from ``score_frame_quality``, in input order.
+    """
+    if not sources:
+        return []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(score_frame_quality, sources, chunksize=chunksize))
+
+
+# Reduced variants sent to the AI; the extracted frame is kept as-is for archival
+PAYLOAD_PROFILES = {
+    "standard": {"max_width": 1024, "format": "JPEG", "quality": 85, "detail": "high"},
+    "compact": {"max_width": 768, "format": "WEBP", "quality": 75, "detail": "high"},
+    "thumbnail": {"max_width": 512, "format": "WEBP", "quality": 70, "detail": "low"},
+}
+
+PAYLOAD_FORMATS = {"JPEG": ("image/jpeg", ".jpg"), "WEBP": ("image/webp", ".webp")}
+
+
+def estimate_image_tokens(width, height, detail="high") -> int:
+    """
+    Estimate the input tokens OpenAI charges for an image.
+
+    Low detail is a flat 85 tokens. High detail fits the image in 2048x2048,
+    shrinks its short side to 768, then charges 170 per 512px tile plus 85.
+    """
+    if detail == "low":
+        return 85
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    tiles = -(-int(width) // 512) * -(-int(height) // 512)
+    return 170 * tiles + 85
+
+
+def prepare_payload(source, profile="standard"):
+    """
+    Downscale and re-encode a frame for upload to the AI.
+
+    Args:
+        source (bytes | str): Encoded image bytes or a file path.
+        profile (str): Key of ``PAYLOAD_PROFILES``.
+
+    Returns:
+        tuple: ``(payload_bytes, stats)`` where stats has the byte size and
+        estimated image tokens before and after.
+    """
+    settings = PAYLOAD_PROFILES[profile]
+    if isinstance(source, bytes):
+        original_bytes = len(source)
+        image = Image.open(io.BytesIO(source))
+    else:
+        original_bytes = os.path.getsize(source)
+        image = Image.open(source)
+    original_size = image.size
+
+    max_width = settings["max_width"]
+    if max_width and image.width > max_width:
+        height = round(image.height * max_width / image.width)
+        image.draft("RGB", (max_width, height))
+        image = image.convert("RGB").resize((max_width, height), Image.LANCZOS)
+    else:
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=settings["format"], quality=settings["quality"])
+    payload = buffer.getvalue()
+
+    stats = {
+        "bytes_before": original_bytes,
+        "bytes_after": len(payload),
+        "tokens_before": estimate_image_tokens(*original_size, detail="high"),
+        "tokens_after": estimate_image_tokens(*image.size, detail=settings["detail"]),
+    }
+    return payload, stats
+
+
+def prepare_payloads(
+    sources, profile="standard", max_workers=None, chunksize=8
+) -> list:
+    """
+    Run ``prepare_payload`` over many frames in a process pool.
+
+    Returns:
+        list: ``(payload_bytes, stats)`` tuples in input order.
+    """
+    if not sources:
+        return []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                partial(prepare_payload, profile=profile), sources, chunksize=chunksize
+            )
+        )
+
+
+def report_payload_savings(stats: list) -> dict:
+    """
+    Log and return per-frame upload bytes and image tokens before and after.
+
+    Args:
+        stats (list): Stats dicts from ``prepare_payload``.
+
+    Returns:
+        dict: Mean bytes and tokens per frame, before and after.
+    """
+    if not stats:
+        return {}
+    report = {
+        key: sum(s[key] for s in stats) / len(stats)
+        for key in ("bytes_before", "bytes_after", "tokens_before", "tokens_after")
+    }
+    logger.info(
+        f"AI payloads for {len(stats)} frames: "
+        f"{report['bytes_before'] / 1024:.0f} KB -> {report['bytes_after'] / 1024:.0f} KB and "
+        f"{report['tokens_before']:.0f} -> {report['tokens_after']:.0f} image tokens per frame."
+    )
+    return report
@@ -0,0 +1,224 @@
+# imu.py
+import numpy as np
+from logging_config import logger
+
+# Wheel impacts from potholes and broken pavement sit well above body roll
+# and braking (< 1 Hz) and below engine and mount vibration.
+JOLT_BAND_HZ = (2.0, 25.0)
+JOLT_MIN_MS2 = 3.0  # Never count anything under ~0.3 g as a jolt
+JOLT_NOISE_FACTOR = (
+    6.0  # Threshold in robust standard deviations of the filtered signal
+)
+JOLT_MERGE_S = 0.5  # Peaks closer than this are one event
+JOLT_WINDOW_S = 1.0  # Frames within this of an event are jolt frames
+GRAVITY_WINDOW_S = 2.0  # Averaging window for the gravity direction
+# Near a jolt, an AI "no" below this confidence still goes to the checker
+JOLT_CHECKER_MAX_CONFIDENCE = 0.8
+JOLT_EVENT_FIELDS = ("offset", "start", "end", "peak_ms2", "gyro_peak")
+
+
+class ImuTrack:
+    """
+    Accelerometer and gyroscope samples from a GoPro's GPMF stream.
+
+    ``accel`` is N x 3 in m/s^2 and ``gyro`` M x 3 in rad/s, in the camera's
+    own axis order. Each has its own ``*_offset`` array of seconds into the
+    video, since the two sensors are sampled independently (~200 Hz).
+    """
+
+    def __init__(self, accel_offset, accel, gyro_offset=None, gyro=None):
+        self.accel_offset = np.asarray(accel_offset, dtype=np.float64)
+        self.accel = np.asarray(accel, dtype=np.float64).reshape(-1, 3)
+        self.gyro_offset = np.asarray(
+            gyro_offset if gyro_offset is not None else [], dtype=np.float64
+        )
+        self.gyro = np.asarray(
+            gyro if gyro is not None else [], dtype=np.float64
+        ).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.accel_offset)
+
+    @property
+    def rate_hz(self) -> float:
+        """Mean accelerometer sample rate."""
+        if len(self) < 2:
+            return 0.0
+        return (len(self) - 1) / (self.accel_offset[-1] - self.accel_offset[0])
+
+    def vertical_acceleration(self, window_s=GRAVITY_WINDOW_S) -> np.ndarray:
+        """
+        Acceleration along the local gravity direction, in m/s^2.
+
+        Gravity is the moving average of the acceleration vector, so the
+        result does not depend on how the camera is mounted.
+        """
+        window = max(1, int(round(window_s * self.rate_hz)))
+        gravity = _moving_average(self.accel, window)
+        norm = np.linalg.norm(gravity, axis=1, keepdims=True)
+        unit = np.divide(gravity, norm, out=np.zeros_like(gravity), where=norm > 0)
+        return np.einsum("ij,ij->i", self.accel, unit)
+
+
+def _moving_average(values, window):
+    """Centered moving average along axis 0, shrinking at the ends."""
+    padded = np.concatenate(
+        (np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0))
+    )
+    n = len(values)
+    index = np.arange(n)
+    lower = np.clip(index - window // 2, 0, n)
+    upper = np.clip(index + window - window // 2, 0, n)
+    counts = (upper - lower).reshape((-1,) + (1,) * (values.ndim - 1))
+    return (padded[upper] - padded[lower]) / counts
+
+
+def band_pass(signal, rate_hz, low_hz, high_hz, taper_hz=0.5) -> np.ndarray:
+    """
+    Zero-phase FFT band-pass filter.
+
+    Args:
+        signal (array-like): Evenly sampled values.
+        rate_hz (float): Sample rate.
+        low_hz (float): Lower edge of the pass band.
+        high_hz (float): Upper edge of the pass band.
+        taper_hz (float): Width of the raised-cosine edges, to limit ringing.
+
+    Returns:
+        np.ndarray: The filtered signal, same length as the input.
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    if len(signal) < 2:
+        return np.zeros_like(signal)
+    spectrum = np.fft.rfft(signal - signal.mean())
+    frequency = np.fft.rfftfreq(len(signal), d=1.0 / rate_hz)
+    rise = np.clip((frequency - (low_hz - taper_hz)) / taper_hz, 0.0, 1.0)
+    fall = np.clip(((high_hz + taper_hz) - frequency) / taper_hz, 0.0, 1.0)
+    gain = 0.5 - 0.5 * np.cos(np.pi * np.minimum(rise, fall))
+    return np.fft.irfft(spectrum * gain, n=len(signal))
+
+
+def _range_max(values, lower, upper) -> np.ndarray:
+    """Max of ``values[lower[i]:upper[i]]`` for each i, 0 for empty ranges."""
+    result = np.zeros(len(lower))
+    nonempty = upper > lower
+    if len(values) and nonempty.any():
+        bounds = np.column_stack((lower[nonempty], upper[nonempty])).ravel()
+        padded = np.append(values, 0.0)  # reduceat needs every index < len
+        result[nonempty] = np.maximum.reduceat(padded, bounds)[::2]
+    return result
+
+
+def detect_jolts(
+    imu: ImuTrack,
+    band_hz=JOLT_BAND_HZ,
+    min_ms2=JOLT_MIN_MS2,
+    noise_factor=JOLT_NOISE_FACTOR,
+    merge_s=JOLT_MERGE_S,
+) -> dict:
+    """
+    Find road-impact events in the vertical acceleration.
+
+    The vertical component is band-passed, and samples whose magnitude
+    exceeds ``max(min_ms2, noise_factor * robust sigma)`` are grouped into
+    events, with peaks less than ``merge_s`` apart treated as one.
+
+    Args:
+        imu (ImuTrack): Accelerometer (and optionally gyro) samples.
+        band_hz (tuple): Pass band in Hz.
+        min_ms2 (float): Absolute floor for the threshold, m/s^2.
+        noise_factor (float): Threshold in robust standard deviations.
+        merge_s (float): Gap below which peaks belong to the same event.
+
+    Returns:
+        dict: Arrays with one entry per event, sorted by time: offset (video
+        seconds of the peak), start, end, peak_ms2 and gyro_peak (rad/s,
+        NaN without gyro data), plus the threshold used.
+    """
+    empty = {name: np.zeros(0) for name in JOLT_EVENT_FIELDS}
+    rate = imu.rate_hz
+    high_hz = min(band_hz[1], rate / 2 - 1.0)  # Stay below Nyquist
+    if len(imu) < 2 or high_hz <= band_hz[0]:
+        return {**empty, "threshold": np.nan}
+
+    magnitude = np.abs(
+        band_pass(imu.vertical_acceleration(), rate, band_hz[0], high_hz)
+    )
+    sigma = 1.4826 * np.median(np.abs(magnitude - np.median(magnitude)))
+    threshold = max(min_ms2, noise_factor * sigma)
+
+    above = np.flatnonzero(magnitude > threshold)
+    if not len(above):
+        return {**empty, "threshold": threshold}
+    times = imu.accel_offset[above]
+    group = np.concatenate(([0], np.cumsum(np.diff(times) > merge_s)))
+    # Peak per group: sort by group, then by descending magnitude
+    order = np.lexsort((-magnitude[above], group))
+    _, first = np.unique(group[order], return_index=True)
+    peaks = above[order[first]]
+    starts = times[np.unique(group, return_index=True)[1]]
+    ends = times[len(times) - 1 - np.unique(group[::-1], return_index=True)[1]]
+
+    gyro_peak = np.full(len(peaks), np.nan)
+    if len(imu.gyro):
+        rate_magnitude = np.linalg.norm(imu.gyro, axis=1)
+        lower = np.searchsorted(imu.gyro_offset, starts)
+        upper = np.searchsorted(imu.gyro_offset, ends, side="right")
+        gyro_peak = _range_max(rate_magnitude, lower, upper)
+
+    return {
+        "offset": imu.accel_offset[peaks],
+        "start": starts,
+        "end": ends,
+        "peak_ms2": magnitude[peaks],
+        "gyro_peak": gyro_peak,
+        "threshold": threshold,
+    }
+
+
+def jolt_scores(offsets, jolts: dict, window_s=JOLT_WINDOW_S) -> np.ndarray:
+    """
+    The strongest jolt within ``window_s`` of each frame.
+
+    Args:
+        offsets (array-like): Frame offsets in seconds, in any order.
+        jolts (dict): Events from ``detect_jolts``.
+        window_s (float): How far from a frame an event still counts.
+
+    Returns:
+        np.ndarray: Peak m/s^2 per frame, NaN where no event is near.
+    """
+    offsets = np.asarray(offsets, dtype=np.float64)
+    lower = np.searchsorted(jolts["offset"], offsets - window_s)
+    upper = np.searchsorted(jolts["offset"], offsets + window_s, side="right")
+    scores = _range_max(jolts["peak_ms2"], lower, upper)
+    scores[upper == lower] = np.nan
+    return scores
+
+
+def thin_smooth_timestamps(
+    timestamps, jolts: dict, keep_every: int = 2, window_s=JOLT_WINDOW_S
+) -> list:
+    """
+    Keep every frame near a jolt and only every ``keep_every``-th elsewhere.
+
+    Args:
+        timestamps (list[float]): Sorted sample offsets in seconds.
+        jolts (dict): Events from ``detect_jolts``.
+        keep_every (int): Sampling factor on smooth stretches.
+        window_s (float): How far from an event a frame still counts as near.
+
+    Returns:
+        list[float]: The kept offsets.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if keep_every <= 1 or not len(timestamps):
+        return timestamps.tolist()
+    near = ~np.isnan(jolt_scores(timestamps, jolts, window_s))
+    smooth_rank = np.cumsum(~near) - 1
+    keep = near | (smooth_rank % keep_every == 0)
+    logger.info(
+        f"Kept {int(keep.sum())} of {len(timestamps)} sample times: "
+        f"{int(near.sum())} near jolts, every {keep_every} on smooth road."
+    )
+    return timestamps[keep].tolist()
@@ -4,6 +4,9 @@ from processing import Processor
 import dotenv
 import os
 from logging_config import logger
+from scheduling import StageLimits, run_bounded
+from sessions import group_sessions
+from gpmf import gps_time_span
 import shutil
 import asyncio
 from flask import Flask
@@ -30,6 +33,9 @@ class App:
         self.downloaded_but_unprocessed = []
         self.time_to_check = None
         self.processing_status = {}
+        self.max_concurrent_videos = int(os.getenv("MAX_CONCURRENT_VIDEOS", 3))
+        self.stage_limits = None
+        self.processor_pool = None
 
     async def initialize(self):
         """Run initialization logic and send status updates."""
@@ -83,68 +89,125 @@ class App:
 
             # check if there are files to process in the appropriate unprocessed folder
         if self.greenway_mode:
-            files_to_process = os.listdir("unprocessed_greenway_videos")
+            video_folder = "unprocessed_greenway_videos"
+            files_to_process = os.listdir(video_folder)
         else:
-            files_to_process = os.listdir("unprocessed_videos")
+            video_folder = "unprocessed_videos"
+            files_to_process = os.listdir(video_folder)
             files_to_process = [f for f in files_to_process if f != ".DS_Store"]
 
-        # establish processing status for each file
-        self.processing_status = {
-            file: {"stage": "Queued", "status": "Waiting to Start"}
-            for file in files_to_process
-        }
-
         if not files_to_process:
             self.status = "Idle - No files to process."
             logger.info("No files to process. Exiting pipeline.")
             return
 
-        for file in files_to_process:
-            self.processing_status["file"] = {
-                "stage": "Downloading",
-                "status": f"Downloading {file}...",
+        # GoPro chapters of one recording are processed together as one drive
+        def chapter_time_span(filename):
+            try:
+                return gps_time_span(os.path.join(video_folder, filename))
+            except Exception as e:
+                logger.warning(f"No GPMF time for {filename} ({e}); grouping by name.")
+                return None
+
+        sessions = group_sessions(files_to_process, time_span=chapter_time_span)
+
+        # establish processing status for each session
+        self.processing_status = {
+            session.name: {"stage": "Queued", "status": "Waiting to Start"}
+            for session in sessions
+        }
+
+        self.status = (
+            f"Processing {len(files_to_process)} videos in {len(sessions)} sessions..."
+        )
+        await run_bounded(
+            sessions,
+            lambda session: self.process_session(
+                session, greenway_mode=greenway_mode, mode=mode
+            ),
+            self.max_concurrent_videos,
+        )
+
+        self.save_processed_videos()
+
+        # Now that all the actions are done, we can clear out the frames and unprocessed_videos folder.
+        # For unprocessed_videos, make sure to only delete the files that are also in the processed_files list
+        self.status = "Cleaning up processed files..."
+        logger.info(self.status)
+        self.clear_folders()
+
+        self.status = "Idle - Waiting for next check"
+
+    def get_processor_pool(self) -> asyncio.Queue:
+        """
+        Build (once) one Processor per concurrent video, all sharing the same
+        CPU and network stage limits.
+        """
+        if self.processor_pool is None:
+            self.stage_limits = StageLimits()
+            self.processor_pool = asyncio.Queue()
+            self.frame_processor.stage_limits = self.stage_limits
+            self.processor_pool.put_nowait(self.frame_processor)
+            for _ in range(self.max_concurrent_videos - 1):
+                self.processor_pool.put_nowait(
+                    Processor(stage_limits=self.stage_limits)
+                )
+        return self.processor_pool
+
+    async def process_session(self, session, greenway_mode=False, mode="timelapse"):
+        """Run one recording session through a free Processor and its Salesforce actions."""
+        pool = self.get_processor_pool()
+        processor = await pool.get()
+        name = session.name
+
+        def report_stage(stage_name, status):
+            self.processing_status[name] = {
+                "stage": stage_name,
+                "status": f"{stage_name}: {status} for {session}",
             }
-            logger.info(self.processing_status["file"]["status"])
 
-            self.processing_status["file"] = {
+        processor.status_callback = report_stage
+        try:
+            self.processing_status[name] = {
                 "stage": "Processing",
-                "status": f"Processing footage from {file}...",
+                "status": f"Processing footage from {session}...",
             }
-            logger.info(self.processing_status["file"]["status"])
+            logger.info(self.processing_status[name]["status"])
 
-            telemetry_objects = await self.frame_processor.process_video_pipeline(
-                video_path=file, frame_rate=0.5, mode=mode
+            telemetry_objects = await processor.process_video_pipeline(
+                video_path=session.first,
+                frame_rate=0.5,
+                mode=mode,
+                chapters=session.chapters,
             )
             #'video' VS 'timelapse' MODE SET HERE. TIMELAPSE MODE IGNORES FRAMERATE I THINK
-            self.processed_videos.add(file)
-
-            # MOVED THIS OVER TO PROCESSING.PY FOR PER-FILE UPLOAD AND CLEANUP. MIGHT WORK?
-            # await self.box.save_frames_to_long_term_storage(telemetry_objects=telemetry_objects, greenway_mode=greenway_mode, video_path=file)
+            self.processed_videos.update(session.chapters)
 
-            self.processing_status[file] = {
+            self.processing_status[name] = {
                 "stage": "Complete",
-                "status": f"Processing complete for {file}.",
+                "status": f"Processing complete for {session}.",
             }
-            logger.info(self.processing_status[file]["status"])
-
-            self.status = "Processing Salesforce actions..."
-            logger.info(self.status)
+            logger.info(self.processing_status[name]["status"])
 
             if not greenway_mode:
-                ai_events_created = await self.work_order_creator.ai_event_engine(
-                    box_client=self.box, telemetry_objects=telemetry_objects
-                )
-                logger.info(f"AI Events created: {ai_events_created}")
-
-        self.save_processed_videos()
+                logger.info(f"Processing Salesforce actions for {session}...")
+                async with self.stage_limits.slot("network"):
+                    ai_events_created = await self.work_order_creator.ai_event_engine(
+                        box_client=self.box, telemetry_objects=telemetry_objects
+                    )
+                logger.info(f"AI Events created for {session}: {ai_events_created}")
+            return telemetry_objects
 
-        # Now that all the actions are done, we can clear out the frames and unprocessed_videos folder.
-        # For unprocessed_videos, make sure to only delete the files that are also in the processed_files list
-        self.status = "Cleaning up processed files..."
-        logger.info(self.status)
-        self.clear_folders()
+        except Exception as e:
+            self.processing_status[name] = {
+                "stage": "Error",
+                "status": f"Processing failed for {session}: {e}",
+            }
+            raise
 
-        self.status = "Idle - Waiting for next check"
+        finally:
+            processor.status_callback = None
+            pool.put_nowait(processor)
 
     async def download_files(self, files_to_download: list = None) -> bool:
         for file in files_to_download:
@@ -0,0 +1,197 @@
+# map_matching.py
+import os
+import json
+from functools import lru_cache
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from logging_config import logger
+
+METERS_PER_DEGREE_LAT = 110_540.0
+METERS_PER_DEGREE_LON = 111_320.0  # At the equator; scaled by cos(latitude)
+
+
+class RoadMatcher:
+    """
+    Snaps GPS points to road centerline segments without any network calls.
+
+    Centerlines are loaded once from a local GeoJSON or shapefile export and
+    indexed in a shapely STRtree. Matching is vectorized over all points:
+    one tree query finds every candidate segment within ``max_distance_m``,
+    and each point takes the candidate with the lowest score, where the
+    score is the distance plus a penalty for disagreeing with the vehicle's
+    heading. Coordinates are projected to a local equirectangular plane in
+    meters, which is accurate to well under a meter across a town.
+    """
+
+    def __init__(
+        self,
+        centerlines_path: str,
+        id_field: str = "OBJECTID",
+        name_field: str = "FULLNAME",
+        max_distance_m: float = 20.0,
+        heading_penalty_m: float = 15.0,
+    ):
+        """
+        Args:
+            centerlines_path (str): GeoJSON (WGS84) or shapefile of road centerlines.
+            id_field (str): Property holding the segment ID.
+            name_field (str): Property holding the street name.
+            max_distance_m (float): Points farther than this from every road
+                stay unmatched.
+            heading_penalty_m (float): Extra score, in meters, for a road
+                perpendicular to the heading; scales linearly from 0 when parallel.
+        """
+        self.max_distance_m = max_distance_m
+        self.heading_penalty_m = heading_penalty_m
+
+        geometries, properties = _read_centerlines(centerlines_path)
+        ids, names, lines, part_starts = [], [], [], []
+        for geometry, props in zip(geometries, properties):
+            parts = getattr(geometry, "geoms", [geometry])
+            start = 0.0
+            for part in parts:
+                if len(part.coords) < 2:
+                    continue
+                ids.append(props.get(id_field))
+                names.append(props.get(name_field))
+                lines.append(np.asarray(part.coords)[:, :2])
+                part_starts.append(start)
+                start += _length_m(part)
+
+        all_coords = np.concatenate(lines) if lines else np.zeros((0, 2))
+        self.origin_lat = float(np.mean(all_coords[:, 1])) if len(all_coords) else 0.0
+        self.lon_scale = METERS_PER_DEGREE_LON * np.cos(np.radians(self.origin_lat))
+
+        self.segment_ids = np.array(ids, dtype=object)
+        self.street_names = np.array(names, dtype=object)
+        self.part_starts = np.array(part_starts, dtype=np.float64)
+        self.lines = shapely.linestrings(
+            [np.column_stack(self._project(c[:, 1], c[:, 0])) for c in lines]
+        )
+        self.tree = shapely.STRtree(self.lines)
+        logger.info(
+            f"Indexed {len(self.lines)} centerline segments from {centerlines_path}."
+        )
+
+    def _project(self, lats, lons):
+        x = np.asarray(lons, dtype=np.float64) * self.lon_scale
+        y = np.asarray(lats, dtype=np.float64) * METERS_PER_DEGREE_LAT
+        return x, y
+
+    def match(self, lats, lons, headings=None) -> dict:
+        """
+        Match every point to its best centerline segment.
+
+        Args:
+            lats (array-like): Latitudes in degrees.
+            lons (array-like): Longitudes in degrees.
+            headings (array-like): Degrees clockwise from north; NaN or None
+                disables the heading term for that point.
+
+        Returns:
+            dict: Arrays with one entry per point: segment_id, street_name
+            (None when unmatched), offset_m (distance along the segment from
+            its start) and distance_m (NaN when unmatched).
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        count = len(lats)
+        result = {
+            "segment_id": np.full(count, None, dtype=object),
+            "street_name": np.full(count, None, dtype=object),
+            "offset_m": np.full(count, np.nan),
+            "distance_m": np.full(count, np.nan),
+        }
+        if not count or not len(self.lines):
+            return result
+
+        points = shapely.points(*self._project(lats, lons))
+        point_index, line_index = self.tree.query(
+            points, predicate="dwithin", distance=self.max_distance_m
+        )
+        if not len(point_index):
+            return result
+
+        candidates = self.lines[line_index]
+        candidate_points = points[point_index]
+        distance = shapely.distance(candidate_points, candidates)
+        offset = shapely.line_locate_point(candidates, candidate_points)
+        score = distance.copy()
+
+        if headings is not None:
+            heading = np.asarray(headings, dtype=np.float64)[point_index]
+            # Road direction around the snapped point; roads run both ways.
+            # Negative distances count from the line's end, so clamp to it.
+            length = shapely.length(candidates)
+            ahead = shapely.line_interpolate_point(
+                candidates, np.minimum(offset + 1.0, length)
+            )
+            behind = shapely.line_interpolate_point(
+                candidates, np.maximum(offset - 1.0, 0.0)
+            )
+            dx = shapely.get_x(ahead) - shapely.get_x(behind)
+            dy = shapely.get_y(ahead) - shapely.get_y(behind)
+            bearing = np.degrees(np.arctan2(dx, dy))
+            disagreement = np.abs((heading - bearing + 90) % 180 - 90)
+            score += np.nan_to_num(disagreement / 90) * self.heading_penalty_m
+
+        # Lowest score per point: sort by point then score, keep the first of each
+        order = np.lexsort((score, point_index))
+        matched, first = np.unique(point_index[order], return_index=True)
+        best = order[first]
+        segment = line_index[best]
+
+        result["segment_id"][matched] = self.segment_ids[segment]
+        result["street_name"][matched] = self.street_names[segment]
+        result["offset_m"][matched] = offset[best] + self.part_starts[segment]
+        result["distance_m"][matched] = distance[best]
+        return result
+
+
+def _read_centerlines(path):
+    if path.lower().endswith((".geojson", ".json")):
+        with open(path) as centerlines_file:
+            features = json.load(centerlines_file)["features"]
+        features = [f for f in features if f.get("geometry")]
+        return (
+            [shape(f["geometry"]) for f in features],
+            [f.get("properties") or {} for f in features],
+        )
+
+    import geopandas as gpd
+
+    frame = gpd.read_file(path)
+    if frame.crs is not None and frame.crs.to_epsg() != 4326:
+        frame = frame.to_crs(epsg=4326)
+    frame = frame[frame.geometry.notna()]
+    properties = frame.drop(columns="geometry").to_dict("records")
+    return list(frame.geometry), properties
+
+
+def _length_m(line) -> float:
+    coords = np.asarray(line.coords)
+    lat = np.radians(coords[:, 1].mean())
+    dx = np.diff(coords[:, 0]) * METERS_PER_DEGREE_LON * np.cos(lat)
+    dy = np.diff(coords[:, 1]) * METERS_PER_DEGREE_LAT
+    return float(np.hypot(dx, dy).sum())
+
+
+@lru_cache(maxsize=4)
+def load_road_matcher(centerlines_path: str = None) -> RoadMatcher:
+    """
+    The RoadMatcher for a centerline export, built once per process.
+
+    Args:
+        centerlines_path (str): Defaults to $ROAD_CENTERLINES.
+
+    Returns:
+        RoadMatcher: The matcher, or None if no centerlines are configured.
+    """
+    centerlines_path = centerlines_path or os.getenv("ROAD_CENTERLINES")
+    if not centerlines_path:
+        return None
+    return RoadMatcher(
+        centerlines_path,
+        id_field=os.getenv("ROAD_SEGMENT_ID_FIELD", "OBJECTID"),
+        name_field=os.getenv("ROAD_NAME_FIELD", "FULLNAME"),
+    )
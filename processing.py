@@ -1,17 +1,54 @@
 # processing.py
 import os
 import subprocess
-import xml.etree.ElementTree as ET
 import datetime
 from ai import AI
 import dotenv
 import json
 import time
+import numpy as np
 from logging_config import logger
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 import shutil
 import geojson
 from box import Box
+from sampling import get_sampler, distance_target_timestamps
+from sessions import MAX_CHAPTER_GAP_S
+from video_info import VideoInfo
+from gpmf import extract_gps_track, extract_imu
+from imu import (
+    JOLT_CHECKER_MAX_CONFIDENCE,
+    JOLT_EVENT_FIELDS,
+    detect_jolts,
+    jolt_scores,
+    thin_smooth_timestamps,
+)
+from telemetry import GPS_QUALITY_THRESHOLDS, Track, read_gpx, to_datetime
+from track_store import GPX_FOLDER, TRACK_EXTENSION
+from map_matching import load_road_matcher
+from avl import fill_gaps, load_avl_source, parse_times
+from frame_table import FrameTable, frame_features, frame_records, table_runs
+from workspace import Workspace
+from scheduling import StageLimits, StageStats
+from imaging import (
+    PAYLOAD_FORMATS,
+    PAYLOAD_PROFILES,
+    NearDuplicateFilter,
+    dhash_frames,
+    frame_source,
+    prepare_payload,
+    prepare_payloads,
+    quality_skip_reason,
+    report_api_calls_saved,
+    report_payload_savings,
+    score_frame_quality,
+    score_frames,
+)
+import asyncio
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 
 dotenv.load_dotenv()
@@ -23,17 +60,31 @@ class Processor:
     TEMP_BIN_FILE = "temp_metadata.bin"
     TEMP_GPX_FILE = "temp_metadata.gpx"
 
-    def __init__(self, mode="video"):
+    def __init__(self, mode="video", extraction_workers=None, stage_limits=None):
         self.ensure_ffmpeg_installed()
         self.ai = AI(os.getenv("OPENAI_API_KEY"))
         self.box: Box = Box()
         self.video_fps = None
+        self.video_infos = {}
         self.analysis_frames_per_second = None
         self.analysis_max_frames = None
         self.analysis_batch_size = None
         self.seconds_analyzed = None
         self.minutes_analyzed = None
         self.base_timestamp = None
+        self.telemetry_data = []
+        self.track = None
+        self.chapter_offsets = {}  # Chapter path -> seconds from the drive start
+        self.jolts = None  # IMU road-impact events of the current drive
+        self.gps_thresholds = None  # Overrides for telemetry.GPS_QUALITY_THRESHOLDS
+        self.gps_report = {}
+        self.interpolation_report = {}
+        self.road_matcher = load_road_matcher()  # None unless $ROAD_CENTERLINES is set
+        self.avl_source = load_avl_source()  # None unless $AVL_EXPORT is set
+        self.telemetry_source = None  # 'gopro', 'avl' or 'gopro+avl' for the current drive
+        self.api_calls_saved = {}
+        self.payload_report = {}
+        self.stream_uploads = []  # (telemetry object, future) of streamed uploads
         self.processing_status = "Idle"
         self.processing_stages = {
             "Metadata": "Pending",
@@ -43,6 +94,12 @@ class Processor:
             "Finalization": "Pending",
         }
         self.mode = mode
+        self.extraction_workers = extraction_workers or os.cpu_count() or 1
+        # Shared between Processors when several videos run at once
+        self.stage_limits: StageLimits = stage_limits or StageLimits()
+        self.status_callback = None  # Called with (stage_name, status) on updates
+        self.stage_stats: StageStats = None  # Live queue depths while the stage pipeline runs
+        self.stage_report = {}
 
         print(f"{self.box = }")
 
@@ -67,9 +124,380 @@ class Processor:
             raise FileNotFoundError(f"Video file '{file_path}' not found.")
         logger.info(f"Video file {file_path} found and validated.")
 
-    def extract_all_metadata(self, mp4_file_path):  # Runs at the start of the program
-        """Extracts binary metadata and converts it to GPX format."""
+    def extract_all_metadata(
+        self, mp4_file_path, workspace: Workspace = None
+    ):  # Runs at the start of the program
+        """
+        Read the GPS track from the video's GPMF stream and write it as GPX.
+
+        Falls back to ffmpeg + gopro2gpx if the native parser cannot read the file.
+
+        Args:
+            mp4_file_path (str): Path to the video file.
+            workspace (Workspace): Where temporary metadata files go.
+        """
+        workspace = workspace or Workspace.current_directory()
         logger.info(f"Extracting metadata from {mp4_file_path}...")
+        self.track = None
+        gpmd_stream_index = self.get_video_info(mp4_file_path).gpmd_stream_index
+        if gpmd_stream_index is None:
+            raise ValueError(f"{mp4_file_path} has no GoPro metadata stream.")
+
+        self.track = self.load_cached_track(mp4_file_path)
+        if self.track is not None:
+            self.base_timestamp = self.track.base_time
+            logger.info(
+                f"Loaded cached track for {mp4_file_path}: {len(self.track)} trackpoints; "
+                f"base timestamp {self.base_timestamp}."
+            )
+            return
+
+        try:
+            self.track = extract_gps_track(mp4_file_path, gpmd_stream_index)
+        except Exception as e:
+            logger.warning(
+                f"Native GPMF parsing failed for {mp4_file_path} ({e}); using gopro2gpx."
+            )
+            self._extract_metadata_with_gopro2gpx(
+                mp4_file_path, gpmd_stream_index, workspace
+            )
+            return
+
+        self.track.write_gpx(workspace.gpx_file)
+        self._save_gpx_to_folder(mp4_file_path, workspace.gpx_file)
+        self._save_track_cache(mp4_file_path)
+        self.base_timestamp = self.track.base_time
+        logger.info(
+            f"Extracted metadata from {mp4_file_path}. Track contains {len(self.track)} "
+            f"trackpoints; base timestamp {self.base_timestamp}."
+        )
+
+    def extract_session_metadata(self, video_paths: list, workspace: Workspace = None):
+        """
+        Read the GPS track of every chapter of a recording and stitch them
+        into one track for the whole drive.
+
+        Each chapter's track is read (or loaded from its cache) once. Chapter
+        start offsets come from the GPMF timestamps, falling back to the
+        running sum of chapter durations when a chapter has no time. The
+        drive's base timestamp is the first chapter's.
+
+        With an AVL export configured (``self.avl_source``), a chapter whose
+        GPS cannot be read does not fail the drive, and stretches without a
+        trusted GoPro fix are filled from the truck's telematics log.
+
+        Args:
+            video_paths (list[str]): Chapter paths in recording order.
+            workspace (Workspace): Where temporary metadata files go.
+        """
+        if not video_paths:
+            raise ValueError("A session needs at least one video file.")
+        workspace = workspace or Workspace.current_directory()
+        tracks = []
+        for video_path in video_paths:
+            try:
+                self.extract_all_metadata(video_path, workspace)
+            except Exception as e:
+                if self.avl_source is None:
+                    raise
+                logger.warning(f"No GoPro GPS for {video_path} ({e}); using the AVL log.")
+                self.track = None
+            tracks.append(self.track)
+
+        base_time = tracks[0].base_time if tracks[0] is not None else None
+        offsets = [0.0]
+        for previous_path, track in zip(video_paths, tracks[1:]):
+            expected = offsets[-1] + self.get_video_info(previous_path).duration
+            if base_time is not None and track is not None and track.base_time is not None:
+                offset = (track.base_time - base_time).total_seconds()
+                if abs(offset - expected) > MAX_CHAPTER_GAP_S:
+                    # sessions.group_sessions splits such chapters when it can
+                    # read their times; otherwise place the frames by GPS time
+                    logger.warning(
+                        f"Chapter starts {offset - expected:+.1f} s from the end of "
+                        f"{previous_path}; frames are placed by GPS time."
+                    )
+            else:
+                offset = expected
+            offsets.append(offset)
+
+        self.chapter_offsets = dict(zip(video_paths, offsets))
+        self.telemetry_source = "gopro"
+        found = [(track, offset) for track, offset in zip(tracks, offsets) if track is not None]
+        if base_time is None and found and found[0][0].base_time is not None:
+            # First chapter without GPS: count back from the first chapter with it
+            track, offset = found[0]
+            base_time = track.base_time - datetime.timedelta(seconds=offset)
+        if len(found) > 1:
+            self.track = Track.concatenate(
+                [track for track, _ in found],
+                offsets=[offset for _, offset in found],
+                base_time=base_time,
+            )
+            self.base_timestamp = base_time
+            logger.info(
+                f"Stitched {len(found)} chapters into one track of {len(self.track)} "
+                f"trackpoints; chapter offsets {[round(o, 1) for o in offsets]} s."
+            )
+        else:
+            self.track = found[0][0] if found else None
+
+        if self.avl_source is not None and (
+            len(found) < len(tracks) or self._has_untrusted_stretches(self.track)
+        ):
+            self.use_avl_track(video_paths, base_time)
+        elif len(tracks) == 1:
+            return
+        self.track.write_gpx(workspace.gpx_file)
+
+    def drive_gps_thresholds(self) -> dict:
+        """
+        GPS quality overrides for the current drive: ``self.gps_thresholds``
+        over the AVL log's wider ``max_gap_s`` when the track holds AVL points,
+        since AVL units report far less often than the GoPro.
+        """
+        if self.avl_source is None or "avl" not in (self.telemetry_source or ""):
+            return self.gps_thresholds
+        return {"max_gap_s": self.avl_source.max_gap_s, **(self.gps_thresholds or {})}
+
+    def _has_untrusted_stretches(self, track: Track) -> bool:
+        """Whether any trackpoint is untrusted or any fixes are ``max_gap_s`` apart."""
+        limits = {**GPS_QUALITY_THRESHOLDS, **(self.gps_thresholds or {})}
+        gaps = np.diff(track.time).astype(np.float64) / 1000
+        return bool(
+            np.any(track.gps_issues(limits) != None)  # noqa: E711 (elementwise)
+            or np.any(gaps > limits["max_gap_s"])
+        )
+
+    def use_avl_track(self, video_paths: list, base_time: datetime.datetime = None):
+        """
+        Fill the drive's track from the truck's AVL log where the GoPro has
+        no trusted fix, or use the AVL log alone when there is no GoPro GPS.
+
+        The AVL points are aligned to the video clock (see
+        ``AvlSource.clock_offset``) and get video offsets, so frames join to
+        them like to GoPro trackpoints. Without a GoPro base time, the drive
+        starts at the first chapter's creation time.
+
+        Args:
+            video_paths (list[str]): Chapter paths in recording order.
+            base_time (datetime): UTC time of offset 0 from the GoPro GPS, if known.
+        """
+        if base_time is None:
+            creation_time = self.get_video_info(video_paths[0]).creation_time
+            if not creation_time:
+                raise ValueError(
+                    f"{video_paths[0]} has neither GPS nor a creation time to find "
+                    "its AVL window."
+                )
+            base_time = to_datetime(parse_times([creation_time])[0])
+        duration = sum(self.get_video_info(path).duration for path in video_paths)
+        avl_track = self.avl_source.track_for(base_time, duration, reference=self.track)
+
+        if self.track is None or not len(self.track):
+            self.track = avl_track
+            self.telemetry_source = "avl"
+        else:
+            self.track = fill_gaps(
+                self.track, avl_track, self.gps_thresholds, base_time=base_time
+            )
+            self.telemetry_source = "gopro+avl"
+        self.base_timestamp = base_time
+        logger.info(
+            f"Telemetry source {self.telemetry_source}: {len(self.track)} trackpoints "
+            f"from {to_datetime(self.track.time[0])} to {to_datetime(self.track.time[-1])}."
+        )
+
+    def detect_session_jolts(self, video_paths: list) -> dict:
+        """
+        Find road-impact events in the accelerometer data of every chapter.
+
+        Event times are moved onto the frame timeline (seconds from
+        ``self.base_timestamp``) through the GPS track's video offsets, and
+        each event gets the position of the vehicle at its peak.
+
+        Args:
+            video_paths (list[str]): Chapter paths in recording order.
+
+        Returns:
+            dict: Event arrays from ``imu.detect_jolts`` plus lat and lon, or
+            None if no chapter has IMU data.
+        """
+        self.jolts = None
+        parts = []
+        for video_path in video_paths:
+            try:
+                imu = extract_imu(
+                    video_path, self.get_video_info(video_path).gpmd_stream_index
+                )
+            except Exception as e:
+                logger.warning(f"No IMU data in {video_path} ({e}); no jolt priors.")
+                continue
+            events = detect_jolts(imu)
+            chapter_offset = self.chapter_offsets.get(video_path, 0.0)
+            for name in ("offset", "start", "end"):
+                events[name] = events[name] + chapter_offset
+            parts.append(events)
+        if not parts:
+            return None
+
+        jolts = {
+            name: np.concatenate([part[name] for part in parts])
+            for name in JOLT_EVENT_FIELDS
+        }
+        track = self.track
+        if track is not None and len(track) and self.base_timestamp is not None:
+            known = np.isfinite(track.offset)
+            if known.sum() >= 2:
+                # Video time -> capture time, which is what frame timestamps count
+                seconds = (
+                    track.time[known] - np.datetime64(self.base_timestamp, "ms")
+                ).astype(np.float64) / 1000
+                for name in ("offset", "start", "end"):
+                    jolts[name] = np.interp(jolts[name], track.offset[known], seconds)
+            joined = track.join(jolts["offset"], self.base_timestamp)
+            jolts["lat"], jolts["lon"] = joined["lat"], joined["lon"]
+
+        self.jolts = jolts
+        logger.info(
+            f"Detected {len(jolts['offset'])} IMU jolts in {len(parts)} chapters "
+            f"(peak {np.max(jolts['peak_ms2'], initial=0):.1f} m/s^2)."
+        )
+        return jolts
+
+    @staticmethod
+    def needs_checker(telemetry_object) -> bool:
+        """
+        Whether a frame goes to the checker AI: every pothole positive, and
+        near an IMU jolt also an uncertain negative.
+        """
+        analysis = telemetry_object.analysis_results
+        if analysis.get("pothole") == "yes":
+            return True
+        confidence = analysis.get("pothole_confidence")
+        return (
+            telemetry_object.jolt is not None
+            and analysis.get("pothole") == "no"
+            and isinstance(confidence, (int, float))
+            and confidence < JOLT_CHECKER_MAX_CONFIDENCE
+        )
+
+    def _chapter_timestamps(self, video_paths: list, timestamps=None):
+        """
+        Split drive offsets between chapters.
+
+        Yields:
+            tuple: ``(video_path, chapter_offset, local_timestamps)`` per chapter;
+            ``local_timestamps`` is None when ``timestamps`` is None.
+        """
+        offsets = [self.chapter_offsets.get(path, 0.0) for path in video_paths]
+        starts = [-np.inf] + offsets[1:]  # Anything before chapter 2 belongs to chapter 1
+        ends = offsets[1:] + [np.inf]
+        for video_path, offset, start, end in zip(video_paths, offsets, starts, ends):
+            local = None
+            if timestamps is not None:
+                local = [
+                    timestamp - offset
+                    for timestamp in timestamps
+                    if start <= timestamp < end
+                ]
+            yield video_path, offset, local
+
+    def get_session_sample_timestamps(
+        self, video_paths: list, strategy="stride", frame_rate=1
+    ) -> list:
+        """
+        The frames a time-based sampler would keep if the drive were one video.
+
+        Args:
+            video_paths (list[str]): Chapter paths in recording order.
+            strategy (str): 'stride' or 'fps'.
+            frame_rate (float): Frames per second to keep.
+
+        Returns:
+            list[float]: Drive offsets in seconds for the 'timestamps' sampler.
+        """
+        info = self.get_video_info(video_paths[0])
+        last = video_paths[-1]
+        duration = self.chapter_offsets.get(last, 0.0) + self.get_video_info(last).duration
+        sampler = get_sampler(strategy, frame_rate=frame_rate)
+        return sampler.target_timestamps(info.fps, int(duration * info.fps))
+
+    def extract_session_frames(
+        self, video_paths: list, timestamps=None, max_frames=None, **kwargs
+    ) -> list:
+        """
+        Extract frames from every chapter of a drive onto the drive's timeline.
+
+        Timelapse mode extracts all frames with ``extract_all_frames_ffmpeg``;
+        video mode samples with ``extract_frames_ffmpeg``.
+
+        Args:
+            video_paths (list[str]): Chapter paths in recording order.
+            timestamps (list): Drive offsets for the 'timestamps' strategy.
+            max_frames (int): Maximum frames for the whole drive (video mode).
+            **kwargs: Passed on to the extraction method.
+
+        Returns:
+            list[tuple]: ``(filepath, timestamp)`` tuples, timestamps from the drive start.
+        """
+        extracted_frames = []
+        for video_path, offset, local in self._chapter_timestamps(video_paths, timestamps):
+            if self.mode == "timelapse":
+                chapter_kwargs = dict(kwargs)
+                if len(video_paths) > 1:
+                    # Otherwise every chapter writes frame_0001.jpg, ...
+                    base_name = os.path.splitext(os.path.basename(video_path))[0]
+                    chapter_kwargs["output_prefix"] = f"{base_name}_frame"
+                frames = self.extract_all_frames_ffmpeg(video_path, **chapter_kwargs)
+            else:
+                remaining = None
+                if max_frames:
+                    remaining = max_frames - len(extracted_frames)
+                    if remaining <= 0:
+                        break
+                frames = self.extract_frames_ffmpeg(
+                    video_path, timestamps=local, max_frames=remaining, **kwargs
+                )
+            extracted_frames.extend((path, timestamp + offset) for path, timestamp in frames)
+        return extracted_frames
+
+    def stream_session_frames(
+        self, video_paths: list, timestamps=None, max_frames=None, **kwargs
+    ):
+        """
+        Stream frames from every chapter of a drive as one continuous stream.
+
+        Args:
+            video_paths (list[str]): Chapter paths in recording order.
+            timestamps (list): Drive offsets for the 'timestamps' strategy.
+            max_frames (int): Maximum frames for the whole drive.
+            **kwargs: Passed on to ``stream_frames_ffmpeg``.
+
+        Yields:
+            tuple: ``(jpeg_bytes, timestamp, filepath)``, timestamps from the drive start.
+        """
+        count = 0
+        for video_path, offset, local in self._chapter_timestamps(video_paths, timestamps):
+            remaining = None
+            if max_frames:
+                remaining = max_frames - count
+                if remaining <= 0:
+                    return
+            chapter_stream = self.stream_frames_ffmpeg(
+                video_path, max_frames=remaining, timestamps=local, **kwargs
+            )
+            try:
+                for jpeg_bytes, timestamp, filepath in chapter_stream:
+                    count += 1
+                    yield jpeg_bytes, timestamp + offset, filepath
+            finally:
+                chapter_stream.close()  # Stops this chapter's ffmpeg if we quit early
+
+    def _extract_metadata_with_gopro2gpx(
+        self, mp4_file_path, gpmd_stream_index, workspace: Workspace
+    ):
+        """Extracts binary metadata and converts it to GPX format."""
         try:
             # Extract binary metadata
             subprocess.run(
@@ -85,20 +513,20 @@ class Processor:
                     "-codec",
                     "copy",
                     "-map",
-                    "0:2",
+                    f"0:{gpmd_stream_index}",
                     "-f",
                     "rawvideo",
-                    Processor.TEMP_BIN_FILE,
+                    workspace.bin_file,
                 ],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 check=True,
             )
-            logger.info(f"Extracted binary metadata to {Processor.TEMP_BIN_FILE}.")
-            logger.info(f"TEMP_GPX_FILE: {Processor.TEMP_GPX_FILE}")
+            logger.info(f"Extracted binary metadata to {workspace.bin_file}.")
+            logger.info(f"GPX file: {workspace.gpx_file}")
 
             # Generate GPX file
-            gpx_prefix = os.path.splitext(Processor.TEMP_GPX_FILE)[0]
+            gpx_prefix = os.path.splitext(workspace.gpx_file)[0]
             logger.info(f"GPX prefix: {gpx_prefix}")
             gopro2gpx_path = shutil.which("gopro2gpx")
 
@@ -112,57 +540,85 @@ class Processor:
             if result.returncode != 0:
                 logger.error(f"gopro2gpx failed with error:\n{result.stderr}")
                 raise RuntimeError("gopro2gpx failed. See logs for details.")
-            logger.info(f"Generated GPX file {Processor.TEMP_GPX_FILE}.")
+            logger.info(f"Generated GPX file {workspace.gpx_file}.")
 
             # Check GPX file size and number of trackpoints
-            if not os.path.exists(Processor.TEMP_GPX_FILE):
+            if not os.path.exists(workspace.gpx_file):
                 raise FileNotFoundError(
-                    f"GPX file {Processor.TEMP_GPX_FILE} not created."
+                    f"GPX file {workspace.gpx_file} not created."
                 )
 
-            self._save_gpx_to_folder(mp4_file_path)
-
-            tree = ET.parse(Processor.TEMP_GPX_FILE)
-            root = tree.getroot()
-            namespaces = {"default": "http://www.topografix.com/GPX/1/1"}
-            trkpts = root.findall(".//default:trkpt", namespaces)
+            self._save_gpx_to_folder(mp4_file_path, workspace.gpx_file)
 
-            if len(trkpts) == 0:
+            # One streaming pass gives both the trackpoints and the base time
+            self.track = read_gpx(workspace.gpx_file)
+            if len(self.track) == 0:
                 raise ValueError(
-                    f"GPX file {Processor.TEMP_GPX_FILE} contains no trackpoints."
+                    f"GPX file {workspace.gpx_file} contains no trackpoints."
                 )
 
             logger.info(
-                f"Extracted metadata from {mp4_file_path}. GPX contains {len(trkpts)} trackpoints."
+                f"Extracted metadata from {mp4_file_path}. GPX contains {len(self.track)} trackpoints."
             )
 
-            tree = ET.parse(Processor.TEMP_GPX_FILE)
-            root = tree.getroot()
-
-            namespaces = {"default": "http://www.topografix.com/GPX/1/1"}
-            metadata_time = root.find("./default:metadata/default:time", namespaces)
-
-            if metadata_time is not None:
-                base_time = datetime.datetime.strptime(
-                    metadata_time.text.strip(), "%Y-%m-%dT%H:%M:%S.%fZ"
-                )
-                self.base_timestamp = base_time
-                logger.info(f"Base timestamp extracted from GPX: {base_time}")
+            if self.track.base_time is not None:
+                self.base_timestamp = self.track.base_time
+                logger.info(f"Base timestamp extracted from GPX: {self.base_timestamp}")
+            self._save_track_cache(mp4_file_path)
         except Exception as e:
             logger.exception(f"Failed to extract metadata: {e}")
             raise
 
-    def _save_gpx_to_folder(self, video_filename):
+    def _save_gpx_to_folder(self, video_filename, gpx_file=TEMP_GPX_FILE):
         """Save the GPX file into a GPX_files/ folder with a video-based name."""
-        gpx_folder = "GPX_files"
+        gpx_folder = GPX_FOLDER
         os.makedirs(gpx_folder, exist_ok=True)
 
         base_name = os.path.splitext(os.path.basename(video_filename))[0]
         dest_path = os.path.join(gpx_folder, f"{base_name}.gpx")
 
-        shutil.copy2(Processor.TEMP_GPX_FILE, dest_path)
+        shutil.copy2(gpx_file, dest_path)
         logger.info(f"Copied GPX file to {dest_path}")
 
+    @staticmethod
+    def _track_cache_path(video_filename) -> str:
+        """Where the parsed track for a video is kept, next to its GPX copy."""
+        base_name = os.path.splitext(os.path.basename(video_filename))[0]
+        return os.path.join(GPX_FOLDER, f"{base_name}{TRACK_EXTENSION}")
+
+    def _track_cache_key(self, video_filename) -> str:
+        info = self.get_video_info(video_filename)
+        return VideoInfo.cache_key(video_filename, info.size, info.mtime_ns)
+
+    def _save_track_cache(self, video_filename):
+        """Save ``self.track`` next to the GPX copy so later runs skip parsing."""
+        cache_path = self._track_cache_path(video_filename)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        self.track.source = self._track_cache_key(video_filename)
+        self.track.save(cache_path)
+
+    def load_cached_track(self, video_filename):
+        """
+        Return the saved track for a video, if it was parsed from this exact file.
+
+        Args:
+            video_filename (str): Path to the video file.
+
+        Returns:
+            Track: The cached track, or None if there is no valid cache.
+        """
+        cache_path = self._track_cache_path(video_filename)
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            track = Track.load(cache_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable track cache {cache_path}: {e}")
+            return None
+        if track.source != self._track_cache_key(video_filename) or not len(track):
+            return None
+        return track
+
     @staticmethod
     def cleanup_temp_files(*files):
         """Remove temporary files."""
@@ -179,39 +635,21 @@ class Processor:
             if os.path.exists(temp_file):
                 os.remove(temp_file)
 
-    def preprocess_gpx_file(self):
+    def preprocess_gpx_file(self, workspace: Workspace = None):
         """Preprocess the GPX file to extract and sort all timestamps with telemetry data."""
-        try:
-            tree = ET.parse(Processor.TEMP_GPX_FILE)
-            root = tree.getroot()
-
-            namespaces = {
-                "default": "http://www.topografix.com/GPX/1/1",
-                "gpxtpx": "http://www.garmin.com/xmlschemas/TrackPointExtension/v2",
-            }
-
-            telemetry_data = []
+        if self.track is not None:
+            # Already read from GPMF, the track cache or the GPX; no need to parse again
+            telemetry_data = self.track.to_records()
+            logger.info(f"Loaded {len(telemetry_data)} telemetry data points.")
+            self.interpolation_report = self.track.interpolation_error()
+            return telemetry_data
 
-            for trkpt in root.findall(".//default:trkpt", namespaces):
-                time_element = trkpt.find("default:time", namespaces)
-                if time_element is not None:
-                    # Parse and truncate microseconds
-                    timestamp = datetime.datetime.strptime(
-                        time_element.text.strip(), "%Y-%m-%dT%H:%M:%S.%fZ"
-                    )
-                    timestamp = timestamp.replace(microsecond=0)  # Drop microseconds
-                    telemetry = {
-                        "timestamp": timestamp,
-                        "lat": float(trkpt.attrib.get("lat", 0.0)),
-                        "lon": float(trkpt.attrib.get("lon", 0.0)),
-                        "elevation": trkpt.findtext("default:ele", "N/A", namespaces),
-                        "heart_rate": trkpt.findtext(".//gpxtpx:hr", "N/A", namespaces),
-                        "speed": trkpt.findtext(".//gpxtpx:speed", "N/A", namespaces),
-                    }
-                    telemetry_data.append(telemetry)
-
-            # Sort telemetry data by timestamp
-            telemetry_data.sort(key=lambda x: x["timestamp"])
+        try:
+            workspace = workspace or Workspace.current_directory()
+            # Streamed into arrays and sorted by time in a single pass
+            self.track = read_gpx(workspace.gpx_file)
+            self.interpolation_report = self.track.interpolation_error()
+            telemetry_data = self.track.to_records()
             logger.info(
                 f"Preprocessed and sorted {len(telemetry_data)} telemetry data points."
             )
@@ -221,6 +659,46 @@ class Processor:
             logger.error("GPX file not found.")
             return []
 
+    def get_distance_sample_timestamps(self, spacing_m=10.0, max_gap_s=10.0) -> list:
+        """
+        Choose frame timestamps every ``spacing_m`` meters along the GPX track.
+
+        Requires ``self.telemetry_data`` (from ``preprocess_gpx_file``) and
+        ``self.base_timestamp`` (from ``extract_all_metadata``).
+
+        Args:
+            spacing_m (float): Distance between sampled frames in meters.
+            max_gap_s (float): Longest allowed time between frames while stopped.
+
+        Returns:
+            list[float]: Video offsets in seconds for the 'timestamps' sampler.
+        """
+        if not self.telemetry_data:
+            raise ValueError("Distance sampling requires GPX telemetry data.")
+
+        offsets = [
+            (entry["timestamp"] - self.base_timestamp).total_seconds()
+            for entry in self.telemetry_data
+        ]
+        lats = [entry["lat"] for entry in self.telemetry_data]
+        lons = [entry["lon"] for entry in self.telemetry_data]
+        # Missing speeds become NaN; those steps fall back to track geometry
+        try:
+            speeds = np.array(
+                [entry.get("speed") for entry in self.telemetry_data], dtype=np.float64
+            )
+        except (TypeError, ValueError):
+            speeds = None
+
+        timestamps = distance_target_timestamps(
+            offsets, lats, lons, spacing_m=spacing_m, max_gap_s=max_gap_s, speeds=speeds
+        )
+        logger.info(
+            f"Distance sampling selected {len(timestamps)} frames "
+            f"({spacing_m} m spacing, {max_gap_s} s max gap) from {len(offsets)} trackpoints."
+        )
+        return timestamps
+
     def convert_to_gpx_timestamp(self, seconds):
         """Convert a timestamp in seconds to ISO 8601 format.
 
@@ -241,25 +719,23 @@ class Processor:
         target_time = base_time + delta
         return target_time.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    def get_base_timestamp_from_gpx(self):
+    def get_base_timestamp_from_gpx(self, workspace: Workspace = None):
         """
         Extract the base timestamp from the <metadata><time> element in the GPX file.
+        Args:
+            workspace (Workspace): Workspace holding the run's GPX file.
         Returns:
             datetime: The base timestamp as a datetime object.
         """
         try:
-            tree = ET.parse(Processor.TEMP_GPX_FILE)
-            root = tree.getroot()
-
-            namespaces = {"default": "http://www.topografix.com/GPX/1/1"}
-            metadata_time = root.find("./default:metadata/default:time", namespaces)
-
-            if metadata_time is not None:
-                base_time = datetime.datetime.strptime(
-                    metadata_time.text.strip(), "%Y-%m-%dT%H:%M:%S.%fZ"
-                )
-                logger.info(f"Base timestamp extracted from GPX: {base_time}")
-                return base_time
+            track = self.track
+            if track is None:
+                workspace = workspace or Workspace.current_directory()
+                track = read_gpx(workspace.gpx_file)
+
+            if track.base_time is not None:
+                logger.info(f"Base timestamp extracted from GPX: {track.base_time}")
+                return track.base_time
             else:
                 raise ValueError("No <time> element found in <metadata>.")
 
@@ -267,7 +743,16 @@ class Processor:
             logger.error(f"Failed to extract base timestamp from GPX file: {e}")
             raise
 
-    def extract_all_frames_ffmpeg(self, video_path, output_folder="frames", crop_top=0):
+    def extract_all_frames_ffmpeg(
+        self,
+        video_path,
+        output_folder="frames",
+        crop_top=0,
+        workers=None,
+        decode_profile="archive",
+        quality=None,
+        output_prefix="frame",
+    ):
         """
         Extracts **all** frames from a video using FFmpeg.
 
@@ -275,30 +760,19 @@ class Processor:
             video_path (str): Path to the video file.
             output_folder (str): Directory to save extracted frames.
             crop_top (int): Number of pixels to crop from the top.
+            workers (int): Parallel ffmpeg segments; defaults to ``self.extraction_workers``.
+            decode_profile (str): One of ``sampling.DECODE_PROFILES``. 'keyframes'
+                only decodes keyframes, so it returns one frame per GOP unless the
+                source is all-intra.
+            quality (int): JPEG quality (ffmpeg -q:v), overriding the profile's.
+            output_prefix (str): Frame file name prefix.
 
         Returns:
             list[tuple]: List of tuples containing frame file paths and timestamps.
         """
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
-
-        # Get video metadata using FFprobe
-        command = [
-            self.FFPROBE_PATH,
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=width,height,nb_frames,avg_frame_rate",
-            "-of",
-            "json",
-            video_path,
-        ]
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        metadata = json.loads(result.stdout)
-
-        # Get video width and height
-        video_width = int(metadata["streams"][0]["width"])
-        video_height = int(metadata["streams"][0]["height"])
+        info = self.get_video_info(video_path)
+        video_width = info.width
+        video_height = info.height
 
         # Ensure crop height is valid
         crop_height = video_height - crop_top
@@ -307,39 +781,42 @@ class Processor:
                 f"Invalid crop height: {crop_height}. Ensure crop_top is not greater than video height."
             )
 
-        # Extract **all** frames using FFmpeg
-        ffmpeg_command = [
-            self.FFMPEG_PATH,
-            "-i",
-            video_path,  # Input video
-            "-vsync",
-            "0",  # Extract every frame
-            "-frame_pts",
-            "1",  # Preserve frame order
-            "-vf",
-            f"crop={video_width}:{crop_height}:0:{crop_top}",  # Crop if needed
-            "-q:v",
-            "2",  # High-quality frames
-            os.path.join(output_folder, "frame_%04d.jpg"),  # Save frames sequentially
-        ]
+        sampler = get_sampler("all")
+        sampler.apply_decode_profile(decode_profile, quality=quality)
+        if sampler.decode_profile["keyframes_only"]:
+            sampler.frame_indices = info.get_keyframe_indices(self.FFPROBE_PATH)
+            logger.info(
+                f"Keyframe-only decode: {len(sampler.frame_indices)} of "
+                f"{info.frame_count} frames are keyframes."
+            )
+        # No timestamps, just frame index
+        return sampler.extract_parallel(
+            video_path,
+            fps=info.fps,
+            total_frames=info.frame_count,
+            output_folder=output_folder,
+            crop_filter=f"crop={video_width}:{crop_height}:0:{crop_top}",
+            ffmpeg_path=self.FFMPEG_PATH,
+            output_prefix=output_prefix,
+            workers=workers or self.extraction_workers,
+        )
 
-        try:
-            subprocess.run(ffmpeg_command, check=True)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg failed with error: {e}")
-            raise RuntimeError("Failed to extract frames using FFmpeg.")
-
-        # Generate frame file paths
-        extracted_frames = [
-            (
-                os.path.join(output_folder, f"frame_{i + 1:04d}.jpg"),
-                i,
-            )  # No timestamps, just frame index
-            for i in range(len(os.listdir(output_folder)))
-        ]
+    def get_video_info(self, video_path) -> VideoInfo:
+        """
+        Probe a video once and share the result with every stage.
 
-        logger.info(f"Extracted {len(extracted_frames)} frames to {output_folder}.")
-        return extracted_frames
+        Args:
+            video_path (str): Path to the video file.
+
+        Returns:
+            VideoInfo: Cached information about the video.
+        """
+        info = self.video_infos.get(video_path)
+        if info is None:
+            info = VideoInfo.load(video_path, Processor.FFPROBE_PATH)
+            self.video_infos[video_path] = info
+            self.video_fps = info.fps
+        return info
 
     def extract_frames_ffmpeg(
         self,
@@ -348,6 +825,9 @@ class Processor:
         output_folder="frames",
         max_frames=None,
         crop_top=360,
+        strategy="stride",
+        timestamps=None,
+        workers=None,
     ):
         """
         Extract frames at specific intervals from a video using FFmpeg, respecting max_frames.
@@ -356,46 +836,17 @@ class Processor:
             frame_rate (int): Frames per second to extract.
             output_folder (str): Directory to save extracted frames.
             max_frames (int): Maximum number of frames to extract.
+            crop_top (int): Number of pixels to crop from the top.
+            strategy (str): Sampling strategy from ``sampling.SAMPLERS``.
+            timestamps (list): Video offsets in seconds for the 'timestamps' strategy.
+            workers (int): Parallel ffmpeg segments; defaults to ``self.extraction_workers``.
         Returns:
             list[tuple]: List of tuples containing frame file paths and timestamps.
         """
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
-
-        # Get video metadata using FFprobe
-        command = [
-            self.FFPROBE_PATH,
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=width,height,nb_frames,avg_frame_rate",
-            "-of",
-            "json",
-            video_path,
-        ]
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        metadata = json.loads(result.stdout)
-
-        # Calculate total frames and FPS from metadata
-        total_frames = int(metadata["streams"][0]["nb_frames"])
-        avg_frame_rate = metadata["streams"][0]["avg_frame_rate"]
-        fps = int(
-            eval(avg_frame_rate)
-        )  # Handles fractional frame rates like "30000/1001"
-
-        # Pre-calculate frame timestamps
-        frame_interval = max(1, round(fps / frame_rate))
-        target_indices = list(range(0, total_frames, frame_interval))
-        if max_frames:
-            target_indices = target_indices[:max_frames]
-
-        # Convert frame indices to timestamps
-        timestamps = [index / fps for index in target_indices]
-
-        # Get original video width and height
-        video_width = int(metadata["streams"][0]["width"])
-        video_height = int(metadata["streams"][0]["height"])
+        info = self.get_video_info(video_path)
+        total_frames = info.frame_count
+        video_width = info.width
+        video_height = info.height
 
         # Ensure crop height is valid
         crop_height = video_height - crop_top
@@ -404,54 +855,92 @@ class Processor:
                 f"Invalid crop height: {crop_height}. Ensure crop_top is not greater than video height."
             )
 
-        # Build FFmpeg command to extract specific frames using the 'select' filter
-        select_filter = "+".join([f"eq(n\\,{index})" for index in target_indices])
+        sampler = get_sampler(strategy, frame_rate=frame_rate, timestamps=timestamps)
+        logger.info(f"Sampling {video_path} with the '{sampler.name}' strategy.")
+        return sampler.extract_parallel(
+            video_path,
+            fps=info.fps,
+            total_frames=total_frames,
+            output_folder=output_folder,
+            crop_filter=f"crop={video_width}:{crop_height}:0:{crop_top}",
+            max_frames=max_frames,
+            ffmpeg_path=self.FFMPEG_PATH,
+            workers=workers or self.extraction_workers,
+        )
+
+    def stream_frames_ffmpeg(
+        self,
+        video_path,
+        frame_rate=1,
+        max_frames=None,
+        crop_top=360,
+        strategy="stride",
+        timestamps=None,
+        sink_folder=None,
+        decode_profile=None,
+        quality=None,
+    ):
+        """
+        Stream sampled frames from FFmpeg as in-memory JPEGs instead of files.
+
+        Args:
+            video_path (str): Path to the video file.
+            frame_rate (int): Frames per second to extract.
+            max_frames (int): Maximum number of frames to extract.
+            crop_top (int): Number of pixels to crop from the top.
+            strategy (str): Sampling strategy from ``sampling.SAMPLERS``.
+            timestamps (list): Video offsets in seconds for the 'timestamps' strategy.
+            sink_folder (str): If given, also write each frame to this folder.
+            decode_profile (str): Optional profile from ``sampling.DECODE_PROFILES``.
+            quality (int): JPEG quality (ffmpeg -q:v), overriding the profile's.
+
+        Yields:
+            tuple: ``(jpeg_bytes, timestamp, filepath)`` for each frame. ``filepath``
+            is the sink path, or just the frame name when nothing is written.
+        """
+        info = self.get_video_info(video_path)
+        video_width = info.width
+        crop_height = info.height - crop_top
+        if crop_height <= 0:
+            raise ValueError(
+                f"Invalid crop height: {crop_height}. Ensure crop_top is not greater than video height."
+            )
+        if sink_folder:
+            os.makedirs(sink_folder, exist_ok=True)
+
+        sampler = get_sampler(strategy, frame_rate=frame_rate, timestamps=timestamps)
+        if decode_profile:
+            sampler.apply_decode_profile(decode_profile, quality=quality)
+            if sampler.decode_profile["keyframes_only"] and strategy == "all":
+                sampler.frame_indices = info.get_keyframe_indices(self.FFPROBE_PATH)
+        logger.info(f"Streaming {video_path} with the '{sampler.name}' strategy.")
         video_basename = os.path.splitext(os.path.basename(video_path))[0]
 
-        ffmpeg_command = [
-            self.FFMPEG_PATH,
-            "-i",
+        frames = sampler.stream(
             video_path,
-            "-map",
-            "0:v:0",  # Process only the video stream
-            "-an",  # Disable audio processing
-            "-vf",
-            f"select='{select_filter}',setpts=N/FRAME_RATE/TB,crop={video_width}:{crop_height}:0:{crop_top}",  # Select specific frames
-            "-vsync",
-            "vfr",  # Variable frame rate
-            "-frames:v",
-            str(len(target_indices)),  # Stop after extracting the desired frames
-            os.path.join(
-                output_folder, f"{video_basename}_%04d.jpg"
-            ),  # Save frames sequentially
-        ]
-
-        # Run the FFmpeg command and handle errors
-        try:
-            subprocess.run(ffmpeg_command, check=True)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg failed with error: {e}")
-            raise RuntimeError("Failed to extract frames using FFmpeg.")
-
-        # Generate frame file paths and return them with timestamps
-        extracted_frames = [
-            (
-                os.path.join(output_folder, f"{video_basename}_{i + 1:04d}.jpg"),
-                timestamps[i],
-            )
-            for i in range(len(timestamps))
-        ]
-        logger.info(f"Extracted {len(extracted_frames)} frames to {output_folder}.")
-        return extracted_frames
+            fps=info.fps,
+            total_frames=info.frame_count,
+            crop_filter=f"crop={video_width}:{crop_height}:0:{crop_top}",
+            max_frames=max_frames,
+            ffmpeg_path=self.FFMPEG_PATH,
+        )
+        for i, (jpeg_bytes, timestamp) in enumerate(frames):
+            filepath = f"{video_basename}_{i + 1:04d}.jpg"
+            if sink_folder:
+                filepath = os.path.join(sink_folder, filepath)
+                with open(filepath, "wb") as f:
+                    f.write(jpeg_bytes)
+            yield jpeg_bytes, timestamp, filepath
 
     def create_telemetry_objects(
         self, extracted_frame_tuples: list, video_path: str = "Default"
     ):  # Runs once, using all extracted_frame_tuples collected in extract_frames
         telemetry_objects = []
+        table = FrameTable(capacity=len(extracted_frame_tuples))
 
         for frame in extracted_frame_tuples:
             telemetry_object = self._create_telemetry_object(
-                frame, video_path=video_path
+                frame, video_path=video_path, table=table
             )
             telemetry_objects.append(telemetry_object)
 
@@ -460,8 +949,152 @@ class Processor:
         )
         return telemetry_objects
 
+    def create_telemetry_objects_from_stream(
+        self,
+        frame_stream,
+        video_path: str = "Default",
+        upload: bool = True,
+        dedupe_filter: NearDuplicateFilter = None,
+        payload_profile: str = None,
+        gps_gate: bool = False,
+        quality_gate: bool = False,
+        quality_thresholds: dict = None,
+        loop: asyncio.AbstractEventLoop = None,
+    ):
+        """
+        Build telemetry objects from streamed frames, uploading each to OpenAI
+        as soon as it is decoded.
+
+        Uploads keep running after this returns; ``finish_stream_uploads``
+        waits for them and reports failures.
+
+        Args:
+            frame_stream: Iterator of ``(jpeg_bytes, timestamp, filepath)`` tuples
+                from ``stream_frames_ffmpeg``.
+            video_path (str): Source video of the frames.
+            upload (bool): Upload frames to OpenAI while extraction continues.
+            dedupe_filter (NearDuplicateFilter): If given, frames are joined to
+                ``self.track`` for their speed, and frames of a stopped truck that
+                duplicate the last kept frame get ``duplicate_of`` set and are not
+                uploaded.
+            payload_profile (str): Upload a reduced ``imaging.PAYLOAD_PROFILES``
+                variant of each frame instead of the frame itself.
+            gps_gate (bool): Join each frame to ``self.track`` first and do
+                not upload frames that get a ``gps_issue``.
+            quality_gate (bool): Score each frame before the dedupe check and do
+                not upload frames that fail, as ``apply_quality_gate`` would.
+            quality_thresholds (dict): Overrides for ``imaging.QUALITY_THRESHOLDS``.
+            loop (asyncio.AbstractEventLoop): The pipeline's event loop. When
+                given, uploads run as network stages of ``self.stage_limits``
+                instead of in a private thread pool, so they never hold the
+                CPU slot this extraction runs in.
+
+        Returns:
+            list: Telemetry objects holding their JPEG bytes in memory.
+        """
+        telemetry_objects = []
+        self.stream_uploads = []
+        table = FrameTable()
+
+        def _upload(telemetry_object):
+            # Returns the payload stats, so no list is shared between threads
+            stats = None
+            if payload_profile:
+                payload, stats = prepare_payload(
+                    telemetry_object.image_bytes, payload_profile
+                )
+                telemetry_object.add_ai_payload(payload, payload_profile)
+            self.ai.upload_telemetry_object(telemetry_object)
+            return stats
+
+        executor = ThreadPoolExecutor(max_workers=20) if loop is None else None
+
+        def _submit(telemetry_object):
+            if executor is not None:
+                return executor.submit(_upload, telemetry_object)
+            return asyncio.run_coroutine_threadsafe(
+                self.stage_limits.run("network", _upload, telemetry_object), loop
+            )
+
+        try:
+            for jpeg_bytes, timestamp, filepath in frame_stream:
+                telemetry_object = self._create_telemetry_object(
+                    (filepath, timestamp), video_path=video_path, table=table
+                )
+                telemetry_object.image_bytes = jpeg_bytes
+                telemetry_objects.append(telemetry_object)
+                if gps_gate or dedupe_filter is not None:
+                    self._join_coords([telemetry_object])  # Dedupe needs the speed
+                    if gps_gate and telemetry_object.gps_issue:
+                        continue
+                # Same order as the other paths: a kept frame is never one the
+                # quality gate skips, so its duplicates always get its analysis
+                if quality_gate:
+                    scores = score_frame_quality(jpeg_bytes)
+                    reason = quality_skip_reason(scores, quality_thresholds)
+                    if reason:
+                        telemetry_object.add_analysis_results(
+                            {"skipped_reason": reason, "quality": scores}
+                        )
+                        continue
+                if dedupe_filter is not None:
+                    telemetry_object.duplicate_of = dedupe_filter.check(
+                        dhash_frames([jpeg_bytes])[0],
+                        telemetry_object.filename,
+                        telemetry_object.speed,
+                    )
+                    if telemetry_object.duplicate_of:
+                        continue
+                if upload:
+                    self.stream_uploads.append(
+                        (telemetry_object, _submit(telemetry_object))
+                    )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        logger.info(
+            f"Created {len(telemetry_objects)} telemetry objects from streamed frames."
+        )
+        if loop is None:
+            self.finish_stream_uploads()
+        return telemetry_objects
+
+    def finish_stream_uploads(self) -> list:
+        """
+        Wait for the uploads started by ``create_telemetry_objects_from_stream``.
+
+        A frame whose payload or upload failed is logged and keeps no
+        ``openai_file_id``, so the AI analysis step uploads it again.
+
+        Returns:
+            list: Telemetry objects whose streamed upload failed.
+        """
+        failed, payload_stats = [], []
+        for telemetry_object, future in self.stream_uploads:
+            try:
+                stats = future.result()
+            except Exception as e:
+                logger.error(f"Streamed upload of {telemetry_object.filename} failed: {e}")
+                failed.append(telemetry_object)
+                continue
+            if stats is not None:
+                payload_stats.append(stats)
+            if not telemetry_object.openai_file_id:
+                failed.append(telemetry_object)
+        self.stream_uploads = []
+
+        if payload_stats:
+            self.payload_report = report_payload_savings(payload_stats)
+        if failed:
+            logger.warning(
+                f"{len(failed)} streamed frames were not uploaded; "
+                "they are uploaded again before analysis."
+            )
+        return failed
+
     def _create_telemetry_object(
-        self, extracted_frame_tuple: tuple, video_path: str = None
+        self, extracted_frame_tuple: tuple, video_path: str = None, table=None
     ):  # Runs for each extracted_frame_tuple in create_telemetry_objects
         name = os.path.basename(extracted_frame_tuple[0])
         timestamp = extracted_frame_tuple[1]
@@ -471,16 +1104,242 @@ class Processor:
             filepath=filepath,
             timestamp=timestamp,
             source_video=video_path,
+            table=table,
         )
         return telemetry_object
 
+    def apply_quality_gate(
+        self,
+        telemetry_objects: list,
+        thresholds: dict = None,
+        batch_size: int = 6,
+        already_scored: bool = False,
+    ):
+        """
+        Split off frames that are too blurry, dark, washed out or obstructed
+        to be worth an AI analysis.
+
+        Scoring runs in a process pool. Failing frames get
+        ``{"skipped_reason": ..., "quality": scores}`` as their analysis results.
+
+        Args:
+            telemetry_objects (list): Telemetry objects to score.
+            thresholds (dict): Overrides for ``imaging.QUALITY_THRESHOLDS``.
+            batch_size (int): Frames per AI analysis run, for the savings report.
+            already_scored (bool): Frames were scored while streaming; only
+                split the list.
+
+        Returns:
+            tuple: ``(passed, skipped)`` lists of telemetry objects.
+        """
+        passed, skipped = [], []
+        if already_scored:
+            for obj in telemetry_objects:
+                if "quality" in obj.analysis_results:
+                    skipped.append(obj)
+                else:
+                    passed.append(obj)
+        else:
+            scores = score_frames([frame_source(obj) for obj in telemetry_objects])
+            for obj, frame_scores in zip(telemetry_objects, scores):
+                reason = quality_skip_reason(frame_scores, thresholds)
+                if reason:
+                    obj.add_analysis_results(
+                        {"skipped_reason": reason, "quality": frame_scores}
+                    )
+                    skipped.append(obj)
+                else:
+                    passed.append(obj)
+
+        report_api_calls_saved("Quality gate", len(passed), len(skipped), batch_size)
+        return passed, skipped
+
+    def apply_gps_gate(self, telemetry_objects: list, batch_size: int = 6):
+        """
+        Split off frames whose position cannot be trusted, before they are
+        uploaded or analyzed: no fix, high DOP, a jump in the track, or no
+        fix near the frame time (see ``Track.frame_issues``).
+
+        Held-back frames get ``{"skipped_reason": "gps_<issue>"}`` as their
+        analysis results, so they stay in the output and can be re-run once
+        better telemetry is available. Requires coordinates to be joined.
+
+        Args:
+            telemetry_objects (list): Telemetry objects with coordinates.
+            batch_size (int): Frames per AI analysis run, for the savings report.
+
+        Returns:
+            tuple: ``(kept, held)`` lists of telemetry objects.
+        """
+        kept, held = [], []
+        for obj in telemetry_objects:
+            if obj.gps_issue:
+                obj.add_analysis_results({"skipped_reason": f"gps_{obj.gps_issue}"})
+                held.append(obj)
+            else:
+                kept.append(obj)
+
+        self.gps_report = self.report_gps_issues(telemetry_objects)
+        report_api_calls_saved("GPS gate", len(kept), len(held), batch_size)
+        return kept, held
+
+    def report_gps_issues(self, telemetry_objects: list) -> dict:
+        """
+        Log and return how many frames of each video have a usable position.
+
+        Frames of a multi-chapter drive are counted under their chapter file.
+
+        Args:
+            telemetry_objects (list): Telemetry objects with coordinates.
+
+        Returns:
+            dict: Video file name -> counts of frames, kept frames and frames
+            per GPS issue.
+        """
+        chapters = sorted(self.chapter_offsets.items(), key=lambda item: item[1])
+        starts = [offset for _, offset in chapters]
+        report = {}
+        for obj in telemetry_objects:
+            video = obj.source_video
+            if len(chapters) > 1 and obj.offset is not None:
+                video = chapters[max(bisect_right(starts, obj.offset) - 1, 0)][0]
+            counts = report.setdefault(
+                os.path.basename(video or "unknown"), {"frames": 0, "kept": 0}
+            )
+            counts["frames"] += 1
+            issue = obj.gps_issue or "kept"
+            counts[issue] = counts.get(issue, 0) + 1
+
+        for video, counts in report.items():
+            issues = {k: v for k, v in counts.items() if k not in ("frames", "kept")}
+            logger.info(
+                f"GPS gate for {video}: {counts['kept']} of {counts['frames']} frames "
+                f"have a trusted position; held back {issues or 'none'}."
+            )
+        return report
+
+    def prepare_ai_payloads(self, telemetry_objects: list, profile: str = "standard"):
+        """
+        Attach a downscaled, re-encoded copy of each frame for the AI to use.
+
+        The extracted frame stays untouched for archival; only the payload is
+        uploaded to OpenAI. Encoding runs in a process pool.
+
+        Args:
+            telemetry_objects (list): Telemetry objects about to be analyzed.
+            profile (str): Key of ``imaging.PAYLOAD_PROFILES``.
+
+        Returns:
+            dict: Mean bytes and image tokens per frame, before and after.
+        """
+        results = prepare_payloads(
+            [frame_source(obj) for obj in telemetry_objects], profile=profile
+        )
+        for obj, (payload, _) in zip(telemetry_objects, results):
+            obj.add_ai_payload(payload, profile)
+
+        self.payload_report = report_payload_savings([stats for _, stats in results])
+        return self.payload_report
+
+    def suppress_near_duplicates(
+        self,
+        telemetry_objects: list,
+        threshold: int = 5,
+        batch_size: int = 6,
+        already_marked: bool = False,
+    ):
+        """
+        Split off frames that look the same as the previously kept frame.
+
+        Frames are compared by difference hash, so a truck that is stopped
+        produces one kept frame per stop instead of dozens. Only frames at or
+        below ``imaging.DEDUPE_MAX_SPEED_MS`` are compared; call after the
+        GPS join so each frame has its speed.
+
+        Args:
+            telemetry_objects (list): Telemetry objects in capture order.
+            threshold (int): Largest Hamming distance (of 64 bits) still
+                treated as a duplicate.
+            batch_size (int): Frames per AI analysis run, for the savings report.
+            already_marked (bool): ``duplicate_of`` was set while streaming;
+                only split the list.
+
+        Returns:
+            tuple: ``(kept, duplicates)`` lists of telemetry objects. Each
+            duplicate has ``duplicate_of`` set to the kept frame's filename.
+        """
+        if not already_marked:
+            hashes = dhash_frames([frame_source(obj) for obj in telemetry_objects])
+            dedupe_filter = NearDuplicateFilter(threshold=threshold)
+            for obj, frame_hash in zip(telemetry_objects, hashes):
+                obj.duplicate_of = dedupe_filter.check(
+                    frame_hash, obj.filename, obj.speed
+                )
+
+        kept = [obj for obj in telemetry_objects if obj.duplicate_of is None]
+        duplicates = [obj for obj in telemetry_objects if obj.duplicate_of]
+        self.api_calls_saved = report_api_calls_saved(
+            "Near-duplicate suppression", len(kept), len(duplicates), batch_size
+        )
+        return kept, duplicates
+
+    def inherit_duplicate_analyses(
+        self, telemetry_objects: list, duplicates: list, analyzed: list = None
+    ):
+        """
+        Give each duplicate frame the analysis of the frame it duplicates and
+        merge the duplicates back in capture order.
+
+        Duplicates keep their own timestamp and coordinates. A duplicate whose
+        kept frame was never analyzed gets ``{"skipped_reason":
+        "duplicate_not_analyzed"}`` and is returned separately, so it can join
+        the skipped frames instead of disappearing.
+
+        Args:
+            telemetry_objects (list): Analyzed, kept telemetry objects.
+            duplicates (list): Telemetry objects from ``suppress_near_duplicates``.
+            analyzed (list): Every analyzed frame, when ``telemetry_objects`` is
+                only part of them (the re-checked positives). Duplicates of
+                analyzed frames outside ``telemetry_objects`` are left out with
+                their kept frame. Defaults to ``telemetry_objects``.
+
+        Returns:
+            tuple: ``(merged, unanalyzed)``: kept and duplicate telemetry
+            objects in capture order, and duplicates of unanalyzed frames.
+        """
+        analyzed_names = {
+            obj.filename
+            for obj in (telemetry_objects if analyzed is None else analyzed)
+        }
+        duplicates_by_kept, unanalyzed = {}, []
+        for obj in duplicates:
+            if obj.duplicate_of in analyzed_names:
+                duplicates_by_kept.setdefault(obj.duplicate_of, []).append(obj)
+            else:
+                obj.add_analysis_results({"skipped_reason": "duplicate_not_analyzed"})
+                unanalyzed.append(obj)
+
+        merged = []
+        for obj in telemetry_objects:
+            merged.append(obj)
+            for duplicate in duplicates_by_kept.get(obj.filename, []):
+                duplicate.add_analysis_results(dict(obj.analysis_results))
+                merged.append(duplicate)
+
+        logger.info(
+            f"Copied analyses to {len(merged) - len(telemetry_objects)} near-duplicate frames."
+        )
+        if unanalyzed:
+            logger.warning(
+                f"{len(unanalyzed)} near-duplicate frames duplicate a frame that "
+                "was not analyzed; they are kept as skipped."
+            )
+        return merged, unanalyzed
+
     def add_coords_to_telemetry_objects(
         self, telemetry_objects: list
     ):  # Runs once, using all telemetry_objects created in create_telemetry_objects
-        telemetry_objects = telemetry_objects
-
-        for object in telemetry_objects:
-            self._add_coords_to_telemetry_object(object)
+        self._join_coords(telemetry_objects)
 
         logger.info(
             f"Collected and saved coordinates for {len(telemetry_objects)} telemetry objects."
@@ -489,18 +1348,67 @@ class Processor:
 
     def _add_coords_to_telemetry_object(
         self, telemetry_object
-    ):  # Runs for each telemetry_object in add_coords_to_telemetry_objects
-        timestamp = self.convert_to_gpx_timestamp(telemetry_object.timestamp)
-        telemetry = self.get_telemetry_for_timestamp_binary(
-            timestamp, self.telemetry_data
-        )
-        telem_lat = telemetry.get("lat", 0.0)
-        telem_lon = telemetry.get("lon", 0.0)
-        telemetry_object.lat = telem_lat
-        telemetry_object.lon = telem_lon
-        telemetry_object.timestamp = timestamp
+    ):  # Used by the stage pipeline, which sees one frame at a time
+        self._join_coords([telemetry_object])
         return telemetry_object
 
+    def _join_coords(self, telemetry_objects: list):
+        """
+        Replace each object's video offset with its GPX timestamp and set its
+        lat, lon, speed, heading, GPS fix/DOP and ``gps_issue`` from
+        ``self.track`` in one vectorized join, interpolated between the
+        bracketing fixes. With road centerlines configured, also snap the
+        frames to road segments. Joining again is safe: the offset is kept.
+        """
+        if not telemetry_objects:
+            return
+        offsets = np.array(
+            [obj.offset for obj in telemetry_objects], dtype=np.float64
+        )
+        target = np.datetime64(self.base_timestamp, "ms") + np.round(
+            offsets * 1000
+        ).astype("timedelta64[ms]")
+        timestamps = np.datetime_as_string(target, unit="s").tolist()
+
+        count = len(telemetry_objects)
+        columns = {"time": target, "offset": offsets, "timestamp": [f"{t}Z" for t in timestamps]}
+        if self.track is None or not len(self.track):
+            logger.error("No telemetry track loaded; frames get 0.0 coordinates.")
+            columns.update(
+                lat=np.zeros(count),
+                lon=np.zeros(count),
+                gps_issue=np.full(count, "no_track", dtype=object),
+            )
+        else:
+            joined = self.track.join(offsets, self.base_timestamp)
+            columns.update(
+                lat=joined["lat"],
+                lon=joined["lon"],
+                speed=joined["speed"],
+                heading=joined["heading"],
+                gps_fix=joined["fix"].tolist(),
+                gps_dop=joined["dop"],
+                gps_issue=self.track.frame_issues(
+                    joined, self.drive_gps_thresholds()
+                ),
+            )
+            if self.road_matcher is not None:
+                matched = self.road_matcher.match(
+                    joined["lat"], joined["lon"], joined["heading"]
+                )
+                columns.update(
+                    segment_id=matched["segment_id"],
+                    street_name=matched["street_name"].tolist(),
+                    offset_m=matched["offset_m"],
+                )
+        if self.jolts is not None:
+            columns["jolt"] = jolt_scores(offsets, self.jolts)
+
+        # One column write per table instead of one attribute write per frame
+        for table, rows, part in table_runs(telemetry_objects):
+            for name, values in columns.items():
+                table.set_many(rows, name, values[part])
+
     def get_telemetry_for_timestamp_binary(self, target_time, telemetry_data) -> dict:
         """
         Find the GPS telemetry closest to the specified timestamp using binary search.
@@ -548,28 +1456,23 @@ class Processor:
             logger.error(f"Error finding telemetry for {target_time}: {e}")
             return {"lat": 0.0, "lon": 0.0, "elevation": 0, "heart_rate": 0, "speed": 0}
 
-    def get_telemetry_for_timestamp(self, target_time) -> dict:
+    def get_telemetry_for_timestamp(
+        self, target_time, workspace: Workspace = None
+    ) -> dict:
         """Extract GPS coordinates closest to a specified timestamp from the GPX file."""
+        workspace = workspace or Workspace.current_directory()
         try:
-            tree = ET.parse(Processor.TEMP_GPX_FILE)
-            root = tree.getroot()
-
-            namespaces = {
-                "default": "http://www.topografix.com/GPX/1/1",
-                "gpxtpx": "http://www.garmin.com/xmlschemas/TrackPointExtension/v2",
-            }
-
-            for trkpt in root.findall(".//default:trkpt", namespaces):
-                time_element = trkpt.find("default:time", namespaces)
-                if time_element is not None and time_element.text == target_time:
-                    telemetry = {
-                        "lat": trkpt.attrib.get("lat", 0.0),
-                        "lon": trkpt.attrib.get("lon", 0.0),
-                        "elevation": trkpt.findtext("default:ele", "N/A", namespaces),
-                        "heart_rate": trkpt.findtext(".//gpxtpx:hr", "N/A", namespaces),
-                        "speed": trkpt.findtext(".//gpxtpx:speed", "N/A", namespaces),
-                    }
-                    return telemetry
+            track = self.track if self.track is not None else read_gpx(workspace.gpx_file)
+            matches = np.flatnonzero(track.time == np.datetime64(target_time.rstrip("Z"), "ms"))
+            if len(matches):
+                index = matches[0]
+                return {
+                    "lat": float(track.lat[index]),
+                    "lon": float(track.lon[index]),
+                    "elevation": float(track.altitude[index]),
+                    "heart_rate": "N/A",
+                    "speed": float(track.speed_2d[index]),
+                }
 
             logger.error("No matching telemetry data found.")
             errored_telemetry = {
@@ -630,15 +1533,20 @@ class Processor:
         )
         return analyzed_telem_objects
 
-    def save_telemetry_objects(self, telemetry_objects: list):
+    def save_telemetry_objects(
+        self, telemetry_objects: list, workspace: Workspace = None
+    ):
         """
         Save each telemetry object as a JSON file in the same folder as the frame JPG.
 
         Args:
             telemetry_objects (list): List of telemetry objects.
+            workspace (Workspace): Holds the work order folder, and the JSON
+                of frames that were streamed rather than written to disk.
         """
+        workspace = workspace or Workspace.current_directory()
 
-        print(f"{telemetry_objects = }")
+        logger.debug(f"Saving {len(telemetry_objects)} telemetry objects.")
 
         flat_telemetry_objects = []
         for item in telemetry_objects:
@@ -647,32 +1555,27 @@ class Processor:
             else:
                 flat_telemetry_objects.append(item)
 
-        work_order_folder = "work_order_frames"
+        work_order_folder = workspace.work_order_dir
         os.makedirs(work_order_folder, exist_ok=True)
 
-        for obj in flat_telemetry_objects:
+        records = frame_records(flat_telemetry_objects)
+        for obj, telemetry_data in zip(flat_telemetry_objects, records):
             video_base = os.path.splitext(os.path.basename(obj.source_video))[0]
             frame_base = os.path.splitext(os.path.basename(obj.filepath))[0]
             json_filename = f"{video_base}_{frame_base}.json"
-            json_path = os.path.join(os.path.dirname(obj.filepath), json_filename)
-
-            telemetry_data = {
-                "filename": obj.filename,
-                "filepath": obj.filepath,
-                "source_video": obj.source_video,
-                "timestamp": obj.timestamp,
-                "lat": obj.lat,
-                "lon": obj.lon,
-                "openai_file_id": obj.openai_file_id,
-                "box_file_id": obj.box_file_id,
-                "box_file_url": obj.box_file_url,
-                "analysis_results": obj.analysis_results,
-            }
+            json_folder = os.path.dirname(obj.filepath) or workspace.frames_dir
+            os.makedirs(json_folder, exist_ok=True)
+            json_path = os.path.join(json_folder, json_filename)
+
             with open(json_path, "w") as json_file:
                 json.dump(telemetry_data, json_file, indent=4)
 
+            # Near-duplicates share the kept frame's work order
+            if obj.duplicate_of:
+                continue
+
             # Check pothole criteria
-            ai_analysis = obj.analysis_results or {}
+            ai_analysis = telemetry_data["analysis_results"] or {}
             pothole = ai_analysis.get("pothole", "no")
             pothole_confidence = ai_analysis.get("pothole_confidence", 0)
 
@@ -682,10 +1585,14 @@ class Processor:
                     work_order_folder, os.path.basename(obj.filepath)
                 )
 
-                shutil.copy2(obj.filepath, work_order_frame_path)
+                if os.path.exists(obj.filepath):
+                    shutil.copy2(obj.filepath, work_order_frame_path)
+                else:
+                    with open(work_order_frame_path, "wb") as f:
+                        f.write(obj.image_bytes)
 
                 logger.info(
-                    f"Copied {obj.filename} to work_order_frames/ (Pothole confidence: {pothole_confidence})"
+                    f"Copied {obj.filename} to {work_order_folder} (Pothole confidence: {pothole_confidence})"
                 )
 
         logger.info(f"Saved {len(telemetry_objects)} telemetry objects as JSON files.")
@@ -693,11 +1600,7 @@ class Processor:
     def save_full_list(
         self, telemetry_objects: list, output_path="default_all_frames.json"
     ):
-        analyses = []
-
-        for object in telemetry_objects:
-            dict_version = object.to_dict()
-            analyses.append(dict_version)
+        analyses = frame_records(telemetry_objects)
 
         with open(output_path, "w") as json_file:
             json.dump(analyses, json_file, indent=4)
@@ -722,9 +1625,263 @@ class Processor:
         if stage_name in self.processing_stages:
             self.processing_stages[stage_name] = status
             logger.info(f"Stage Updated: {stage_name} → {status}")
+            if self.status_callback:
+                self.status_callback(stage_name, status)
         else:
             logger.warning(f"Attempted to update an unknown stage: {stage_name}")
 
+    async def run_stage_pipeline(
+        self,
+        frame_stream,
+        video_path: str,
+        workspace: Workspace,
+        batch_size: int = 6,
+        quality_gate: bool = True,
+        quality_thresholds: dict = None,
+        dedupe_threshold: int = 5,
+        payload_profile: str = "standard",
+        queue_depth: int = None,
+        gps_gate: bool = True,
+    ):
+        """
+        Run frame preparation, AI analysis and archiving as concurrent stages
+        joined by bounded queues, instead of one barrier per step.
+
+        Stages: extract (ffmpeg stream -> telemetry objects), prepare (GPS
+        and GPS gate, quality gate, dedupe, AI payload), analyze (upload + batch and checker
+        runs, one task per batch) and archive (JSON, work orders and the Box
+        ZIP). A batch is submitted as soon as ``batch_size`` frames are
+        prepared, and archiving starts with the first analyzed batch. Live
+        queue depths are in ``self.stage_stats``, final busy times and queue
+        depths in ``self.stage_report``.
+
+        Requires ``self.telemetry_data`` to be loaded.
+
+        Args:
+            frame_stream: Iterator from ``stream_frames_ffmpeg``.
+            video_path (str): Source video of the frames.
+            workspace (Workspace): Where JSON, work orders and the ZIP go.
+            batch_size (int): Frames per AI analysis run.
+            quality_gate (bool): Skip AI analysis of unusable frames.
+            quality_thresholds (dict): Overrides for ``imaging.QUALITY_THRESHOLDS``.
+            dedupe_threshold (int): Near-duplicate Hamming threshold; None disables.
+            payload_profile (str): Key of ``imaging.PAYLOAD_PROFILES``; None disables.
+            queue_depth (int): Capacity of each queue; defaults to 4 batches.
+            gps_gate (bool): Skip AI analysis of frames without a trusted position.
+
+        Returns:
+            tuple: ``(telemetry_objects, zip_path)`` with the frames in capture
+            order and the ZIP of all frames for Box.
+        """
+        loop = asyncio.get_running_loop()
+        stats = self.stage_stats = StageStats()
+        queue_depth = queue_depth or 4 * batch_size
+        frames = stats.queue("frames", queue_depth)
+        prepared = stats.queue("prepared", queue_depth)
+        analyzed = stats.queue("analyzed", queue_depth)
+        stop = threading.Event()
+
+        capture_order = {}
+        skipped, duplicates, analyzed_objects, positives, payload_stats = (
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+        video_base = os.path.splitext(os.path.basename(video_path))[0]
+        zip_path = os.path.join(
+            workspace.path,
+            f"{video_base}_{datetime.datetime.now().strftime('%Y%m%d_%H_%M')}.zip",
+        )
+
+        table = FrameTable()
+
+        def _pump_frames():
+            # Runs in a worker thread; blocks on the full queue for backpressure
+            try:
+                for jpeg_bytes, timestamp, filepath in frame_stream:
+                    telemetry_object = self._create_telemetry_object(
+                        (filepath, timestamp), video_path=video_path, table=table
+                    )
+                    telemetry_object.image_bytes = jpeg_bytes
+                    capture_order[telemetry_object.filename] = len(capture_order)
+                    put = asyncio.run_coroutine_threadsafe(
+                        frames.put(telemetry_object), loop
+                    )
+                    while True:
+                        try:
+                            put.result(timeout=1)
+                            break
+                        except FutureTimeoutError:
+                            if stop.is_set():
+                                put.cancel()
+                                return
+            finally:
+                frame_stream.close()  # Stops ffmpeg if we quit early
+
+        async def extract():
+            try:
+                async with self.stage_limits.slot("cpu"):
+                    with stats.busy("extract"):
+                        await asyncio.to_thread(_pump_frames)
+            except BaseException:
+                stop.set()  # Let the pump thread exit if another stage failed
+                raise
+            await frames.put(None)
+
+        async def prepare():
+            dedupe_filter = (
+                NearDuplicateFilter(threshold=dedupe_threshold)
+                if dedupe_threshold is not None
+                else None
+            )
+            with ProcessPoolExecutor() as pool:
+                while (obj := await frames.get()) is not None:
+                    with stats.busy("prepare"):
+                        self._add_coords_to_telemetry_object(obj)
+                        if gps_gate and obj.gps_issue:
+                            obj.add_analysis_results(
+                                {"skipped_reason": f"gps_{obj.gps_issue}"}
+                            )
+                            skipped.append(obj)
+                            continue
+                        source = frame_source(obj)
+                        if quality_gate:
+                            scores = await loop.run_in_executor(
+                                pool, score_frame_quality, source
+                            )
+                            reason = quality_skip_reason(scores, quality_thresholds)
+                            if reason:
+                                obj.add_analysis_results(
+                                    {"skipped_reason": reason, "quality": scores}
+                                )
+                                skipped.append(obj)
+                                continue
+                        if dedupe_filter is not None:
+                            hashes = await loop.run_in_executor(
+                                pool, dhash_frames, [source]
+                            )
+                            obj.duplicate_of = dedupe_filter.check(
+                                hashes[0], obj.filename, obj.speed
+                            )
+                            if obj.duplicate_of:
+                                duplicates.append(obj)
+                                continue
+                        if payload_profile:
+                            payload, payload_stat = await loop.run_in_executor(
+                                pool, prepare_payload, source, payload_profile
+                            )
+                            obj.add_ai_payload(payload, payload_profile)
+                            payload_stats.append(payload_stat)
+                    await prepared.put(obj)
+            await prepared.put(None)
+
+        async def analyze_batch(batch, in_flight):
+            try:
+                async with self.stage_limits.slot("network"):
+                    with stats.busy("analyze"):
+                        await asyncio.to_thread(
+                            self.ai.upload_files_to_openai, batch, True
+                        )
+                        await asyncio.to_thread(
+                            self.ai.run_all_analyses, batch, batch_size, False, "batch"
+                        )
+                        batch_positives = [
+                            obj for obj in batch if self.needs_checker(obj)
+                        ]
+                        if batch_positives:
+                            positives.extend(batch_positives)
+                            await asyncio.to_thread(
+                                self.ai.run_all_analyses,
+                                batch_positives,
+                                batch_size,
+                                False,
+                                "checker",
+                            )
+                for obj in batch:
+                    await analyzed.put(obj)
+            finally:
+                in_flight.release()
+
+        async def analyze():
+            in_flight = asyncio.Semaphore(self.stage_limits.network_limit)
+            async with asyncio.TaskGroup() as batches:
+                batch = []
+                while True:
+                    obj = await prepared.get()
+                    if obj is not None:
+                        batch.append(obj)
+                    if batch and (obj is None or len(batch) == batch_size):
+                        await in_flight.acquire()
+                        batches.create_task(analyze_batch(batch, in_flight))
+                        batch = []
+                    if obj is None:
+                        break
+            await analyzed.put(None)
+
+        def _archive(zip_file, objects):
+            for obj in objects:
+                if obj.image_bytes:
+                    zip_file.writestr(obj.filename, obj.image_bytes)
+                elif os.path.exists(obj.filepath):
+                    zip_file.write(obj.filepath, arcname=obj.filename)
+            self.save_telemetry_objects(objects, workspace)
+
+        async def archive(zip_file):
+            while (obj := await analyzed.get()) is not None:
+                with stats.busy("archive"):
+                    await asyncio.to_thread(_archive, zip_file, [obj])
+                    analyzed_objects.append(obj)
+
+        depth_sampler = asyncio.create_task(stats.sample_depths())
+        try:
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                async with asyncio.TaskGroup() as stages:
+                    stages.create_task(extract())
+                    stages.create_task(prepare())
+                    stages.create_task(analyze())
+                    stages.create_task(archive(zip_file))
+
+                # Skipped and duplicate frames only wait on their kept frame's analysis
+                analyzed_objects.sort(key=lambda obj: capture_order[obj.filename])
+                inherited, unanalyzed = self.inherit_duplicate_analyses(
+                    analyzed_objects, duplicates
+                )
+                leftovers = (
+                    [obj for obj in inherited if obj.duplicate_of] + unanalyzed + skipped
+                )
+                with stats.busy("archive"):
+                    await asyncio.to_thread(_archive, zip_file, leftovers)
+        finally:
+            stop.set()
+            depth_sampler.cancel()
+
+        report_api_calls_saved(
+            "Stage pipeline filters",
+            len(analyzed_objects),
+            len(skipped) + len(duplicates),
+            batch_size,
+        )
+        if payload_stats:
+            self.payload_report = report_payload_savings(payload_stats)
+        self.stage_report = stats.report()
+
+        # Same result list as the barrier pipeline: re-checked positives if any
+        telemetry_objects = positives or analyzed_objects
+        unanalyzed = []
+        if duplicates:
+            telemetry_objects, unanalyzed = self.inherit_duplicate_analyses(
+                telemetry_objects, duplicates, analyzed=analyzed_objects
+            )
+        telemetry_objects = sorted(
+            telemetry_objects + skipped + unanalyzed,
+            key=lambda obj: capture_order[obj.filename],
+        )
+        if gps_gate:
+            self.gps_report = self.report_gps_issues(telemetry_objects)
+        return telemetry_objects, zip_path
+
     async def process_video_pipeline(
         self,
         video_path,
@@ -732,31 +1889,93 @@ class Processor:
         max_frames=None,
         batch_size=6,
         mode="timelapse",
+        sampling_strategy="stride",
+        stream_frames=False,
+        frame_sink_folder=None,
+        distance_spacing_m=10.0,
+        max_gap_s=10.0,
+        decode_profile="archive",
+        frame_quality=None,
+        dedupe_threshold=5,
+        quality_thresholds=None,
+        quality_gate=True,
+        payload_profile="standard",
+        workspace_root=None,
+        pipelined=False,
+        chapters=None,
+        imu_jolts=True,
+        smooth_keep_every=1,
+        gps_gate=True,
+        gps_thresholds=None,
     ):
         """
         Process a video end-to-end, extracting frames, creating telemetry objects,
         analyzing them with OpenAI, and saving results.
 
+        With $AVL_EXPORT set, a recording whose GoPro GPS is missing or
+        unreliable takes its positions from the truck's AVL log instead of
+        failing (see ``extract_session_metadata``).
+
         Args:
             video_path (str): Path to the video file.
             frame_rate (int): Frames per second to extract.
             max_frames (int): Maximum number of frames to extract.
             batch_size (int): Number of telemetry objects per AI analysis batch.
+            sampling_strategy (str): Frame sampling strategy for video mode, or
+                'distance' to sample every ``distance_spacing_m`` meters of GPS track.
+            stream_frames (bool): Stream frames from FFmpeg in memory and upload
+                them to OpenAI while extraction is still running.
+            frame_sink_folder (str): In streaming mode, also write frames here.
+            distance_spacing_m (float): Frame spacing for 'distance' sampling.
+            max_gap_s (float): Longest time between frames for 'distance' sampling.
+            decode_profile (str): Timelapse decode profile from ``sampling.DECODE_PROFILES``.
+            frame_quality (int): Timelapse JPEG quality, overriding the profile's.
+            dedupe_threshold (int): Hamming distance under which consecutive
+                frames of a stopped truck count as duplicates and skip AI
+                analysis. None disables.
+            quality_thresholds (dict): Overrides for ``imaging.QUALITY_THRESHOLDS``.
+            quality_gate (bool): Skip AI analysis of blurry, dark, glared or
+                obstructed frames.
+            payload_profile (str): Reduced image variant sent to the AI, from
+                ``imaging.PAYLOAD_PROFILES``. None uploads the extracted frames.
+            workspace_root (str): Parent directory for the run's workspace;
+                defaults to tmpfs or the system temp directory.
+            pipelined (bool): Stream frames through queue-connected stages so
+                AI analysis and archiving overlap extraction (see
+                ``run_stage_pipeline``). Implies ``stream_frames``.
+            chapters (list[str]): All chapter files of the recording, in order,
+                starting with ``video_path`` (see ``sessions.group_sessions``).
+                The chapters are processed as one drive: one stitched track,
+                and sampling, dedupe and frame timestamps continue across
+                chapter boundaries.
+            imu_jolts (bool): Detect road impacts in the GPMF accelerometer
+                data. Frames near a jolt are analyzed first, and uncertain
+                negatives among them also go to the checker AI.
+            smooth_keep_every (int): In video mode, keep only every n-th
+                sampled frame away from jolts. 1 keeps them all.
+            gps_gate (bool): Hold back frames without a trusted GPS position
+                (no fix, high DOP, track jumps or gaps) before any upload or
+                AI analysis. They stay in the output with a 'skipped_reason'.
+            gps_thresholds (dict): Overrides for
+                ``telemetry.GPS_QUALITY_THRESHOLDS``.
 
         Returns:
             list: Fully processed telemetry objects with analysis results.
         """
 
         self.mode = mode
-        log_file = "pipeline_timing_log.txt"
+        self.gps_thresholds = gps_thresholds
+        self.gps_report = {}
+        video_base = os.path.splitext(os.path.basename(video_path))[0]
+        log_file = os.path.join("logs", f"pipeline_timing_{video_base}.log")
 
         # update the video path to pull from unprocessed_videos/ for Non-Greenway mode
-        video_path = f"unprocessed_videos/{video_path}"
+        chapter_paths = [
+            f"unprocessed_videos/{chapter}" for chapter in (chapters or [video_path])
+        ]
+        video_path = chapter_paths[0]
         # video_path = f"unprocessed_greenway_videos/{video_path}"
 
-        with open(log_file, "w") as log:
-            log.write("Stage Timing Log:\n")
-
         def log_timing(stage, start_time):
             duration = time.time() - start_time
             message = f"{stage} took {duration:.2f} seconds\n"
@@ -765,7 +1984,14 @@ class Processor:
                 log.write(message)
             return duration
 
+        workspace = None
         try:
+            # Everything this run writes lives here, so concurrent runs cannot collide
+            workspace = Workspace(name=video_base, root=workspace_root)
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            with open(log_file, "w") as log:
+                log.write("Stage Timing Log:\n")
+
             self.update_stage("Metadata", "In Progress")
             total_start_time = time.time()
 
@@ -780,14 +2006,29 @@ class Processor:
 
             stage_start = time.time()
             logger.info("Step 1: Validate the video file")
-            self.validate_video_file(video_path)
+            for chapter_path in chapter_paths:
+                self.validate_video_file(chapter_path)
             log_timing("Step 1: Validate the video file", stage_start)
 
             # Step 2: Extract metadata and prepare GPX
             stage_start = time.time()
             logger.info("Step 2: Extract metadata and prepare GPX")
-            self.extract_all_metadata(video_path)
+            await self.stage_limits.run(
+                "cpu", self.extract_session_metadata, chapter_paths, workspace
+            )
             log_timing("Step 2: Extract metadata and prepare GPX", stage_start)
+            with open(log_file, "a") as log:
+                log.write(f"Step 2: Telemetry source {self.telemetry_source}\n")
+
+            # Step 2.5: Road impacts from the accelerometer, a cheap pothole prior
+            self.jolts = None
+            if imu_jolts:
+                stage_start = time.time()
+                logger.info("Step 2.5: Detect IMU jolts")
+                await self.stage_limits.run(
+                    "cpu", self.detect_session_jolts, chapter_paths
+                )
+                log_timing("Step 2.5: Detect IMU jolts", stage_start)
 
             self.update_stage("Metadata", "Complete")
             self.update_stage("Frame Extraction", "In Progress")
@@ -796,76 +2037,296 @@ class Processor:
 
             stage_start = time.time()
             logger.info("Step 3: Extract frames from the video")
-            if self.mode == "timelapse":
-                extracted_frames = self.extract_all_frames_ffmpeg(
-                    video_path=video_path,
-                    output_folder="frames",
-                    crop_top=360,  # Crop top for GoPro videos
+            sample_timestamps = None
+            if sampling_strategy == "distance" and self.mode == "video":
+                # Read the track first so only frames at the target spacing get decoded
+                self.telemetry_data = self.preprocess_gpx_file(workspace)
+                sample_timestamps = self.get_distance_sample_timestamps(
+                    spacing_m=distance_spacing_m, max_gap_s=max_gap_s
                 )
-            elif self.mode == "video":
-                extracted_frames = self.extract_frames_ffmpeg(
-                    video_path=video_path, frame_rate=frame_rate, max_frames=max_frames
+                sampling_strategy = "timestamps"
+            elif (
+                smooth_keep_every > 1
+                and self.jolts is not None
+                and self.mode == "video"
+                and sampling_strategy in ("stride", "fps")
+            ):
+                # Thinning needs an explicit drive-wide schedule; otherwise each chapter
+                # keeps its single-pass stride/fps filter and only offsets its timestamps
+                sample_timestamps = self.get_session_sample_timestamps(
+                    chapter_paths, strategy=sampling_strategy, frame_rate=frame_rate
                 )
-            log_timing("Step 3: Extract frames from the video", stage_start)
-
-            self.update_stage("Frame Extraction", "Complete")
-            self.update_stage("Analysis Prep", "In Progress")
-
-            # Step 4: Create telemetry objects for extracted frames
-            stage_start = time.time()
-            logger.info("Step 4: Create telemetry objects for extracted frames")
-            telemetry_objects = self.create_telemetry_objects(
-                extracted_frames, video_path
-            )
-            log_timing("Step 4: Create telemetry objects", stage_start)
-
-            # Step 5: Add GPS coordinates to telemetry objects
-            stage_start = time.time()
-            logger.info("Step 5: Add GPS coordinates to telemetry objects")
-            self.telemetry_data = self.preprocess_gpx_file()
-            telemetry_objects = self.add_coords_to_telemetry_objects(telemetry_objects)
-            log_timing("Step 5: Add GPS coordinates", stage_start)
-
-            self.update_stage("Analysis Prep", "Complete")
-            self.update_stage("AI Analysis", "In Progress")
-
-            # Step 6: Perform AI analysis on telemetry objects
+                sampling_strategy = "timestamps"
+            if sample_timestamps is not None and self.jolts is not None:
+                sample_timestamps = thin_smooth_timestamps(
+                    sample_timestamps, self.jolts, keep_every=smooth_keep_every
+                )
+            zip_paths = None
+            if pipelined:
+                # Steps 3 to 7 run together as queue-connected stages
+                if sample_timestamps is None:
+                    self.telemetry_data = self.preprocess_gpx_file(workspace)
+                frame_stream = self.stream_session_frames(
+                    chapter_paths,
+                    frame_rate=frame_rate,
+                    max_frames=max_frames,
+                    strategy="all" if self.mode == "timelapse" else sampling_strategy,
+                    timestamps=sample_timestamps,
+                    sink_folder=frame_sink_folder,
+                    decode_profile=decode_profile if self.mode == "timelapse" else None,
+                    quality=frame_quality,
+                )
+                telemetry_objects, zip_path = await self.run_stage_pipeline(
+                    frame_stream,
+                    video_path,
+                    workspace,
+                    batch_size=batch_size,
+                    quality_gate=quality_gate,
+                    quality_thresholds=quality_thresholds,
+                    dedupe_threshold=dedupe_threshold,
+                    payload_profile=payload_profile,
+                    gps_gate=gps_gate,
+                )
+                zip_paths = [zip_path]
+                log_timing("Steps 3-7: Stage pipeline", stage_start)
+                with open(log_file, "a") as log:
+                    for stage, values in self.stage_report["stages"].items():
+                        log.write(
+                            f"Stage {stage} busy {values['busy_seconds']:.2f} seconds "
+                            f"over {values['items']} items\n"
+                        )
+                for stage_name in ("Frame Extraction", "Analysis Prep", "AI Analysis"):
+                    self.update_stage(stage_name, "Complete")
+            elif stream_frames:
+                # Steps 3 and 4 run together: each streamed frame becomes a
+                # telemetry object and starts uploading while ffmpeg decodes on.
+                frame_stream = self.stream_session_frames(
+                    chapter_paths,
+                    frame_rate=frame_rate,
+                    max_frames=max_frames,
+                    strategy="all" if self.mode == "timelapse" else sampling_strategy,
+                    timestamps=sample_timestamps,
+                    sink_folder=frame_sink_folder,
+                    decode_profile=decode_profile if self.mode == "timelapse" else None,
+                    quality=frame_quality,
+                )
+                telemetry_objects = await self.stage_limits.run(
+                    "cpu",
+                    self.create_telemetry_objects_from_stream,
+                    frame_stream,
+                    video_path,
+                    dedupe_filter=(
+                        NearDuplicateFilter(threshold=dedupe_threshold)
+                        if dedupe_threshold is not None
+                        else None
+                    ),
+                    payload_profile=payload_profile,
+                    gps_gate=gps_gate,
+                    quality_gate=quality_gate,
+                    quality_thresholds=quality_thresholds,
+                    loop=asyncio.get_running_loop(),
+                )
+                log_timing(
+                    "Step 3-4: Stream frames into telemetry objects", stage_start
+                )
+                self.update_stage("Frame Extraction", "Complete")
+                self.update_stage("Analysis Prep", "In Progress")
+            else:
+                if self.mode == "timelapse":
+                    extracted_frames = await self.stage_limits.run(
+                        "cpu",
+                        self.extract_session_frames,
+                        chapter_paths,
+                        output_folder=workspace.frames_dir,
+                        crop_top=360,  # Crop top for GoPro videos
+                        decode_profile=decode_profile,
+                        quality=frame_quality,
+                    )
+                elif self.mode == "video":
+                    extracted_frames = await self.stage_limits.run(
+                        "cpu",
+                        self.extract_session_frames,
+                        chapter_paths,
+                        frame_rate=frame_rate,
+                        output_folder=workspace.frames_dir,
+                        max_frames=max_frames,
+                        strategy=sampling_strategy,
+                        timestamps=sample_timestamps,
+                    )
+                extraction_duration = log_timing(
+                    "Step 3: Extract frames from the video", stage_start
+                )
+                if self.mode == "timelapse" and extracted_frames:
+                    per_thousand = extraction_duration / len(extracted_frames) * 1000
+                    message = (
+                        f"Step 3: Decode profile '{decode_profile}' took "
+                        f"{per_thousand:.2f} seconds per 1000 frames "
+                        f"({len(extracted_frames)} frames)\n"
+                    )
+                    logger.info(message.strip())
+                    with open(log_file, "a") as log:
+                        log.write(message)
+
+                self.update_stage("Frame Extraction", "Complete")
+                self.update_stage("Analysis Prep", "In Progress")
+
+                # Step 4: Create telemetry objects for extracted frames
+                stage_start = time.time()
+                logger.info("Step 4: Create telemetry objects for extracted frames")
+                telemetry_objects = self.create_telemetry_objects(
+                    extracted_frames, video_path
+                )
+                log_timing("Step 4: Create telemetry objects", stage_start)
+
+            if not pipelined:
+                # Step 5: Add GPS coordinates to telemetry objects
+                stage_start = time.time()
+                logger.info("Step 5: Add GPS coordinates to telemetry objects")
+                if sample_timestamps is None:
+                    self.telemetry_data = self.preprocess_gpx_file(workspace)
+                telemetry_objects = await self.stage_limits.run(
+                    "cpu", self.add_coords_to_telemetry_objects, telemetry_objects
+                )
+                log_timing("Step 5: Add GPS coordinates", stage_start)
+
+                capture_order = {
+                    obj.filename: index for index, obj in enumerate(telemetry_objects)
+                }
+
+                # Step 5.2: Hold back frames without a trustworthy position
+                held_frames = []
+                if gps_gate:
+                    stage_start = time.time()
+                    logger.info("Step 5.2: Check GPS fix quality")
+                    telemetry_objects, held_frames = self.apply_gps_gate(
+                        telemetry_objects, batch_size=batch_size
+                    )
+                    log_timing("Step 5.2: Check GPS fix quality", stage_start)
+
+                # Step 5.4: Score frame quality and hold back unusable frames
+                skipped_frames = []
+                if quality_gate:
+                    stage_start = time.time()
+                    logger.info("Step 5.4: Score frame quality")
+                    telemetry_objects, skipped_frames = await self.stage_limits.run(
+                        "cpu",
+                        self.apply_quality_gate,
+                        telemetry_objects,
+                        thresholds=quality_thresholds,
+                        batch_size=batch_size,
+                        already_scored=stream_frames,
+                    )
+                    log_timing("Step 5.4: Score frame quality", stage_start)
+                skipped_frames += held_frames
+
+                # Step 5.5: Drop near-duplicate frames before they reach the AI
+                duplicates = []
+                if dedupe_threshold is not None:
+                    stage_start = time.time()
+                    logger.info("Step 5.5: Suppress near-duplicate frames")
+                    telemetry_objects, duplicates = await self.stage_limits.run(
+                        "cpu",
+                        self.suppress_near_duplicates,
+                        telemetry_objects,
+                        threshold=dedupe_threshold,
+                        batch_size=batch_size,
+                        already_marked=stream_frames,
+                    )
+                    log_timing("Step 5.5: Suppress near-duplicate frames", stage_start)
+                    with open(log_file, "a") as log:
+                        log.write(
+                            f"Step 5.5: Saved {self.api_calls_saved['uploads_saved']} uploads "
+                            f"and {self.api_calls_saved['analysis_runs_saved']} analysis runs\n"
+                        )
+
+                # Step 5.6: Reduce the images sent to the AI (already done while streaming)
+                if payload_profile and not stream_frames:
+                    stage_start = time.time()
+                    logger.info("Step 5.6: Prepare AI image payloads")
+                    await self.stage_limits.run(
+                        "cpu",
+                        self.prepare_ai_payloads,
+                        telemetry_objects,
+                        profile=payload_profile,
+                    )
+                    log_timing("Step 5.6: Prepare AI image payloads", stage_start)
+                if self.payload_report:
+                    with open(log_file, "a") as log:
+                        log.write(
+                            f"Step 5.6: Payload '{payload_profile}' per frame: "
+                            f"{self.payload_report['bytes_before']:.0f} -> "
+                            f"{self.payload_report['bytes_after']:.0f} bytes, "
+                            f"{self.payload_report['tokens_before']:.0f} -> "
+                            f"{self.payload_report['tokens_after']:.0f} image tokens\n"
+                        )
+
+                self.update_stage("Analysis Prep", "Complete")
+                self.update_stage("AI Analysis", "In Progress")
+
+                # Step 6: Perform AI analysis on telemetry objects
+
+                stage_start = time.time()
+                logger.info("Step 6: Perform AI analysis on telemetry objects")
+                if stream_frames:
+                    # Uploads started while streaming ran in network slots meanwhile
+                    await asyncio.to_thread(self.finish_stream_uploads)
+                if self.jolts is not None:
+                    # Frames at physical impacts reach the AI first
+                    telemetry_objects = sorted(
+                        telemetry_objects, key=lambda obj: -(obj.jolt or 0.0)
+                    )
+                telemetry_objects = await self.stage_limits.run(
+                    "network", self.get_ai_analyses, telemetry_objects, batch_size=batch_size
+                )
+                analyzed_objects = telemetry_objects
+                log_timing("Step 6: Analyze files with AI", stage_start)
+
+                # Step 6.5: Run additional AI analysis on positive pothole detections
+                # Filter down to only those telemetry objects that have a pothole detection (telem_obj.get('pothole') == 'yes')
+                # Send list of positive detections to a (new?) AI to ask if it's really a pothole.
+                # Return a full re-assessment BUT with a more conservative and repair-based perspective.
+                positive_detections = [
+                    i for i in telemetry_objects if self.needs_checker(i)
+                ]
+                print(
+                    f"There are {len(positive_detections)} positive detections to re-check"
+                )
+                if positive_detections:
+                    telemetry_objects = await self.stage_limits.run(
+                        "network", self.get_checker_ai_analyses, positive_detections
+                    )
 
-            stage_start = time.time()
-            logger.info("Step 6: Perform AI analysis on telemetry objects")
-            telemetry_objects = self.get_ai_analyses(
-                telemetry_objects, batch_size=batch_size
-            )
-            log_timing("Step 6: Analyze files with AI", stage_start)
-
-            # Step 6.5: Run additional AI analysis on positive pothole detections
-            # Filter down to only those telemetry objects that have a pothole detection (telem_obj.get('pothole') == 'yes')
-            # Send list of positive detections to a (new?) AI to ask if it's really a pothole.
-            # Return a full re-assessment BUT with a more conservative and repair-based perspective.
-            positive_detections = [
-                i
-                for i in telemetry_objects
-                if i.analysis_results.get("pothole") == "yes"
-            ]
-            print(
-                f"There are {len(positive_detections)} positive detections to re-check"
-            )
-            if positive_detections:
-                telemetry_objects = self.get_checker_ai_analyses(positive_detections)
+                if duplicates:
+                    telemetry_objects, unanalyzed = self.inherit_duplicate_analyses(
+                        telemetry_objects, duplicates, analyzed=analyzed_objects
+                    )
+                    skipped_frames += unanalyzed
+                if skipped_frames or self.jolts is not None:
+                    telemetry_objects = sorted(
+                        telemetry_objects + skipped_frames,
+                        key=lambda obj: capture_order[obj.filename],
+                    )
 
-            # Step 7: Save telemetry objects as individual JSON files
-            stage_start = time.time()
-            logger.info("Step 7: Save telemetry objects as individual JSON files")
-            self.save_telemetry_objects(telemetry_objects)
-            log_timing("Step 7: Save telemetry objects", stage_start)
+                # Step 7: Save telemetry objects as individual JSON files
+                stage_start = time.time()
+                logger.info("Step 7: Save telemetry objects as individual JSON files")
+                self.save_telemetry_objects(telemetry_objects, workspace)
+                log_timing("Step 7: Save telemetry objects", stage_start)
 
-            self.update_stage("AI Analysis", "Complete")
+                self.update_stage("AI Analysis", "Complete")
             self.update_stage("Finalization", "In Progress")
+            if self.gps_report:
+                with open(log_file, "a") as log:
+                    for video, counts in self.gps_report.items():
+                        log.write(f"GPS gate {video}: {json.dumps(counts)}\n")
 
             # Step 8: Create and save an overview.json file
             stage_start = time.time()
             logger.info("Step 8: Create and save an overview.json file")
-            self.save_full_list(telemetry_objects=telemetry_objects)
+            self.save_full_list(
+                telemetry_objects=telemetry_objects,
+                output_path=f"{video_base}_all_frames.json",
+            )
             log_timing(
                 "Step 8: Create and save overview.json and all_frame_analyses.json",
                 stage_start,
@@ -873,16 +2334,22 @@ class Processor:
 
             # Step 9: Cleanup files and archive data in Box
             logger.info("Step 9: Cleanup files and archive data in Box")
-            self.cleanup_temp_files(Processor.TEMP_GPX_FILE)
-            telemetry_objects = await self.box.save_frames_to_long_term_storage(
-                telemetry_objects=telemetry_objects,
-                greenway_mode=False,
-                video_path=video_path,
-            )
+            self.cleanup_temp_files(workspace.gpx_file)
+            async with self.stage_limits.slot("network"):
+                telemetry_objects = await self.box.save_frames_to_long_term_storage(
+                    source_normals_folder=workspace.frames_dir,
+                    source_wos_folder=workspace.work_order_dir,
+                    telemetry_objects=telemetry_objects,
+                    greenway_mode=False,
+                    video_path=video_path,
+                    zip_paths=zip_paths,
+                )
 
             logger.info("Deleting any OpenAI files that were created.")
-            openai_file_ids = [obj.openai_file_id for obj in telemetry_objects]
-            self.ai.delete_files(openai_file_ids)
+            openai_file_ids = [
+                obj.openai_file_id for obj in telemetry_objects if obj.openai_file_id
+            ]
+            await self.stage_limits.run("network", self.ai.delete_files, openai_file_ids)
 
             # Finalize
             total_duration = time.time() - total_start_time
@@ -902,8 +2369,30 @@ class Processor:
             logger.error(f"Error in video processing pipeline: {e}")
             raise
 
+        finally:
+            if workspace is not None:
+                workspace.cleanup()
+
+
+def _column(name: str, doc: str = None):
+    """A TelemetryObject attribute stored in its FrameTable row."""
+    return property(
+        lambda self: self.table.get(self.row, name),
+        lambda self, value: self.table.set(self.row, name, value),
+        doc=doc,
+    )
+
 
 class TelemetryObject:
+    """
+    One extracted frame: a view of a row in a ``FrameTable``.
+
+    Frames created together share a table; a TelemetryObject built on its
+    own gets a one-row table of its own.
+    """
+
+    __slots__ = ("table", "row")
+
     def __init__(
         self,
         filename: str = None,
@@ -912,49 +2401,92 @@ class TelemetryObject:
         lat: float = None,
         lon: float = None,
         source_video: str = None,
+        table: FrameTable = None,
     ):
-        self.filename = filename
-        self.filepath = filepath
+        self.table = table if table is not None else FrameTable(capacity=1)
+        self.row = self.table.append(
+            filename=filename,
+            filepath=filepath,
+            lat=lat,  # y
+            lon=lon,  # x
+            source_video=source_video,
+        )
         self.timestamp = timestamp
-        self.lat = lat  # y
-        self.lon = lon  # x
-        self.openai_file_id: str = None
-        self.box_file_id: str = None
-        self.box_file_url: str = None
-        self.analysis_results: dict = {}
-        self.source_video: str = source_video
+
+    filename = _column("filename")
+    filepath = _column("filepath")
+    lat = _column("lat")
+    lon = _column("lon")
+    source_video = _column("source_video")
+    openai_file_id = _column("openai_file_id")
+    box_file_id = _column("box_file_id")
+    box_file_url = _column("box_file_url")
+    image_bytes = _column(
+        "image_bytes", "Set when frames are streamed, not written to disk"
+    )
+    duplicate_of = _column(
+        "duplicate_of", "Filename of the kept frame this one duplicates"
+    )
+    # Typed GPS channels at the frame time; None where the track lacks them
+    speed = _column("speed", "m/s")
+    heading = _column("heading", "Degrees clockwise from north")
+    gps_fix = _column("gps_fix", "0 none, 2 2D, 3 3D")
+    gps_dop = _column("gps_dop")
+    time = _column("time", "UTC capture time as datetime64[ms], once joined to the track")
+    # Road centerline the frame was snapped to, when centerlines are configured
+    segment_id = _column("segment_id")
+    street_name = _column("street_name")
+    offset_m = _column("offset_m", "Distance along the segment from its start")
+    jolt = _column("jolt", "Strongest IMU jolt near the frame in m/s^2; None on smooth road")
+    offset = _column("offset", "Seconds from the start of the drive's video")
+    gps_issue = _column(
+        "gps_issue", "Why the frame's position is not trusted; None when it is"
+    )
+    # Reduced copy of the frame sent to the AI, dropped once uploaded
+    payload_bytes = _column("payload_bytes")
+    payload_filename = _column("payload_filename")
+    payload_mime_type = _column("payload_mime_type")
+    payload_detail = _column("payload_detail")
+
+    @property
+    def timestamp(self):
+        """Seconds into the video until coordinates are joined, then the GPX timestamp."""
+        text = self.table.get(self.row, "timestamp")
+        return text if text is not None else self.table.get(self.row, "offset")
+
+    @timestamp.setter
+    def timestamp(self, value):
+        if isinstance(value, str):
+            self.table.set(self.row, "timestamp", value)
+        else:
+            self.table.set(self.row, "timestamp", None)
+            self.table.set(self.row, "offset", value)
+
+    @property
+    def analysis_results(self) -> dict:
+        return self.table.get_analysis(self.row)
+
+    @analysis_results.setter
+    def analysis_results(self, analysis: dict):
+        self.table.set_analysis(self.row, analysis)
 
     def to_dict(self):
-        return {
-            "filename": self.filename,
-            "filepath": self.filepath,
-            "source_video": self.source_video,
-            "timestamp": self.timestamp,
-            "lat": self.lat,
-            "lon": self.lon,
-            "openai_file_id": self.openai_file_id,
-            "box_file_id": self.box_file_id,
-            "box_file_url": self.box_file_url,
-            "analysis_results": self.analysis_results,
-        }
+        return self.table.to_records([self.row])[0]
 
     def to_metadata_dict(self):
+        analysis = self.analysis_results
         return {
             "filename": self.filename,
             "timestamp": f"{self.timestamp}",
             "lat1": f"{self.lat}",
             "lon1": f"{self.lon}",
-            "pothole": [
-                self.analysis_results["pothole"].capitalize()
-            ],  # must be a list
-            "potholeConfidence": str(self.analysis_results["pothole_confidence"]),
-            "alligatorCracking": [
-                self.analysis_results["alligator_cracking"].capitalize()
-            ],
-            "lineCracking": [self.analysis_results["line_cracking"].capitalize()],
-            "raveling": [self.analysis_results["raveling"].capitalize()],
-            "summary": self.analysis_results["summary"],
-            "estimatedPCR": str(self.analysis_results["estimated_pcr"]),
+            "pothole": [analysis["pothole"].capitalize()],  # must be a list
+            "potholeConfidence": str(analysis["pothole_confidence"]),
+            "alligatorCracking": [analysis["alligator_cracking"].capitalize()],
+            "lineCracking": [analysis["line_cracking"].capitalize()],
+            "raveling": [analysis["raveling"].capitalize()],
+            "summary": analysis["summary"],
+            "estimatedPCR": str(analysis["estimated_pcr"]),
         }
 
     def add_openai_file_id(self, file_id):
@@ -963,6 +2495,14 @@ class TelemetryObject:
     def add_analysis_results(self, analysis):
         self.analysis_results = analysis
 
+    def add_ai_payload(self, payload_bytes, profile):
+        settings = PAYLOAD_PROFILES[profile]
+        mime_type, extension = PAYLOAD_FORMATS[settings["format"]]
+        self.payload_bytes = payload_bytes
+        self.payload_filename = os.path.splitext(self.filename)[0] + extension
+        self.payload_mime_type = mime_type
+        self.payload_detail = settings["detail"]
+
     def add_box_file_id(self, file_id):
         self.box_file_id = file_id
 
@@ -971,30 +2511,11 @@ class TelemetryObject:
 
     def to_geojson(self):
         """Convert telemetry object to a GeoJSON Feature."""
-        if self.lon is None or self.lat is None:
-            raise ValueError(
-                f"Telemetry object {self.filename} is missing coordinates."
-            )
-
-        geojson_object = None
-        geom = geojson.Point((self.lon, self.lat))
-
-        # Flatten analysis_results into the properties
-        props = {
-            "filename": self.filename,
-            "filepath": self.filepath,
-            "source_video": self.source_video,
-            "timestamp": self.timestamp,
-            "openai_file_id": self.openai_file_id,
-            "box_file_id": self.box_file_id,
-            "box_file_url": self.box_file_url,
-        }
-        if self.analysis_results:
-            props.update(self.analysis_results)  # Merge analysis_results into props
-
-        geojson_object = geojson.Feature(geometry=geom, properties=props)
-
-        return geojson_object
+        feature = self.table.to_features([self.row])[0]
+        return geojson.Feature(
+            geometry=geojson.Point(tuple(feature["geometry"]["coordinates"])),
+            properties=feature["properties"],
+        )
 
 
 if __name__ == "__main__":
@@ -139,6 +139,9 @@ class WorkOrderCreator:
             ai_events_created = 0
 
             for object in telemetry_objects:
+                # Near-duplicate frames carry the kept frame's analysis; one event is enough
+                if getattr(object, "duplicate_of", None):
+                    continue
                 analysis_results = object.analysis_results
                 pothole = analysis_results.get("pothole", "no")
                 pothole_confidence = analysis_results.get("pothole_confidence", 0)
@@ -0,0 +1,809 @@
+# sampling.py
+import os
+import math
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from logging_config import logger
+
+EARTH_RADIUS_M = 6_371_000
+
+# ffmpeg output arguments for writing an MJPEG frame stream to stdout
+PIPE_OUTPUT_ARGS = ["-f", "image2pipe", "-c:v", "mjpeg", "pipe:1"]
+PIPE_DEFAULT_QUALITY = 2
+
+# Decoder shortcuts trading archive fidelity for decode speed. ``keyframes_only``
+# keeps one frame per GOP (every frame, for all-intra sources); ``skip_loop_filter``
+# skips the HEVC/H.264 deblocking pass; ``scale_width`` downsizes right after
+# decode so cropping, encoding and every later stage handle fewer pixels.
+DECODE_PROFILES = {
+    "archive": {
+        "keyframes_only": False,
+        "skip_loop_filter": False,
+        "scale_width": None,
+        "quality": 2,
+    },
+    "fast": {
+        "keyframes_only": False,
+        "skip_loop_filter": True,
+        "scale_width": 1920,
+        "quality": 4,
+    },
+    "keyframes": {
+        "keyframes_only": True,
+        "skip_loop_filter": True,
+        "scale_width": 1280,
+        "quality": 5,
+    },
+}
+
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+
+
+def iter_jpeg_frames(stream, chunk_size=1 << 16):
+    """
+    Split a concatenated MJPEG byte stream into individual JPEG images.
+
+    ffmpeg's MJPEG encoder writes no embedded thumbnails and byte-stuffs 0xFF
+    inside entropy-coded data, so the first end-of-image marker after a
+    start-of-image marker always closes the frame.
+
+    Args:
+        stream: Binary file-like object, e.g. ``Popen.stdout``.
+        chunk_size (int): Bytes read per call.
+
+    Yields:
+        bytes: One complete JPEG per frame.
+    """
+    buffer = bytearray()
+    search_from = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        while True:
+            start = buffer.find(JPEG_SOI)
+            if start < 0:
+                # Keep a trailing 0xFF in case the marker straddles two chunks
+                del buffer[:-1]
+                search_from = 0
+                break
+            end = buffer.find(JPEG_EOI, max(start + 2, search_from))
+            if end < 0:
+                # Resume the marker search where this chunk left off
+                search_from = max(start + 2, len(buffer) - 1)
+                break
+            yield bytes(buffer[start : end + 2])
+            del buffer[: end + 2]
+            search_from = 0
+
+
+class FrameSampler:
+    """
+    Base class for ffmpeg frame sampling strategies.
+
+    A sampler decides which frames of a video get decoded and written to disk.
+    Every strategy returns the same ``(filepath, timestamp)`` tuples that
+    ``Processor.create_telemetry_objects`` expects, with timestamps in seconds
+    from the start of the video.
+    """
+
+    name = "base"
+    quality = None  # ffmpeg -q:v for written JPEGs; None keeps the encoder default
+    decode_profile = {}
+
+    def apply_decode_profile(self, profile="archive", quality=None):
+        """
+        Use one of ``DECODE_PROFILES`` for every command this sampler builds.
+
+        Args:
+            profile (str): Profile name.
+            quality (int): Overrides the profile's JPEG quality (ffmpeg -q:v, 2-31).
+        """
+        if profile not in DECODE_PROFILES:
+            raise ValueError(
+                f"Unknown decode profile '{profile}'. Choose from {list(DECODE_PROFILES)}."
+            )
+        self.decode_profile = DECODE_PROFILES[profile]
+        self.quality = quality or self.decode_profile["quality"]
+
+    def decoder_args(self) -> list:
+        """Input-side decoder options for the active decode profile."""
+        args = []
+        if self.decode_profile.get("keyframes_only"):
+            args += ["-skip_frame", "nokey"]
+        if self.decode_profile.get("skip_loop_filter"):
+            args += ["-skip_loop_filter", "all"]
+        return args
+
+    def output_filters(self, crop_filter=None) -> list:
+        """Crop and decode-profile scaling applied after frame selection."""
+        filters = [crop_filter] if crop_filter else []
+        if self.decode_profile.get("scale_width"):
+            filters.append(f"scale='min({self.decode_profile['scale_width']},iw)':-2")
+        return filters
+
+    def encoder_args(self, streaming=False) -> list:
+        quality = self.quality or (PIPE_DEFAULT_QUALITY if streaming else None)
+        return ["-q:v", str(quality)] if quality else []
+
+    def target_timestamps(self, fps, total_frames, max_frames=None) -> list:
+        """Return the video offsets (seconds) of the frames this sampler keeps."""
+        raise NotImplementedError
+
+    def offset_seconds(self, timestamp, fps) -> float:
+        """Convert one of this sampler's timestamps to seconds into the video."""
+        return timestamp
+
+    def filter_chain(self, fps) -> list:
+        """Return the ffmpeg filters that select the sampled frames."""
+        raise NotImplementedError
+
+    def build_command(
+        self,
+        ffmpeg_path,
+        video_path,
+        fps,
+        frame_count,
+        crop_filter,
+        output_args,
+        input_args=None,
+    ) -> list:
+        filters = self.filter_chain(fps) + self.output_filters(crop_filter)
+        command = [
+            ffmpeg_path,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            *self.decoder_args(),
+            *(input_args or []),
+            "-i",
+            video_path,
+            "-map",
+            "0:v:0",  # Process only the video stream
+            "-an",  # Disable audio processing
+        ]
+        if filters:
+            command += ["-vf", ",".join(filters)]
+        command += self.encoder_args(streaming="pipe:1" in output_args)
+        command += [
+            "-vsync",
+            "vfr",  # Only write the frames the filters let through
+            "-frames:v",
+            str(frame_count),  # Stop after extracting the desired frames
+            *output_args,
+        ]
+        return command
+
+    def extract(
+        self,
+        video_path,
+        fps,
+        total_frames,
+        output_folder="frames",
+        crop_filter=None,
+        max_frames=None,
+        ffmpeg_path="ffmpeg",
+        output_prefix=None,
+    ) -> list:
+        """
+        Extract the sampled frames of a video to JPEG files.
+
+        Args:
+            video_path (str): Path to the video file.
+            fps (float): Frame rate of the video stream.
+            total_frames (int): Number of frames in the video stream.
+            output_folder (str): Directory to save extracted frames.
+            crop_filter (str): Optional ffmpeg crop filter applied to every frame.
+            max_frames (int): Maximum number of frames to extract.
+            ffmpeg_path (str): Path to the ffmpeg binary.
+            output_prefix (str): Frame file name prefix; defaults to the video name.
+
+        Returns:
+            list[tuple]: List of tuples containing frame file paths and timestamps.
+        """
+        os.makedirs(output_folder, exist_ok=True)
+        timestamps = self.target_timestamps(fps, total_frames, max_frames)
+        if not timestamps:
+            logger.warning(f"{self.name} sampler selected no frames in {video_path}.")
+            return []
+
+        video_basename = (
+            output_prefix or os.path.splitext(os.path.basename(video_path))[0]
+        )
+        output_pattern = os.path.join(output_folder, f"{video_basename}_%04d.jpg")
+        command = self.build_command(
+            ffmpeg_path, video_path, fps, len(timestamps), crop_filter, [output_pattern]
+        )
+
+        try:
+            subprocess.run(command, check=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFmpeg failed with error: {e}")
+            raise RuntimeError("Failed to extract frames using FFmpeg.")
+
+        return self._collect_frames(output_folder, video_basename, timestamps)
+
+    def extract_parallel(
+        self,
+        video_path,
+        fps,
+        total_frames,
+        output_folder="frames",
+        crop_filter=None,
+        max_frames=None,
+        ffmpeg_path="ffmpeg",
+        output_prefix=None,
+        workers=None,
+    ) -> list:
+        """
+        Extract the sampled frames with one fast-seeking ffmpeg per time range.
+
+        The target frames are split into ``workers`` contiguous runs. Each run is
+        decoded by its own ffmpeg process, which seeks (input-side ``-ss``/``-t``)
+        to just before its first target frame, so the per-range selection lines up
+        with the global one. Segment outputs are renamed into a single ordered
+        sequence with global timestamps.
+
+        Args:
+            workers (int): Number of concurrent ffmpeg processes; defaults to the
+                number of CPU cores.
+            Other arguments are as for ``extract``.
+
+        Returns:
+            list[tuple]: List of tuples containing frame file paths and timestamps.
+        """
+        workers = workers or os.cpu_count() or 1
+        timestamps = self.target_timestamps(fps, total_frames, max_frames)
+        if workers <= 1 or len(timestamps) < 2 * workers:
+            return self.extract(
+                video_path,
+                fps,
+                total_frames,
+                output_folder,
+                crop_filter,
+                max_frames,
+                ffmpeg_path,
+                output_prefix,
+            )
+
+        os.makedirs(output_folder, exist_ok=True)
+        video_basename = (
+            output_prefix or os.path.splitext(os.path.basename(video_path))[0]
+        )
+        chunk_size = math.ceil(len(timestamps) / workers)
+        segments = [
+            timestamps[i : i + chunk_size]
+            for i in range(0, len(timestamps), chunk_size)
+        ]
+        # Split the cores between the decoders instead of letting each one
+        # spawn a thread per core.
+        threads = max(1, (os.cpu_count() or 1) // len(segments))
+        half_frame = 0.5 / fps
+
+        def _extract_segment(item):
+            index, segment = item
+            start = max(0.0, self.offset_seconds(segment[0], fps) - half_frame)
+            end = self.offset_seconds(segment[-1], fps) + half_frame
+            input_args = [
+                "-threads",
+                str(threads),
+                "-ss",
+                f"{start:.6f}",
+                "-t",
+                f"{end - start:.6f}",
+            ]
+            output_pattern = os.path.join(
+                output_folder, f"{video_basename}_seg{index:03d}_%04d.jpg"
+            )
+            command = self.build_command(
+                ffmpeg_path,
+                video_path,
+                fps,
+                len(segment),
+                crop_filter,
+                [output_pattern],
+                input_args=input_args,
+            )
+            subprocess.run(command, check=True)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+                list(executor.map(_extract_segment, enumerate(segments)))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFmpeg failed with error: {e}")
+            raise RuntimeError("Failed to extract frames using FFmpeg.")
+
+        # Merge segment outputs into one gapless sequence. A segment that comes
+        # up short (usually at its end or EOF) only loses its own frames.
+        extracted_frames = []
+        for index, segment in enumerate(segments):
+            missing = 0
+            for local_number, timestamp in enumerate(segment, start=1):
+                segment_path = os.path.join(
+                    output_folder,
+                    f"{video_basename}_seg{index:03d}_{local_number:04d}.jpg",
+                )
+                if not os.path.exists(segment_path):
+                    missing += 1
+                    continue
+                path = os.path.join(
+                    output_folder,
+                    f"{video_basename}_{len(extracted_frames) + 1:04d}.jpg",
+                )
+                os.replace(segment_path, path)
+                extracted_frames.append((path, timestamp))
+            if missing:
+                logger.warning(
+                    f"Segment {index} is missing {missing} of {len(segment)} frames."
+                )
+
+        logger.info(
+            f"Extracted {len(extracted_frames)} frames from {video_path} in "
+            f"{len(segments)} parallel segments ({threads} decoder threads each)."
+        )
+        return extracted_frames
+
+    def stream(
+        self,
+        video_path,
+        fps,
+        total_frames,
+        crop_filter=None,
+        max_frames=None,
+        ffmpeg_path="ffmpeg",
+    ):
+        """
+        Decode the sampled frames straight from ffmpeg's stdout without touching disk.
+
+        Args:
+            video_path (str): Path to the video file.
+            fps (float): Frame rate of the video stream.
+            total_frames (int): Number of frames in the video stream.
+            crop_filter (str): Optional ffmpeg crop filter applied to every frame.
+            max_frames (int): Maximum number of frames to extract.
+            ffmpeg_path (str): Path to the ffmpeg binary.
+
+        Yields:
+            tuple: ``(jpeg_bytes, timestamp)`` for each sampled frame, in order.
+        """
+        timestamps = self.target_timestamps(fps, total_frames, max_frames)
+        if not timestamps:
+            logger.warning(f"{self.name} sampler selected no frames in {video_path}.")
+            return
+
+        command = self.build_command(
+            ffmpeg_path, video_path, fps, len(timestamps), crop_filter, PIPE_OUTPUT_ARGS
+        )
+        process = subprocess.Popen(command, stdout=subprocess.PIPE)
+        count = 0
+        try:
+            for jpeg_bytes, timestamp in zip(
+                iter_jpeg_frames(process.stdout), timestamps
+            ):
+                count += 1
+                yield jpeg_bytes, timestamp
+        except GeneratorExit:
+            # Consumer stopped early; don't leave ffmpeg decoding into a dead pipe
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            process.wait()
+
+        if process.returncode != 0 and count < len(timestamps):
+            logger.error(f"FFmpeg exited with code {process.returncode}")
+            raise RuntimeError("Failed to stream frames using FFmpeg.")
+        logger.info(f"Streamed {count} frames from {video_path}.")
+
+    @staticmethod
+    def _collect_frames(output_folder, video_basename, timestamps) -> list:
+        """Pair the frames ffmpeg actually wrote with their target timestamps."""
+        extracted_frames = []
+        for i, timestamp in enumerate(timestamps):
+            path = os.path.join(output_folder, f"{video_basename}_{i + 1:04d}.jpg")
+            if not os.path.exists(path):
+                logger.warning(
+                    f"Expected {len(timestamps)} frames but ffmpeg wrote {i}; "
+                    "video metadata may overstate the frame count."
+                )
+                break
+            extracted_frames.append((path, timestamp))
+
+        logger.info(f"Extracted {len(extracted_frames)} frames to {output_folder}.")
+        return extracted_frames
+
+
+class StrideSampler(FrameSampler):
+    """Keep every k-th decoded frame using a constant ``mod(n,k)`` select."""
+
+    name = "stride"
+
+    def __init__(self, frame_rate=1):
+        self.frame_rate = frame_rate
+
+    def frame_interval(self, fps) -> int:
+        return max(1, round(fps / self.frame_rate))
+
+    def target_timestamps(self, fps, total_frames, max_frames=None) -> list:
+        target_indices = range(0, total_frames, self.frame_interval(fps))
+        if max_frames:
+            target_indices = target_indices[:max_frames]
+        return [index / fps for index in target_indices]
+
+    def filter_chain(self, fps) -> list:
+        return [f"select='not(mod(n\\,{self.frame_interval(fps)}))'"]
+
+
+class FpsSampler(FrameSampler):
+    """Resample the stream to ``frame_rate`` with ffmpeg's ``fps`` filter."""
+
+    name = "fps"
+
+    def __init__(self, frame_rate=1):
+        self.frame_rate = frame_rate
+
+    def target_timestamps(self, fps, total_frames, max_frames=None) -> list:
+        duration = total_frames / fps
+        count = math.ceil(duration * self.frame_rate)
+        if max_frames:
+            count = min(count, max_frames)
+        return [i / self.frame_rate for i in range(count)]
+
+    def filter_chain(self, fps) -> list:
+        return [f"fps={self.frame_rate}"]
+
+
+class TimeListSampler(FrameSampler):
+    """
+    Extract an explicit list of timestamps, seeking to each one.
+
+    Each timestamp is a separate input-side ``-ss`` seek, so ffmpeg only decodes
+    from the nearest keyframe instead of the whole file. This is the right
+    strategy for sparse or irregular target lists; for dense regular sampling
+    a stride or fps sampler is cheaper.
+    """
+
+    name = "timestamps"
+
+    def __init__(self, timestamps=None, max_workers=4):
+        self.timestamps = sorted(timestamps or [])
+        self.max_workers = max_workers
+
+    def target_timestamps(self, fps, total_frames, max_frames=None) -> list:
+        duration = total_frames / fps
+        timestamps = [t for t in self.timestamps if 0 <= t < duration]
+        if max_frames:
+            timestamps = timestamps[:max_frames]
+        return timestamps
+
+    def filter_chain(self, fps) -> list:
+        return []
+
+    def extract(
+        self,
+        video_path,
+        fps,
+        total_frames,
+        output_folder="frames",
+        crop_filter=None,
+        max_frames=None,
+        ffmpeg_path="ffmpeg",
+        output_prefix=None,
+    ) -> list:
+        os.makedirs(output_folder, exist_ok=True)
+        timestamps = self.target_timestamps(fps, total_frames, max_frames)
+        if not timestamps:
+            logger.warning(f"{self.name} sampler selected no frames in {video_path}.")
+            return []
+
+        video_basename = (
+            output_prefix or os.path.splitext(os.path.basename(video_path))[0]
+        )
+
+        def _extract_one(item):
+            i, timestamp = item
+            output_path = os.path.join(
+                output_folder, f"{video_basename}_{i + 1:04d}.jpg"
+            )
+            command = [
+                ffmpeg_path,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                *self.decoder_args(),
+                "-ss",
+                f"{timestamp:.6f}",  # Input-side seek: decode from the nearest keyframe
+                "-i",
+                video_path,
+                "-map",
+                "0:v:0",
+                "-an",
+            ]
+            filters = self.output_filters(crop_filter)
+            if filters:
+                command += ["-vf", ",".join(filters)]
+            command += self.encoder_args()
+            command += ["-frames:v", "1", output_path]
+            subprocess.run(command, check=True)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(_extract_one, enumerate(timestamps)))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFmpeg failed with error: {e}")
+            raise RuntimeError("Failed to extract frames using FFmpeg.")
+
+        return self._collect_frames(output_folder, video_basename, timestamps)
+
+    def extract_parallel(
+        self,
+        video_path,
+        fps,
+        total_frames,
+        output_folder="frames",
+        crop_filter=None,
+        max_frames=None,
+        ffmpeg_path="ffmpeg",
+        output_prefix=None,
+        workers=None,
+    ) -> list:
+        # Every timestamp is already its own seek, so parallelism is the pool size
+        self.max_workers = workers or os.cpu_count() or self.max_workers
+        return self.extract(
+            video_path,
+            fps,
+            total_frames,
+            output_folder,
+            crop_filter,
+            max_frames,
+            ffmpeg_path,
+            output_prefix,
+        )
+
+    def stream(
+        self,
+        video_path,
+        fps,
+        total_frames,
+        crop_filter=None,
+        max_frames=None,
+        ffmpeg_path="ffmpeg",
+    ):
+        timestamps = self.target_timestamps(fps, total_frames, max_frames)
+
+        def _decode_one(timestamp):
+            command = [
+                ffmpeg_path,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                *self.decoder_args(),
+                "-ss",
+                f"{timestamp:.6f}",
+                "-i",
+                video_path,
+                "-map",
+                "0:v:0",
+                "-an",
+            ]
+            filters = self.output_filters(crop_filter)
+            if filters:
+                command += ["-vf", ",".join(filters)]
+            command += self.encoder_args(streaming=True)
+            command += ["-frames:v", "1", *PIPE_OUTPUT_ARGS]
+            result = subprocess.run(command, capture_output=True, check=True)
+            return result.stdout
+
+        # Bounded window of in-flight seeks, refilled as frames are consumed, so a
+        # slow consumer or an early close does not leave every frame queued
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = iter(timestamps)
+        window = deque()
+
+        def _submit_next():
+            timestamp = next(pending, None)
+            if timestamp is not None:
+                window.append((executor.submit(_decode_one, timestamp), timestamp))
+
+        try:
+            for _ in range(self.max_workers * 2):
+                _submit_next()
+            while window:
+                future, timestamp = window.popleft()
+                jpeg_bytes = future.result()
+                _submit_next()
+                if jpeg_bytes:
+                    yield jpeg_bytes, timestamp
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFmpeg failed with error: {e}")
+            raise RuntimeError("Failed to stream frames using FFmpeg.")
+        finally:
+            for future, _ in window:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+class AllFramesSampler(FrameSampler):
+    """
+    Keep every frame (timelapse mode).
+
+    Timestamps are frame indices, matching ``Processor.extract_all_frames_ffmpeg``.
+    """
+
+    name = "all"
+
+    def __init__(self, frame_rate=None, frame_indices=None):
+        self.frame_rate = frame_rate
+        # With a keyframes-only decode profile, only these frames come out
+        self.frame_indices = frame_indices
+
+    def target_timestamps(self, fps, total_frames, max_frames=None) -> list:
+        if self.frame_indices is not None:
+            indices = [i for i in self.frame_indices if i < total_frames]
+            return indices[:max_frames] if max_frames else indices
+        count = min(total_frames, max_frames) if max_frames else total_frames
+        return list(range(count))
+
+    def offset_seconds(self, timestamp, fps) -> float:
+        return timestamp / fps
+
+    def filter_chain(self, fps) -> list:
+        return []
+
+
+class SelectListSampler(StrideSampler):
+    """
+    Legacy strategy: one ``eq(n\\,index)`` term per target frame.
+
+    ffmpeg evaluates the whole expression for every decoded frame, so cost grows
+    with frames x targets. Kept only so benchmarks can compare against it.
+    """
+
+    name = "select"
+    frame_count = 0  # Set per command; the expression has one term per frame
+
+    def build_command(
+        self,
+        ffmpeg_path,
+        video_path,
+        fps,
+        frame_count,
+        crop_filter,
+        output_args,
+        input_args=None,
+    ) -> list:
+        self.frame_count = frame_count
+        return super().build_command(
+            ffmpeg_path,
+            video_path,
+            fps,
+            frame_count,
+            crop_filter,
+            output_args,
+            input_args=input_args,
+        )
+
+    def filter_chain(self, fps) -> list:
+        interval = self.frame_interval(fps)
+        terms = "+".join(f"eq(n\\,{i * interval})" for i in range(self.frame_count))
+        return [f"select='{terms}'"]
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters between arrays of coordinates."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def distance_target_timestamps(
+    offsets, lats, lons, spacing_m=10.0, max_gap_s=None, speeds=None
+) -> list:
+    """
+    Pick video offsets so that consecutive frames are ``spacing_m`` apart.
+
+    Cumulative distance is integrated along the GPS track, and each multiple of
+    ``spacing_m`` is mapped back to a time by interpolating between the two
+    bracketing trackpoints. While the vehicle is stopped no targets are
+    produced, except that no two consecutive targets are ever more than
+    ``max_gap_s`` apart.
+
+    Args:
+        offsets (array-like): Trackpoint times in seconds from the video start, sorted.
+        lats (array-like): Trackpoint latitudes.
+        lons (array-like): Trackpoint longitudes.
+        spacing_m (float): Distance between sampled frames in meters.
+        max_gap_s (float): Longest allowed time between frames, or None.
+        speeds (array-like): Optional GPS speeds in m/s. When given, distance is
+            integrated from speed instead of position, which ignores the
+            position jitter of a stationary receiver. Steps next to a NaN
+            speed use position.
+
+    Returns:
+        list[float]: Sorted video offsets in seconds.
+    """
+    offsets = np.asarray(offsets, dtype=np.float64)
+    if offsets.size == 0:
+        return []
+    if offsets.size == 1:
+        return [float(offsets[0])]
+
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    steps = haversine_m(lats[:-1], lons[:-1], lats[1:], lons[1:])
+    if speeds is not None:
+        speeds = np.asarray(speeds, dtype=np.float64)
+        speed_steps = (speeds[:-1] + speeds[1:]) / 2 * np.diff(offsets)
+        # Steps with a missing speed at either end fall back to track geometry
+        known = np.isfinite(speed_steps)
+        steps[known] = speed_steps[known]
+    steps[~np.isfinite(steps)] = 0.0
+    cumulative = np.concatenate(([0.0], np.cumsum(np.maximum(steps, 0.0))))
+
+    marks = np.arange(0.0, cumulative[-1] + 1e-9, spacing_m)
+    # First trackpoint whose cumulative distance reaches each mark; ``side="left"``
+    # skips the flat stretches where the vehicle was stopped.
+    upper = np.clip(
+        np.searchsorted(cumulative, marks, side="left"), 1, offsets.size - 1
+    )
+    lower = upper - 1
+    span = cumulative[upper] - cumulative[lower]
+    fraction = np.divide(
+        marks - cumulative[lower], span, out=np.zeros_like(marks), where=span > 0
+    )
+    times = offsets[lower] + np.clip(fraction, 0.0, 1.0) * (
+        offsets[upper] - offsets[lower]
+    )
+
+    if max_gap_s:
+        bounds = np.concatenate((times, [offsets[-1]]))
+        fill = [
+            np.arange(start + max_gap_s, end, max_gap_s)
+            for start, end in zip(bounds[:-1], bounds[1:])
+            if end - start > max_gap_s
+        ]
+        if fill:
+            times = np.concatenate([times] + fill)
+
+    return np.unique(np.round(times, 3)).tolist()
+
+
+SAMPLERS = {
+    "stride": StrideSampler,
+    "fps": FpsSampler,
+    "timestamps": TimeListSampler,
+    "all": AllFramesSampler,
+    "select": SelectListSampler,
+}
+
+
+def get_sampler(strategy="stride", frame_rate=1, timestamps=None) -> FrameSampler:
+    """
+    Build a frame sampler by strategy name.
+
+    Args:
+        strategy (str): One of ``SAMPLERS`` ('stride', 'fps', 'timestamps', 'all', 'select').
+        frame_rate (float): Frames per second to keep (stride, fps and select).
+        timestamps (list): Video offsets in seconds (timestamps strategy only).
+
+    Returns:
+        FrameSampler: The configured sampler.
+    """
+    if strategy not in SAMPLERS:
+        raise ValueError(
+            f"Unknown sampling strategy '{strategy}'. Choose from {list(SAMPLERS)}."
+        )
+    if strategy == "timestamps":
+        if timestamps is None:
+            raise ValueError("The 'timestamps' strategy requires a list of timestamps.")
+        return TimeListSampler(timestamps)
+    return SAMPLERS[strategy](frame_rate)
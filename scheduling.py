@@ -0,0 +1,158 @@
+# scheduling.py
+import os
+import time
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from logging_config import logger
+
+
+class StageLimits:
+    """
+    Caps how many pipeline stages of each kind run at once across all videos.
+
+    CPU-heavy stages (ffmpeg, hashing, scoring, zipping) and network-heavy
+    stages (OpenAI, Box, Salesforce) get separate semaphores, so videos
+    waiting on the network do not hold back ones that could be decoding.
+    Blocking stage functions run in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, cpu: int = None, network: int = None):
+        """
+        Args:
+            cpu (int): Concurrent CPU-heavy stages. Defaults to $CPU_STAGE_LIMIT or 1.
+            network (int): Concurrent network-heavy stages. Defaults to
+                $NETWORK_STAGE_LIMIT or 4.
+        """
+        self.cpu_limit = cpu or int(os.getenv("CPU_STAGE_LIMIT", 1))
+        self.network_limit = network or int(os.getenv("NETWORK_STAGE_LIMIT", 4))
+        self.semaphores = {
+            "cpu": asyncio.Semaphore(self.cpu_limit),
+            "network": asyncio.Semaphore(self.network_limit),
+        }
+
+    def slot(self, kind: str) -> asyncio.Semaphore:
+        """Semaphore for a stage kind ('cpu' or 'network'), for use with ``async with``."""
+        return self.semaphores[kind]
+
+    async def run(self, kind: str, func, *args, **kwargs):
+        """
+        Run a blocking stage function in a thread once a slot of its kind is free.
+
+        Args:
+            kind (str): 'cpu' or 'network'.
+            func: The blocking function to call.
+
+        Returns:
+            Whatever ``func`` returns.
+        """
+        async with self.semaphores[kind]:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def run_bounded(items, worker, limit: int):
+    """
+    Run ``worker(item)`` for every item with at most ``limit`` running at once.
+
+    A failing item is logged and returned as its exception; it does not stop
+    the others.
+
+    Args:
+        items (list): Inputs, e.g. video file names.
+        worker: Coroutine function taking one item.
+        limit (int): Maximum concurrent workers.
+
+    Returns:
+        list: Results (or exceptions) in input order.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _bounded(item):
+        async with semaphore:
+            try:
+                return await worker(item)
+            except Exception as e:
+                logger.error(f"Processing {item} failed: {e}")
+                return e
+
+    return await asyncio.gather(*(_bounded(item) for item in items))
+
+
+class StageStats:
+    """
+    Queue depths and per-stage busy time for a queue-connected stage pipeline.
+
+    Busy time is the wall time a stage spent working on items (not waiting
+    on its input queue), so the busiest stage is the pipeline's bottleneck.
+    """
+
+    def __init__(self):
+        self.queues = {}
+        self.busy_seconds = defaultdict(float)
+        self.items = defaultdict(int)
+        self.max_depth = defaultdict(int)
+        self.depth_total = defaultdict(int)
+        self.depth_samples = 0
+        self.started = time.time()
+
+    def queue(self, name: str, maxsize: int) -> asyncio.Queue:
+        """Create a bounded queue whose depth is tracked under ``name``."""
+        self.queues[name] = asyncio.Queue(maxsize=maxsize)
+        return self.queues[name]
+
+    @contextmanager
+    def busy(self, stage: str):
+        """Count the enclosed block as work done by ``stage`` on one item."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.busy_seconds[stage] += time.perf_counter() - start
+            self.items[stage] += 1
+
+    def queue_depths(self) -> dict:
+        """Current number of items waiting in each queue."""
+        return {name: queue.qsize() for name, queue in self.queues.items()}
+
+    async def sample_depths(self, interval: float = 0.5):
+        """Record queue depths every ``interval`` seconds until cancelled."""
+        while True:
+            for name, depth in self.queue_depths().items():
+                self.max_depth[name] = max(self.max_depth[name], depth)
+                self.depth_total[name] += depth
+            self.depth_samples += 1
+            await asyncio.sleep(interval)
+
+    def report(self) -> dict:
+        """
+        Log and return the stage timings.
+
+        Returns:
+            dict: Wall seconds, and per stage its busy seconds and item count,
+            and per queue its mean and max depth.
+        """
+        samples = max(self.depth_samples, 1)
+        report = {
+            "wall_seconds": time.time() - self.started,
+            "stages": {
+                stage: {"busy_seconds": seconds, "items": self.items[stage]}
+                for stage, seconds in self.busy_seconds.items()
+            },
+            "queues": {
+                name: {
+                    "mean_depth": self.depth_total[name] / samples,
+                    "max_depth": self.max_depth[name],
+                }
+                for name in self.queues
+            },
+        }
+        for stage, values in report["stages"].items():
+            logger.info(
+                f"Stage {stage}: busy {values['busy_seconds']:.2f} s over {values['items']} items"
+            )
+        for name, values in report["queues"].items():
+            logger.info(
+                f"Queue {name}: mean depth {values['mean_depth']:.1f}, max {values['max_depth']}"
+            )
+        logger.info(f"Stage pipeline wall time {report['wall_seconds']:.2f} s")
+        return report
@@ -0,0 +1,152 @@
+# sessions.py
+import os
+import re
+from collections import defaultdict
+from logging_config import logger
+
+# GoPro splits long recordings into chapters of ~4 GB. HERO6 and later name
+# them G<codec><chapter><file>.MP4 (GX010229.MP4, GX020229.MP4, ...); older
+# cameras use GOPR0229.MP4 for the first chapter and GP010229.MP4 onwards.
+CHAPTER_NAME = re.compile(r"^(G[HXL])(\d{2})(\d{4})$", re.IGNORECASE)
+LEGACY_FIRST_CHAPTER_NAME = re.compile(r"^GOPR(\d{4})$", re.IGNORECASE)
+LEGACY_CHAPTER_NAME = re.compile(r"^GP(\d{2})(\d{4})$", re.IGNORECASE)
+
+# Chapters whose GPMF times are further apart than this start a new session
+MAX_CHAPTER_GAP_S = 5.0
+
+
+def parse_chapter_name(filename: str):
+    """
+    Split a GoPro file name into its recording and chapter numbers.
+
+    Args:
+        filename (str): File name or path, e.g. 'GX020229.MP4'.
+
+    Returns:
+        tuple: ``(recording, chapter)``, e.g. ``("GX0229", 2)``, or None if
+        the name does not follow a GoPro chaptering convention.
+    """
+    base_name = os.path.splitext(os.path.basename(filename))[0]
+    match = CHAPTER_NAME.match(base_name)
+    if match:
+        encoding, chapter, number = match.groups()
+        return f"{encoding.upper()}{number}", int(chapter)
+    match = LEGACY_FIRST_CHAPTER_NAME.match(base_name)
+    if match:
+        return f"GP{match.group(1)}", 0
+    match = LEGACY_CHAPTER_NAME.match(base_name)
+    if match:
+        chapter, number = match.groups()
+        return f"GP{number}", int(chapter)
+    return None
+
+
+class Session:
+    """
+    One continuous recording: a GoPro file and its later chapters.
+
+    The session is the unit the pipeline schedules. Its chapters are
+    processed as one drive, with a single stitched GPS track and frame
+    timestamps on a shared timeline. Files that do not follow the GoPro
+    naming convention are single-chapter sessions.
+    """
+
+    def __init__(self, chapters: list):
+        """
+        Args:
+            chapters (list[str]): Chapter file names in recording order.
+        """
+        self.chapters = list(chapters)
+        # Named after the first chapter, so a one-file session keeps its file name
+        self.name = os.path.splitext(os.path.basename(self.chapters[0]))[0]
+
+    @property
+    def first(self) -> str:
+        return self.chapters[0]
+
+    def __len__(self):
+        return len(self.chapters)
+
+    def __repr__(self):
+        if len(self.chapters) == 1:
+            return self.chapters[0]
+        return f"{self.name} ({len(self.chapters)} chapters)"
+
+
+def split_at_time_gaps(chapters: list, time_span) -> list:
+    """
+    Split chapters of one recording where their GPMF times show a break.
+
+    Args:
+        chapters (list[str]): Chapter file names in chapter order.
+        time_span (callable): Maps a file name to ``(start, duration_s)``, the
+            UTC time of its first frame and its length, or None if unknown.
+
+    Returns:
+        list[list[str]]: Runs of chapters that form one continuous drive.
+    """
+    runs = [[chapters[0]]]
+    previous = time_span(chapters[0])
+    for chapter in chapters[1:]:
+        current = time_span(chapter)
+        if previous is not None and current is not None:
+            gap = (current[0] - previous[0]).total_seconds() - previous[1]
+            if abs(gap) > MAX_CHAPTER_GAP_S:
+                logger.warning(
+                    f"{chapter} starts {gap:+.1f} s from the end of {runs[-1][-1]}; "
+                    "processing it as a separate drive."
+                )
+                runs.append([])
+        runs[-1].append(chapter)
+        previous = current
+    return runs
+
+
+def group_sessions(filenames: list, time_span=None) -> list:
+    """
+    Group video files into recording sessions by GoPro file number, split
+    where consecutive chapters are more than ``MAX_CHAPTER_GAP_S`` apart in
+    GPMF time.
+
+    Args:
+        filenames (list[str]): Video file names, in any order.
+        time_span (callable): Maps a file name to ``(start, duration_s)`` or
+            None (see ``split_at_time_gaps``). Without it, chapters are grouped
+            by file name only.
+
+    Returns:
+        list[Session]: Sessions ordered by name, each with its chapters in
+        chapter order.
+    """
+    chapters = defaultdict(list)
+    sessions = []
+    for filename in filenames:
+        parsed = parse_chapter_name(filename)
+        if parsed is None:
+            sessions.append(Session([filename]))
+            continue
+        recording, chapter = parsed
+        chapters[recording].append((chapter, filename))
+
+    for recording, parts in chapters.items():
+        parts.sort()
+        numbers = [chapter for chapter, _ in parts]
+        expected = list(range(numbers[0], numbers[0] + len(numbers)))
+        if numbers != expected:
+            logger.warning(
+                f"Recording {recording} is missing chapters: have {numbers}. "
+                "The available chapters are still processed as one drive."
+            )
+        chapter_files = [filename for _, filename in parts]
+        if time_span is None:
+            sessions.append(Session(chapter_files))
+            continue
+        for run in split_at_time_gaps(chapter_files, time_span):
+            sessions.append(Session(run))
+
+    sessions.sort(key=lambda session: session.name)
+    logger.info(
+        f"Grouped {len(filenames)} files into {len(sessions)} sessions: "
+        f"{[repr(session) for session in sessions]}"
+    )
+    return sessions
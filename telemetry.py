@@ -0,0 +1,756 @@
+# telemetry.py
+import os
+import json
+import datetime
+import xml.etree.ElementTree as ET
+from array import array
+import numpy as np
+from logging_config import logger
+from sampling import haversine_m
+
+GPX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<gpx version="1.1" creator="processing" '
+    'xmlns="http://www.topografix.com/GPX/1/1" '
+    'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v2">\n'
+)
+
+JOIN_METHODS = ("linear", "nearest")
+HEADING_BASELINE_M = 5.0  # Headings are measured over at least this much travel
+
+# When a frame's position is not trustworthy enough to pay for its analysis
+GPS_QUALITY_THRESHOLDS = {
+    "min_fix": 2,  # GPMF GPSF: 0 no lock, 2 2D, 3 3D
+    "max_dop": 5.0,  # Dilution of precision; GoPro reports under 5 as good
+    "max_speed_ms": 70.0,  # Implied speed beyond this between fixes is a jump
+    "max_gap_s": 5.0,  # Frames further than this from any fix have no position
+}
+GPS_FIX_NAMES = {0: "none", 2: "2d", 3: "3d"}
+
+# Columnar .track file: magic, uint32 header size, JSON header, then one
+# fixed-width little-endian column per channel at 8-byte aligned offsets.
+TRACK_MAGIC = b"TRK1"
+TRACK_VERSION = 1
+TRACK_COLUMNS = (
+    ("time", "<i8"),  # ms since the Unix epoch, UTC
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+    ("altitude", "<f8"),
+    ("speed_2d", "<f8"),
+    ("speed_3d", "<f8"),
+    ("dop", "<f8"),
+    ("offset", "<f8"),
+    ("fix", "<i1"),  # Last, so the wider columns stay aligned
+)
+
+
+def to_datetime(value) -> datetime.datetime:
+    """Convert a numpy datetime64 to a naive UTC datetime."""
+    return value.astype("datetime64[us]").astype(datetime.datetime)
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan  # 'N/A' and other placeholders
+
+
+class Track:
+    """
+    A GPS track held as parallel NumPy arrays, one entry per fix.
+
+    ``time`` is UTC as ``datetime64[ms]``; ``offset`` is seconds into the
+    video when known. Missing channels are NaN (or 0 for ``fix``).
+    """
+
+    def __init__(
+        self,
+        time,
+        lat,
+        lon,
+        altitude=None,
+        speed_2d=None,
+        speed_3d=None,
+        fix=None,
+        dop=None,
+        offset=None,
+        base_time: datetime.datetime = None,
+        source: str = None,
+    ):
+        n = len(lat)
+        nan = np.full(n, np.nan)
+        self.time = np.asarray(time, dtype="datetime64[ms]")
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.altitude = (
+            nan.copy() if altitude is None else np.asarray(altitude, np.float64)
+        )
+        self.speed_2d = (
+            nan.copy() if speed_2d is None else np.asarray(speed_2d, np.float64)
+        )
+        self.speed_3d = (
+            nan.copy() if speed_3d is None else np.asarray(speed_3d, np.float64)
+        )
+        self.fix = np.zeros(n, np.int8) if fix is None else np.asarray(fix, np.int8)
+        self.dop = nan.copy() if dop is None else np.asarray(dop, np.float64)
+        self.offset = nan.copy() if offset is None else np.asarray(offset, np.float64)
+        self.base_time = base_time  # UTC time of video offset 0
+        self.source = source  # What the track was read from, to validate caches
+        self._heading = None
+        self._gps_issues = {}
+
+    @property
+    def heading(self) -> np.ndarray:
+        """Course over ground per point, in degrees clockwise from north (cached)."""
+        if self._heading is None:
+            self._heading = compute_heading(self.lat, self.lon)
+        return self._heading
+
+    def __len__(self):
+        return len(self.lat)
+
+    @classmethod
+    def from_records(cls, records, base_time: datetime.datetime = None):
+        """
+        Build a track from the dicts produced by ``Processor.preprocess_gpx_file``.
+
+        Args:
+            records (list[dict]): Telemetry dicts sorted by timestamp.
+            base_time (datetime): UTC time of video offset 0, if known.
+
+        Returns:
+            Track: The same points as arrays; 'N/A' values become NaN.
+        """
+        return cls(
+            time=[record["timestamp"] for record in records],
+            lat=[record["lat"] for record in records],
+            lon=[record["lon"] for record in records],
+            altitude=[_to_float(record.get("elevation")) for record in records],
+            speed_2d=[_to_float(record.get("speed")) for record in records],
+            base_time=base_time,
+        )
+
+    @classmethod
+    def concatenate(cls, tracks, offsets=None, base_time: datetime.datetime = None):
+        """
+        Stitch consecutive tracks, e.g. the chapters of one GoPro recording,
+        into a single track on a shared timeline.
+
+        Args:
+            tracks (list[Track]): Tracks in recording order.
+            offsets (list[float]): Seconds from ``base_time`` at which each
+                track's video starts; added to its ``offset`` column.
+            base_time (datetime): UTC time of offset 0. Defaults to the first
+                track's ``base_time``.
+
+        Returns:
+            Track: All points sorted by time, keeping the first of any
+            duplicate timestamps where chapters overlap.
+        """
+        offsets = offsets or [0.0] * len(tracks)
+        columns = {
+            name: np.concatenate([getattr(track, name) for track in tracks])
+            for name in (
+                "time",
+                "lat",
+                "lon",
+                "altitude",
+                "speed_2d",
+                "speed_3d",
+                "fix",
+                "dop",
+            )
+        }
+        columns["offset"] = np.concatenate(
+            [track.offset + offset for track, offset in zip(tracks, offsets)]
+        )
+        order = np.argsort(columns["time"], kind="stable")
+        keep = order[np.unique(columns["time"][order], return_index=True)[1]]
+        return cls(
+            **{name: values[keep] for name, values in columns.items()},
+            base_time=base_time or (tracks[0].base_time if tracks else None),
+        )
+
+    def join(
+        self, offsets, base_time: datetime.datetime = None, method="linear"
+    ) -> dict:
+        """
+        Look up the track at many video offsets with a single ``searchsorted``.
+
+        With ``method="linear"`` positions and speed are interpolated between
+        the two bracketing trackpoints; with ``"nearest"`` each offset takes
+        the trackpoint nearest in time, the earlier one on ties. Offsets
+        outside the track take its first or last point. ``self.time`` must
+        be sorted.
+
+        Args:
+            offsets (array-like): Seconds from ``base_time``, in any order.
+            base_time (datetime): UTC time of offset 0. Defaults to ``self.base_time``.
+            method (str): 'linear' or 'nearest'.
+
+        Returns:
+            dict: Arrays with one entry per offset: time (datetime64[ms]),
+            index (nearest trackpoint), before and after (bracketing
+            trackpoints), lat, lon, speed, heading, fix (of the nearest
+            trackpoint) and dop.
+        """
+        if method not in JOIN_METHODS:
+            choices = ", ".join(JOIN_METHODS)
+            raise ValueError(f"Unknown join method '{method}'. Choose from: {choices}")
+        if not len(self):
+            raise ValueError("Cannot join frames to an empty track.")
+        base_time = base_time or self.base_time
+        offsets_ms = np.round(np.asarray(offsets, dtype=np.float64) * 1000)
+        target = np.datetime64(base_time, "ms") + offsets_ms.astype("timedelta64[ms]")
+
+        last = max(len(self) - 2, 0)
+        before = np.clip(np.searchsorted(self.time, target, side="right") - 1, 0, last)
+        after = np.minimum(before + 1, len(self) - 1)
+        span = (self.time[after] - self.time[before]).astype(np.float64)
+        elapsed = (target - self.time[before]).astype(np.float64)
+        fraction = np.clip(
+            np.divide(elapsed, span, out=np.zeros_like(elapsed), where=span > 0),
+            0.0,
+            1.0,
+        )
+        index = np.where(fraction <= 0.5, before, after)
+
+        if method == "nearest":
+            lat, lon, speed = self.lat[index], self.lon[index], self.speed_2d[index]
+            heading, dop = self.heading[index], self.dop[index]
+        else:
+            lat = _lerp(self.lat, before, after, fraction)
+            lon = _lerp(self.lon, before, after, fraction)
+            speed = _lerp(self.speed_2d, before, after, fraction)
+            dop = _lerp(self.dop, before, after, fraction)
+            # Interpolate the direction as a unit vector so 359 -> 1 passes through 0
+            radians = np.radians(self.heading)
+            heading = (
+                np.degrees(
+                    np.arctan2(
+                        _lerp(np.sin(radians), before, after, fraction),
+                        _lerp(np.cos(radians), before, after, fraction),
+                    )
+                )
+                % 360
+            )
+
+        return {
+            "time": target,
+            "index": index,
+            "before": before,
+            "after": after,
+            "lat": lat,
+            "lon": lon,
+            "speed": speed,
+            "heading": heading,
+            "fix": self.fix[index],
+            "dop": dop,
+        }
+
+    def gps_issues(self, thresholds: dict = None) -> np.ndarray:
+        """
+        Flag trackpoints whose position should not be trusted.
+
+        Checks, in order: 'zero' (missing or 0,0 coordinates), 'no_fix'
+        (fix below ``min_fix``; only when the track carries fix values, as
+        GPMF does and plain GPX does not), 'high_dop' and 'jump' (a point
+        reached and left at more than ``max_speed_ms``, i.e. a spike).
+
+        Args:
+            thresholds (dict): Overrides for ``GPS_QUALITY_THRESHOLDS``.
+
+        Returns:
+            np.ndarray: Object array, None for good points, else the reason.
+        """
+        limits = {**GPS_QUALITY_THRESHOLDS, **(thresholds or {})}
+        key = tuple(sorted(limits.items()))
+        if key in self._gps_issues:
+            return self._gps_issues[key]
+
+        zero = ~np.isfinite(self.lat) | ~np.isfinite(self.lon)
+        zero |= (np.abs(self.lat) < 1e-6) & (np.abs(self.lon) < 1e-6)
+        no_fix = np.zeros(len(self), dtype=bool)
+        if np.any(self.fix > 0):
+            no_fix = self.fix < limits["min_fix"]
+        high_dop = np.nan_to_num(self.dop, nan=0.0) > limits["max_dop"]
+
+        # Spikes among the otherwise good points: fast in and fast out
+        jump = np.zeros(len(self), dtype=bool)
+        good = np.flatnonzero(~(zero | no_fix | high_dop))
+        if len(good) >= 2:
+            lat, lon = self.lat[good], self.lon[good]
+            distance = haversine_m(lat[:-1], lon[:-1], lat[1:], lon[1:])
+            elapsed = np.diff(self.time[good]).astype(np.float64) / 1000
+            speed = np.divide(
+                distance, elapsed, out=np.full_like(distance, np.inf), where=elapsed > 0
+            )
+            speed[(elapsed <= 0) & (distance < 1.0)] = 0.0  # Repeated fix
+            fast = speed > limits["max_speed_ms"]
+            # An end point has one neighbour, so one fast step cannot prove a spike
+            fast_in = np.concatenate(([False], fast))
+            fast_out = np.concatenate((fast, [False]))
+            jump[good] = fast_in & fast_out
+
+        issues = np.select(
+            [zero, no_fix, high_dop, jump],
+            ["zero", "no_fix", "high_dop", "jump"],
+            default="",
+        ).astype(object)
+        issues[issues == ""] = None
+        self._gps_issues[key] = issues
+        return issues
+
+    def frame_issues(self, joined: dict, thresholds: dict = None) -> np.ndarray:
+        """
+        Why each joined frame's position is not trustworthy, if it is not.
+
+        A frame inherits the issue of either trackpoint it was interpolated
+        between, and gets 'gap' when no fix is within ``max_gap_s`` (e.g.
+        before the first fix, when ``join`` clamps to the first point).
+
+        Args:
+            joined (dict): Result of ``join``.
+            thresholds (dict): Overrides for ``GPS_QUALITY_THRESHOLDS``.
+
+        Returns:
+            np.ndarray: Object array, None for good frames, else the reason.
+        """
+        limits = {**GPS_QUALITY_THRESHOLDS, **(thresholds or {})}
+        point_issues = self.gps_issues(limits)
+        issues = point_issues[joined["before"]].copy()
+        later = issues == None  # noqa: E711 (elementwise)
+        issues[later] = point_issues[joined["after"]][later]
+        gap = (
+            np.abs((joined["time"] - self.time[joined["index"]]).astype(np.float64))
+            / 1000
+        )
+        issues[gap > limits["max_gap_s"]] = "gap"
+        return issues
+
+    def interpolation_error(self) -> dict:
+        """
+        Estimate frame position error by predicting each raw trackpoint from
+        its two neighbours, with linear interpolation and with the nearest
+        neighbour.
+
+        Leaving a point out doubles the gap being bridged, so the figures are
+        an upper bound on the error at frame times.
+
+        Returns:
+            dict: Points checked, and mean, 95th percentile and max error in
+            meters for 'linear' and 'nearest'. Empty below three points.
+        """
+        if len(self) < 3:
+            return {}
+        span = (self.time[2:] - self.time[:-2]).astype(np.float64)
+        elapsed = (self.time[1:-1] - self.time[:-2]).astype(np.float64)
+        fraction = np.divide(elapsed, span, out=np.zeros_like(elapsed), where=span > 0)
+        before = np.arange(len(self) - 2)
+        after = before + 2
+
+        predictions = {
+            "linear": (
+                _lerp(self.lat, before, after, fraction),
+                _lerp(self.lon, before, after, fraction),
+            ),
+            "nearest": (
+                np.where(fraction <= 0.5, self.lat[:-2], self.lat[2:]),
+                np.where(fraction <= 0.5, self.lon[:-2], self.lon[2:]),
+            ),
+        }
+        report = {"points": len(self) - 2}
+        for method, (lat, lon) in predictions.items():
+            errors = haversine_m(lat, lon, self.lat[1:-1], self.lon[1:-1])
+            errors = errors[np.isfinite(errors)]
+            if not len(errors):
+                continue
+            report[method] = {
+                "mean_m": float(errors.mean()),
+                "p95_m": float(np.percentile(errors, 95)),
+                "max_m": float(errors.max()),
+            }
+            logger.info(
+                f"Track {method} position error over {report['points']} points: "
+                f"mean {report[method]['mean_m']:.2f} m, "
+                f"p95 {report[method]['p95_m']:.2f} m, "
+                f"max {report[method]['max_m']:.2f} m"
+            )
+        return report
+
+    def between(self, start=None, end=None) -> "Track":
+        """
+        The points with ``start <= time < end``, as views into this track's arrays.
+
+        Args:
+            start (datetime | np.datetime64): Inclusive lower bound, or None.
+            end (datetime | np.datetime64): Exclusive upper bound, or None.
+
+        Returns:
+            Track: A track sharing memory with this one (no copy).
+        """
+        first = (
+            0
+            if start is None
+            else np.searchsorted(self.time, np.datetime64(start, "ms"))
+        )
+        last = (
+            len(self)
+            if end is None
+            else np.searchsorted(self.time, np.datetime64(end, "ms"))
+        )
+        part = slice(first, last)
+        return Track(
+            time=self.time[part],
+            lat=self.lat[part],
+            lon=self.lon[part],
+            altitude=self.altitude[part],
+            speed_2d=self.speed_2d[part],
+            speed_3d=self.speed_3d[part],
+            fix=self.fix[part],
+            dop=self.dop[part],
+            offset=self.offset[part],
+            base_time=self.base_time,
+            source=self.source,
+        )
+
+    def save(self, path):
+        """
+        Write the track in the columnar ``.track`` format (see ``TRACK_COLUMNS``),
+        so it never has to be parsed from XML again.
+
+        Args:
+            path (str): Output file path.
+        """
+        columns = {
+            "time": self.time.astype(np.int64),
+            "lat": self.lat,
+            "lon": self.lon,
+            "altitude": self.altitude,
+            "speed_2d": self.speed_2d,
+            "speed_3d": self.speed_3d,
+            "dop": self.dop,
+            "offset": self.offset,
+            "fix": self.fix,
+        }
+        times = (
+            np.datetime_as_string(self.time[[0, -1]], unit="ms")
+            if len(self)
+            else [None, None]
+        )
+        header = {
+            "version": TRACK_VERSION,
+            "count": len(self),
+            "start": times[0],
+            "end": times[1],
+            "base_time": self.base_time.isoformat() if self.base_time else None,
+            "source": self.source,
+            "columns": [],
+        }
+
+        # Column offsets depend on the header length, which depends on the offsets
+        header_size = 0
+        while True:
+            offset = _align(len(TRACK_MAGIC) + 4 + header_size)
+            header["columns"] = []
+            for name, dtype in TRACK_COLUMNS:
+                header["columns"].append(
+                    {"name": name, "dtype": dtype, "offset": offset}
+                )
+                offset = _align(offset + len(self) * np.dtype(dtype).itemsize)
+            encoded = json.dumps(header).encode()
+            if len(encoded) <= header_size:
+                break
+            header_size = _align(len(encoded))
+        encoded = encoded.ljust(header_size)
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as track_file:
+            track_file.write(TRACK_MAGIC)
+            track_file.write(np.uint32(header_size).tobytes())
+            track_file.write(encoded)
+            for (name, dtype), column in zip(TRACK_COLUMNS, header["columns"]):
+                track_file.seek(column["offset"])
+                track_file.write(
+                    np.ascontiguousarray(columns[name], dtype=dtype).tobytes()
+                )
+        os.replace(temp_path, path)
+        logger.info(f"Saved {len(self)} trackpoints to {path}.")
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Open a track written by ``save``.
+
+        Args:
+            path (str): Path to the ``.track`` file.
+            mmap (bool): Map the columns straight from the file instead of
+                reading them into memory.
+
+        Returns:
+            Track: The saved track.
+        """
+        header = read_track_header(path)
+        if mmap:
+            raw = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            raw = np.fromfile(path, dtype=np.uint8)
+        columns = {}
+        for column in header["columns"]:
+            dtype = np.dtype(column["dtype"])
+            start = column["offset"]
+            columns[column["name"]] = raw[
+                start : start + header["count"] * dtype.itemsize
+            ].view(dtype)
+
+        base_time = header["base_time"]
+        return cls(
+            time=columns.pop("time").view("datetime64[ms]"),
+            base_time=datetime.datetime.fromisoformat(base_time) if base_time else None,
+            source=header["source"],
+            **columns,
+        )
+
+    def to_records(self) -> list:
+        """
+        Convert to the list of dicts produced by ``Processor.preprocess_gpx_file``.
+
+        Returns:
+            list[dict]: timestamp, lat, lon, elevation, heart_rate, speed.
+        """
+        times = self.time.astype(datetime.datetime)
+        return [
+            {
+                "timestamp": timestamp,
+                "lat": lat,
+                "lon": lon,
+                "elevation": altitude,
+                "heart_rate": "N/A",
+                "speed": speed,
+            }
+            for timestamp, lat, lon, altitude, speed in zip(
+                times,
+                self.lat.tolist(),
+                self.lon.tolist(),
+                self.altitude.tolist(),
+                self.speed_2d.tolist(),
+            )
+        ]
+
+    def write_gpx(self, path):
+        """
+        Write the track as GPX 1.1, with the base time as the metadata time.
+
+        Args:
+            path (str): Output file path.
+        """
+        times = np.datetime_as_string(self.time, unit="ms")
+        lines = [GPX_HEADER]
+        if self.base_time is not None:
+            base_time = self.base_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+            lines.append(f"<metadata><time>{base_time}Z</time></metadata>\n")
+        lines.append("<trk><trkseg>\n")
+        has_fix = bool(np.any(self.fix > 0))
+        for time, lat, lon, altitude, speed, fix, dop in zip(
+            times,
+            self.lat.tolist(),
+            self.lon.tolist(),
+            self.altitude.tolist(),
+            self.speed_2d.tolist(),
+            self.fix.tolist(),
+            self.dop.tolist(),
+        ):
+            # Channels the source lacks (NaN) are left out, not written as 'nan'
+            elevation = f"<ele>{altitude:.3f}</ele>" if np.isfinite(altitude) else ""
+            quality = ""
+            if has_fix:
+                quality += f"<fix>{GPS_FIX_NAMES.get(fix, 'none')}</fix>"
+            if np.isfinite(dop):
+                quality += f"<pdop>{dop:.2f}</pdop>"
+            extensions = ""
+            if np.isfinite(speed):
+                extensions = (
+                    "<extensions><gpxtpx:TrackPointExtension>"
+                    f"<gpxtpx:speed>{speed:.3f}</gpxtpx:speed>"
+                    "</gpxtpx:TrackPointExtension></extensions>"
+                )
+            lines.append(
+                f'<trkpt lat="{lat:.7f}" lon="{lon:.7f}">{elevation}'
+                f"<time>{time}Z</time>{quality}{extensions}</trkpt>\n"
+            )
+        lines.append("</trkseg></trk>\n</gpx>\n")
+
+        with open(path, "w") as gpx_file:
+            gpx_file.writelines(lines)
+        logger.info(f"Wrote {len(self)} trackpoints to {path}.")
+
+
+def compute_heading(lat, lon, baseline_m=HEADING_BASELINE_M) -> np.ndarray:
+    """
+    Course over ground for each point of a track, vectorized.
+
+    Each point's heading is the bearing to the first later point at least
+    ``baseline_m`` further along the track, so GPS jitter between closely
+    spaced fixes does not swing it around. Points near the end of the track
+    keep the last heading measured.
+
+    Args:
+        lat (np.ndarray): Latitudes in degrees.
+        lon (np.ndarray): Longitudes in degrees.
+        baseline_m (float): Minimum travel to measure a heading over.
+
+    Returns:
+        np.ndarray: Degrees clockwise from north; all NaN if the whole track
+        covers less than ``baseline_m``.
+    """
+    n = len(lat)
+    heading = np.full(n, np.nan)
+    if n < 2:
+        return heading
+    travelled = np.concatenate(
+        (
+            [0.0],
+            np.cumsum(np.nan_to_num(haversine_m(lat[:-1], lon[:-1], lat[1:], lon[1:]))),
+        )
+    )
+    ahead = np.searchsorted(travelled, travelled + baseline_m)
+    valid = ahead < n
+    if not valid.any():
+        return heading
+
+    start = np.flatnonzero(valid)
+    lat1, lon1 = np.radians(lat[start]), np.radians(lon[start])
+    lat2, lon2 = np.radians(lat[ahead[start]]), np.radians(lon[ahead[start]])
+    delta = lon2 - lon1
+    heading[start] = (
+        np.degrees(
+            np.arctan2(
+                np.sin(delta) * np.cos(lat2),
+                np.cos(lat1) * np.sin(lat2)
+                - np.sin(lat1) * np.cos(lat2) * np.cos(delta),
+            )
+        )
+        % 360
+    )
+    # Only the tail lacks a point far enough ahead; it keeps the last heading
+    heading[start[-1] + 1 :] = heading[start[-1]]
+    return heading
+
+
+def _align(size, alignment=8) -> int:
+    return -(-size // alignment) * alignment
+
+
+def read_track_header(path) -> dict:
+    """
+    Read only the JSON header of a ``.track`` file.
+
+    Args:
+        path (str): Path to the ``.track`` file.
+
+    Returns:
+        dict: version, count, start, end, base_time, source and column layout.
+    """
+    with open(path, "rb") as track_file:
+        magic = track_file.read(len(TRACK_MAGIC))
+        if magic != TRACK_MAGIC:
+            raise ValueError(f"{path} is not a track file.")
+        header_size = int(np.frombuffer(track_file.read(4), dtype=np.uint32)[0])
+        header = json.loads(track_file.read(header_size))
+    if header.get("version") != TRACK_VERSION:
+        raise ValueError(
+            f"{path} has unsupported track version {header.get('version')}."
+        )
+    return header
+
+
+def _local_name(tag) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _parse_time(text) -> np.datetime64:
+    return np.datetime64(text.strip().rstrip("Z"), "ms")
+
+
+def read_gpx(path) -> Track:
+    """
+    Read a GPX file into a Track in one streaming pass.
+
+    Trackpoints go straight into typed arrays and each element is freed
+    once read, so memory stays flat however long the file is. The
+    ``<metadata><time>`` is taken as the base time. Namespaces are
+    ignored, so GPX 1.0 and 1.1 both work.
+
+    Args:
+        path (str): Path to the GPX file.
+
+    Returns:
+        Track: The trackpoints sorted by time.
+    """
+    times = []
+    lats, lons, altitudes, speeds = array("d"), array("d"), array("d"), array("d")
+    fixes, dops = array("b"), array("d")
+    fix_values = {name: value for value, name in GPS_FIX_NAMES.items()}
+    base_time = None
+    segment = None
+
+    for event, element in ET.iterparse(path, events=("start", "end")):
+        name = _local_name(element.tag)
+        if event == "start":
+            if name == "trkseg":
+                segment = element
+            continue
+        if name == "trkpt":
+            time_text = None
+            altitude = speed = dop = np.nan
+            fix = 0
+            for child in element.iter():
+                child_name = _local_name(child.tag)
+                if child_name == "time":
+                    time_text = child.text
+                elif child_name == "ele":
+                    altitude = _to_float(child.text)
+                elif child_name == "speed":
+                    speed = _to_float(child.text)
+                elif child_name == "fix":
+                    fix = fix_values.get((child.text or "").strip().lower(), 0)
+                elif child_name in ("pdop", "hdop") and dop != dop:
+                    dop = _to_float(child.text)
+            if time_text:
+                times.append(time_text.strip().rstrip("Z"))
+                lats.append(float(element.get("lat", 0.0)))
+                lons.append(float(element.get("lon", 0.0)))
+                altitudes.append(altitude)
+                speeds.append(speed)
+                fixes.append(fix)
+                dops.append(dop)
+            if segment is not None:
+                segment.remove(element)  # Free the trackpoint as soon as it is read
+        elif name == "metadata":
+            time_text = next(
+                (child.text for child in element if _local_name(child.tag) == "time"),
+                None,
+            )
+            if time_text:
+                base_time = to_datetime(_parse_time(time_text))
+
+    time = np.array(times, dtype="datetime64[ms]")
+    order = np.argsort(time, kind="stable")
+    track = Track(
+        time=time[order],
+        lat=np.frombuffer(lats)[order],
+        lon=np.frombuffer(lons)[order],
+        altitude=np.frombuffer(altitudes)[order],
+        speed_2d=np.frombuffer(speeds)[order],
+        fix=np.frombuffer(fixes, dtype=np.int8)[order],
+        dop=np.frombuffer(dops)[order],
+        base_time=base_time,
+        source=path,
+    )
+    logger.info(f"Read {len(track)} trackpoints from {path}.")
+    return track
+
+
+def _lerp(values, before, after, fraction):
+    return values[before] + (values[after] - values[before]) * fraction
@@ -0,0 +1,52 @@
+# tests/conftest.py
+import datetime
+
+import numpy as np
+import pytest
+
+from processing import Processor
+from telemetry import Track
+
+BASE_TIME = datetime.datetime(2025, 1, 1, 12)
+
+
+def _straight_track(points=60, speed=10.0, hz=1.0, lat=35.0, lon=-78.0):
+    """A track heading north at a constant ``speed`` (m/s), one fix per ``1/hz`` s."""
+    seconds = np.arange(points) / hz
+    return Track(
+        time=np.datetime64(BASE_TIME, "ms")
+        + (seconds * 1000).astype("timedelta64[ms]"),
+        lat=lat + seconds * speed / 111_195,
+        lon=np.full(points, lon),
+        speed_2d=np.full(points, float(speed)),
+        fix=np.full(points, 3),
+        dop=np.full(points, 1.0),
+        offset=seconds,
+        base_time=BASE_TIME,
+    )
+
+
+@pytest.fixture
+def make_track():
+    """Factory for synthetic tracks; see ``_straight_track``."""
+    return _straight_track
+
+
+@pytest.fixture
+def bare_processor():
+    """A Processor without ffmpeg, API clients or configuration lookups."""
+    processor = Processor.__new__(Processor)
+    processor.base_timestamp = BASE_TIME
+    processor.telemetry_data = []
+    processor.track = None
+    processor.chapter_offsets = {}
+    processor.jolts = None
+    processor.gps_thresholds = None
+    processor.gps_report = {}
+    processor.road_matcher = None
+    processor.avl_source = None
+    processor.telemetry_source = None
+    processor.api_calls_saved = {}
+    processor.payload_report = {}
+    processor.stream_uploads = []
+    return processor
@@ -0,0 +1,115 @@
+# tests/test_avl.py
+import csv
+import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from avl import AvlSource, estimate_clock_offset, fill_gaps, parse_times, read_avl
+from telemetry import Track
+
+START = np.datetime64("2025-01-01T12:00:00", "ms")
+
+
+def _curve(seconds):
+    """A winding path, so a clock offset shows up as a position error."""
+    seconds = np.asarray(seconds, dtype=np.float64)
+    return 35.0 + seconds * 1e-4, -78.0 + 5e-4 * np.sin(seconds / 20)
+
+
+def _write_avl(path, seconds, lag_s=0.0, vehicle="T1"):
+    lat, lon = _curve(seconds)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["Vehicle_ID", "Timestamp", "Latitude", "Longitude", "Speed_mph"]
+        )
+        for second, y, x in zip(seconds, lat, lon):
+            time = START + np.timedelta64(int((second - lag_s) * 1000), "ms")
+            writer.writerow([vehicle, f"{time}Z", y, x, 22.37])
+    return str(path)
+
+
+def _gopro(seconds):
+    lat, lon = _curve(seconds)
+    seconds = np.asarray(seconds, dtype=np.float64)
+    return Track(
+        time=START + (seconds * 1000).astype("timedelta64[ms]"),
+        lat=lat,
+        lon=lon,
+        fix=np.full(len(seconds), 3),
+        dop=np.full(len(seconds), 1.0),
+        offset=seconds,
+        base_time=START.astype(datetime.datetime),
+    )
+
+
+def test_parse_times_formats():
+    times = parse_times(
+        ["2025-01-01T07:00:00-05:00", "1735732800", "1735732800000", "soon"]
+    )
+    assert times[:3].tolist() == [START.astype(datetime.datetime)] * 3
+    assert np.isnat(times[3])
+
+
+def test_read_avl_sorts_converts_and_filters(tmp_path):
+    path = tmp_path / "avl.csv"
+    path.write_text(
+        "Vehicle_ID,Timestamp,Latitude,Longitude,Speed_mph\n"
+        "T1,2025-01-01T12:00:20Z,35.002,-78.0,10\n"
+        "T1,2025-01-01T12:00:00Z,35.000,-78.0,\n"
+        "T2,2025-01-01T12:00:10Z,36.000,-79.0,10\n"
+        "T1,2025-01-01T12:00:10Z,,-78.0,10\n"
+        "T1,2025-01-01T12:00:20Z,35.002,-78.0,10\n"
+    )
+    track = read_avl(str(path), vehicle="T1")
+    assert track.time.tolist() == [
+        START.astype(datetime.datetime),
+        (START + np.timedelta64(20, "s")).astype(datetime.datetime),
+    ]
+    assert np.isnan(track.speed_2d[0])
+    assert track.speed_2d[1] == pytest.approx(4.4704)
+    assert track.fix.tolist() == [3, 3]
+
+
+def test_estimate_clock_offset_finds_lag(tmp_path):
+    avl = read_avl(_write_avl(tmp_path / "avl.csv", np.arange(-300, 900, 10), lag_s=37))
+    offset, error = estimate_clock_offset(avl, _gopro(np.arange(0, 600)))
+    assert offset == pytest.approx(37, abs=1)
+    assert error < 5
+
+
+def test_fill_gaps_only_fills_where_gopro_has_no_fix(tmp_path):
+    gopro = _gopro(np.r_[0:100, 200:300])
+    avl = AvlSource(
+        _write_avl(tmp_path / "avl.csv", np.arange(-200, 500, 10)), clock_offset_s=0
+    )
+    fallback = avl.track_for(START.astype(datetime.datetime), 300)
+
+    merged = fill_gaps(gopro, fallback)
+
+    filled = merged.offset[np.isnan(merged.dop)]  # AVL points carry no DOP here
+    assert len(merged) == 200 + len(filled)
+    # Within the recording, AVL points only appear in the GoPro's gap
+    during = filled[(filled >= 0) & (filled <= 300)]
+    assert len(during) and during.min() > 100 and during.max() < 200
+
+
+def test_avl_fallback_leaves_processor_thresholds_alone(bare_processor, tmp_path):
+    bare_processor.avl_source = AvlSource(
+        _write_avl(tmp_path / "avl.csv", np.arange(-200, 500, 10)), clock_offset_s=0
+    )
+    bare_processor.get_video_info = lambda path: SimpleNamespace(duration=300.0)
+    bare_processor.track = _gopro(np.r_[0:100, 200:300])
+    base_time = START.astype(datetime.datetime)
+
+    bare_processor.use_avl_track(["GX010229.MP4"], base_time)
+
+    assert bare_processor.telemetry_source == "gopro+avl"
+    assert bare_processor.gps_thresholds is None
+    assert bare_processor.drive_gps_thresholds() == {"max_gap_s": 30.0}
+    assert bare_processor.base_timestamp == base_time == bare_processor.track.base_time
+
+    bare_processor.telemetry_source = "gopro"  # Next drive has its own GPS
+    assert bare_processor.drive_gps_thresholds() is None
@@ -0,0 +1,106 @@
+# tests/test_frame_table.py
+import numpy as np
+
+from frame_table import FrameTable, RECORD_FIELDS, frame_records
+from processing import TelemetryObject
+
+
+def test_cells_round_trip_and_none_clears():
+    table = FrameTable(capacity=1)
+    row = table.append(
+        lat=35.5, gps_fix=3, filename="a.jpg", time="2025-01-01T12:00:00"
+    )
+    assert table.get(row, "lat") == 35.5
+    assert table.get(row, "gps_fix") == 3
+    assert table.get(row, "filename") == "a.jpg"
+    assert table.get(row, "time") == np.datetime64("2025-01-01T12:00:00", "ms")
+    for name in ("lat", "gps_fix", "filename", "time"):
+        table.set(row, name, None)
+        assert table.get(row, name) is None
+
+
+def test_append_grows_and_keeps_unset_cells_missing():
+    table = FrameTable(capacity=1)
+    rows = [table.append(lat=float(i)) for i in range(5)]
+    assert rows == [0, 1, 2, 3, 4] and len(table) == 5
+    assert table.capacity >= 5
+    assert [table.get(row, "lat") for row in rows] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert table.get(4, "gps_fix") is None
+    assert table.get(4, "time") is None
+
+
+def test_set_many_writes_a_column():
+    table = FrameTable()
+    for _ in range(3):
+        table.append()
+    table.set_many([0, 2], "gps_fix", [3, None])
+    table.set_many([0, 1], "street_name", ["Main St", "Main St"])
+    assert [table.get(row, "gps_fix") for row in range(3)] == [3, None, None]
+    assert table.get(0, "street_name") is table.get(1, "street_name")
+
+
+def test_analysis_columns_and_extra_keys_round_trip():
+    table = FrameTable()
+    row = table.append()
+    analysis = {
+        "pothole": "yes",
+        "pothole_confidence": 0.8,
+        "estimated_pcr": 72,
+        "summary": "Worn surface",
+        "skipped_reason": "glare",
+        "quality": {"sharpness": 12.5},
+        "alligator_cracking": None,
+        "line_cracking": True,
+    }
+    table.set_analysis(row, analysis)
+    assert table.get_analysis(row) == analysis
+    # Non-string labels and non-matching number types stay in the extra dict
+    assert table.columns["alligator_cracking"][row] == -1
+    assert set(table.columns["analysis_extra"][row]) == {
+        "quality",
+        "alligator_cracking",
+        "line_cracking",
+    }
+    table.set_analysis(row, {"estimated_pcr": 70.5, "pothole_confidence": 1})
+    assert table.get_analysis(row) == {"estimated_pcr": 70.5, "pothole_confidence": 1}
+    table.set_analysis(row, {})
+    assert table.get_analysis(row) == {}
+
+
+def test_severity_labels_share_a_vocabulary():
+    table = FrameTable()
+    for label in ("low", "high", "low"):
+        table.set_analysis(table.append(), {"pothole": label})
+    assert table.vocabulary["pothole"] == ["low", "high"]
+    assert table.columns["pothole"][:3].tolist() == [0, 1, 0]
+
+
+def test_records_match_telemetry_object_to_dict():
+    table = FrameTable()
+    first = TelemetryObject(
+        "a.jpg", "/tmp/a.jpg", 1.5, 35.0, -78.0, "GX01.MP4", table=table
+    )
+    second = TelemetryObject(
+        "b.jpg", "/tmp/b.jpg", 2.0, source_video="GX01.MP4", table=table
+    )
+    first.timestamp = "2025-01-01T12:00:01.500Z"
+    first.gps_fix = 3
+    first.analysis_results = {"pothole": "no", "estimated_pcr": 90}
+    lone = TelemetryObject("c.jpg", "/tmp/c.jpg", 3.0, 35.1, -78.1, "GX02.MP4")
+
+    records = frame_records([first, second, lone])
+    assert records == [obj.to_dict() for obj in (first, second, lone)]
+    assert list(records[0]) == list(RECORD_FIELDS)
+    assert records[0]["timestamp"] == "2025-01-01T12:00:01.500Z"
+    assert records[1]["timestamp"] == 2.0
+    assert records[1]["lat"] is None and records[1]["gps_fix"] is None
+    assert records[0]["analysis_results"] == {"pothole": "no", "estimated_pcr": 90}
+
+
+def test_features_carry_analysis_as_properties():
+    obj = TelemetryObject("a.jpg", "/tmp/a.jpg", 1.0, 35.0, -78.0, "GX01.MP4")
+    obj.analysis_results = {"pothole": "yes"}
+    feature = obj.table.to_features()[0]
+    assert feature["geometry"]["coordinates"] == [-78.0, 35.0]
+    assert feature["properties"]["pothole"] == "yes"
+    assert "lat" not in feature["properties"]
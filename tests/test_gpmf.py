@@ -0,0 +1,135 @@
+# tests/test_gpmf.py
+import struct
+
+import numpy as np
+import pytest
+
+from gpmf import extract_gps_track, iter_klv, parse_gps_payload, read_gpmd_samples
+
+
+def _klv(key, type_char, struct_size, data):
+    repeat = len(data) // struct_size if struct_size else 0
+    header = key + type_char + struct.pack(">BH", struct_size, repeat)
+    return header + data + b"\x00" * (-len(data) % 4)
+
+
+def _nested(key, *children):
+    data = b"".join(children)
+    return key + struct.pack(">BBH", 0, 4, len(data) // 4) + data
+
+
+def _gps5_payload(samples, gpsu="250101120000.000", lat=35.0, fix=3, dop=150):
+    """One DEVC/STRM payload of ``samples`` GPS5 rows heading north."""
+    scale = np.array([10_000_000, 10_000_000, 1000, 1000, 100], ">i4")
+    rows = np.zeros((samples, 5), ">i4")
+    rows[:, 0] = np.round((lat + np.arange(samples) * 1e-5) * 1e7)
+    rows[:, 1] = -78 * 10_000_000
+    rows[:, 2] = 120_000  # 120 m
+    rows[:, 3] = 12_500  # 12.5 m/s
+    children = [_klv(b"SCAL", b"l", 4, scale.tobytes())]
+    if gpsu is not None:
+        children.append(_klv(b"GPSU", b"U", 16, gpsu.encode("ascii")))
+    children += [
+        _klv(b"GPSF", b"L", 4, struct.pack(">I", fix)),
+        _klv(b"GPSP", b"S", 2, struct.pack(">H", dop)),
+        _klv(b"GPS5", b"l", 20, rows.tobytes()),
+    ]
+    return _nested(b"DEVC", _nested(b"STRM", *children))
+
+
+def _box(box_type, *payload):
+    data = b"".join(payload)
+    return struct.pack(">I", 8 + len(data)) + box_type + data
+
+
+def _full_box(box_type, *payload):
+    return _box(box_type, b"\x00\x00\x00\x00", *payload)
+
+
+def _write_mp4(path, payloads, timescale=1000, duration=1000):
+    """A minimal MP4 whose only track is GPMD, one payload per chunk."""
+    ftyp = _box(b"ftyp", b"isom", b"\x00\x00\x02\x00")
+    mdat = _box(b"mdat", *payloads)
+    first = len(ftyp) + 8
+    chunk_offsets = np.cumsum([0] + [len(p) for p in payloads[:-1]]) + first
+    count = len(payloads)
+    stbl = _box(
+        b"stbl",
+        _full_box(b"stsd", struct.pack(">I", 1), _box(b"gpmd", b"\x00" * 8)),
+        _full_box(b"stts", struct.pack(">III", 1, count, duration)),
+        _full_box(b"stsc", struct.pack(">IIII", 1, 1, 1, 1)),
+        _full_box(
+            b"stsz",
+            struct.pack(">II", 0, count),
+            b"".join(struct.pack(">I", len(p)) for p in payloads),
+        ),
+        _full_box(
+            b"stco",
+            struct.pack(">I", count),
+            b"".join(struct.pack(">I", int(o)) for o in chunk_offsets),
+        ),
+    )
+    mdhd = _full_box(
+        b"mdhd", struct.pack(">IIII", 0, 0, timescale, duration * count), b"\x00" * 4
+    )
+    moov = _box(b"moov", _box(b"trak", _box(b"mdia", mdhd, _box(b"minf", stbl))))
+    path.write_bytes(ftyp + mdat + moov)
+    return path
+
+
+def test_iter_klv_skips_padding():
+    payload = _klv(b"GPSF", b"L", 4, b"\x00\x00\x00\x03") + _klv(
+        b"TYPE", b"c", 1, b"lll"
+    )
+    keys = [key for key, *_ in iter_klv(payload, 0, len(payload))]
+    assert keys == [b"GPSF", b"TYPE"]
+
+
+def test_parse_gps_payload_scales_rows():
+    payload = _gps5_payload(4)
+    (stream,) = parse_gps_payload(payload, 0, len(payload))
+    assert stream["kind"] == "GPS5"
+    assert stream["fix"] == 3
+    assert stream["dop"] == pytest.approx(1.5)
+    assert stream["gpsu"] == np.datetime64("2025-01-01T12:00:00", "ms")
+    assert stream["rows"].shape == (4, 5)
+    assert stream["rows"][0, 0] == pytest.approx(35.0)
+    assert stream["rows"][0, 3] == pytest.approx(12.5)
+
+
+def test_read_gpmd_samples_follows_stsz_and_stco(tmp_path):
+    payloads = [_gps5_payload(3), _gps5_payload(5)]
+    data = _write_mp4(tmp_path / "clip.mp4", payloads).read_bytes()
+    offsets, sizes, start, end = read_gpmd_samples(data)
+    assert sizes.tolist() == [len(p) for p in payloads]
+    assert data[offsets[1] : offsets[1] + sizes[1]] == payloads[1]
+    assert start.tolist() == [0.0, 1.0]
+    assert end.tolist() == [1.0, 2.0]
+
+
+def test_extract_gps_track_times_samples_from_gpsu(tmp_path):
+    path = _write_mp4(
+        tmp_path / "clip.mp4",
+        [_gps5_payload(10), _gps5_payload(10, gpsu="250101120001.000")],
+    )
+    track = extract_gps_track(str(path))
+    assert len(track) == 20
+    assert track.offset[10] == pytest.approx(1.0)
+    assert track.time[10] == np.datetime64("2025-01-01T12:00:01", "ms")
+    assert track.base_time.replace(tzinfo=None).isoformat() == "2025-01-01T12:00:00"
+
+
+def test_extract_gps_track_skips_payload_without_gpsu(tmp_path):
+    path = _write_mp4(
+        tmp_path / "clip.mp4",
+        [
+            _gps5_payload(10),
+            _gps5_payload(10, gpsu=None),
+            _gps5_payload(10, gpsu="250101120002.000"),
+        ],
+    )
+    track = extract_gps_track(str(path))
+    assert len(track) == len(track.offset) == 20
+    # The third payload keeps its own video offset, two seconds in
+    assert track.offset[10] == pytest.approx(2.0)
+    assert track.time[10] == np.datetime64("2025-01-01T12:00:02", "ms")
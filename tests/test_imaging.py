@@ -0,0 +1,95 @@
+# tests/test_imaging.py
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from imaging import (
+    NearDuplicateFilter,
+    dhash_frames,
+    quality_skip_reason,
+    score_frame_quality,
+    score_frames,
+)
+
+
+def jpeg(pixels) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(np.asarray(pixels, dtype=np.uint8)).save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def noise_frame(seed=0, size=(240, 320)):
+    return jpeg(np.random.default_rng(seed).integers(0, 256, (*size, 3)))
+
+
+@pytest.fixture
+def frame_hash():
+    return dhash_frames([noise_frame()])[0]
+
+
+def test_duplicates_dropped_only_while_stopped(frame_hash):
+    dedupe = NearDuplicateFilter(threshold=5)
+    speeds = [0.0, 0.3, 8.0, 0.5, None, float("nan")]
+    results = [dedupe.check(frame_hash, key, speed) for key, speed in enumerate(speeds)]
+    # Frame 2 is moving and becomes the new reference for frame 3
+    assert results == [None, 0, None, 2, None, None]
+    assert (dedupe.kept, dedupe.dropped) == (4, 2)
+
+
+def test_different_frames_are_kept_while_stopped():
+    hashes = dhash_frames([noise_frame(1), noise_frame(2)])
+    dedupe = NearDuplicateFilter(threshold=5)
+    assert dedupe.check(hashes[0], "a", 0.0) is None
+    assert dedupe.check(hashes[1], "b", 0.0) is None
+
+
+def test_max_speed_is_configurable(frame_hash):
+    dedupe = NearDuplicateFilter(threshold=5, max_speed_ms=3.0)
+    dedupe.check(frame_hash, "a", 2.5)
+    assert dedupe.check(frame_hash, "b", 2.5) == "a"
+
+
+def gray_frame(mean, spread, seed=0, size=(240, 320)):
+    """Colourless texture, like asphalt, around ``mean`` luminance."""
+    gray = np.random.default_rng(seed).normal(mean, spread, size).clip(0, 255)
+    return np.repeat(gray[:, :, None], 3, axis=2)
+
+
+@pytest.mark.parametrize(
+    "pixels, reason",
+    [
+        (gray_frame(120, 40), None),
+        (gray_frame(15, 5), "too_dark"),
+        (gray_frame(215, 15), "glare"),
+        (np.full((240, 320, 3), 255), "glare"),
+        (
+            np.tile(np.linspace(80, 160, 320), (240, 1))[:, :, None].repeat(3, axis=2),
+            "blurry",
+        ),
+    ],
+    ids=["asphalt", "dark", "washed_out", "clipped", "flat"],
+)
+def test_quality_skip_reasons(pixels, reason):
+    assert quality_skip_reason(score_frame_quality(jpeg(pixels))) == reason
+
+
+def test_dark_flat_block_is_an_obstruction():
+    pixels = gray_frame(140, 40)
+    pixels[:, :160] = 20
+    scores = score_frame_quality(jpeg(pixels))
+    assert scores["obstruction"] == 0.5
+    assert quality_skip_reason(scores) == "obstructed"
+
+
+def test_quality_thresholds_can_be_overridden():
+    scores = score_frame_quality(jpeg(gray_frame(215, 15)))
+    assert quality_skip_reason(scores, {"min_glare_brightness": 230.0}) is None
+
+
+def test_score_frames_keeps_input_order():
+    frames = [jpeg(gray_frame(15, 5)), jpeg(gray_frame(120, 40))]
+    scores = score_frames(frames, max_workers=2)
+    assert [quality_skip_reason(s) for s in scores] == ["too_dark", None]
+    assert score_frames([]) == []
@@ -0,0 +1,67 @@
+# tests/test_imu.py
+import numpy as np
+import pytest
+
+from imu import ImuTrack, detect_jolts, jolt_scores, thin_smooth_timestamps
+
+RATE_HZ = 200.0
+
+
+def _imu(bursts=(), seconds=20.0, gyro_at=None, seed=0):
+    """Camera on its side (gravity along +y) with mild noise and 10 Hz bursts."""
+    rng = np.random.default_rng(seed)
+    offset = np.arange(int(seconds * RATE_HZ)) / RATE_HZ
+    accel = rng.normal(0.0, 0.1, (len(offset), 3))
+    accel[:, 1] += 9.81
+    for start in bursts:
+        burst = (offset >= start) & (offset < start + 0.1)
+        accel[burst, 1] += 15.0 * np.sin(2 * np.pi * 10.0 * (offset[burst] - start))
+    gyro = np.zeros((len(offset), 3))
+    if gyro_at is not None:
+        gyro[np.argmin(np.abs(offset - gyro_at)), 0] = 2.0
+    return ImuTrack(offset, accel, offset, gyro)
+
+
+def test_detects_bursts_and_merges_close_peaks():
+    jolts = detect_jolts(_imu(bursts=(5.0, 12.0, 12.3), gyro_at=12.2))
+    assert len(jolts["offset"]) == 2
+    np.testing.assert_allclose(jolts["offset"], [5.05, 12.2], atol=0.2)
+    assert (jolts["start"] <= jolts["offset"]).all()
+    assert (jolts["offset"] <= jolts["end"]).all()
+    assert (jolts["peak_ms2"] > jolts["threshold"]).all()
+    assert jolts["gyro_peak"].tolist() == [0.0, 2.0]
+
+
+def test_smooth_road_has_no_jolts():
+    jolts = detect_jolts(_imu())
+    assert len(jolts["offset"]) == 0
+    assert jolts["threshold"] >= 3.0
+
+
+def test_too_few_samples_or_too_low_rate():
+    assert np.isnan(detect_jolts(ImuTrack([0.0], [[0, 9.81, 0]]))["threshold"])
+    slow = ImuTrack(np.arange(20) / 4.0, np.tile([0, 9.81, 0], (20, 1)))
+    assert np.isnan(detect_jolts(slow)["threshold"])
+
+
+def test_gyro_peak_is_nan_without_gyro():
+    imu = _imu(bursts=(5.0,))
+    jolts = detect_jolts(ImuTrack(imu.accel_offset, imu.accel))
+    assert len(jolts["offset"]) == 1 and np.isnan(jolts["gyro_peak"][0])
+
+
+def test_jolt_scores_take_the_strongest_event_in_the_window():
+    jolts = {
+        "offset": np.array([5.0, 5.5, 12.0]),
+        "peak_ms2": np.array([4.0, 8.0, 6.0]),
+    }
+    scores = jolt_scores([5.2, 9.0, 12.9, 0.0], jolts)
+    assert scores[0] == 8.0 and scores[2] == 6.0
+    assert np.isnan(scores[1]) and np.isnan(scores[3])
+
+
+def test_thin_smooth_timestamps_keeps_frames_near_jolts():
+    jolts = {"offset": np.array([5.0]), "peak_ms2": np.array([6.0])}
+    kept = thin_smooth_timestamps(np.arange(10.0), jolts, keep_every=3)
+    assert kept == [0.0, 3.0, 4.0, 5.0, 6.0, 9.0]
+    assert thin_smooth_timestamps([1.0, 2.0], jolts, keep_every=1) == [1.0, 2.0]
@@ -0,0 +1,81 @@
+# tests/test_map_matching.py
+import json
+
+import numpy as np
+import pytest
+
+from map_matching import METERS_PER_DEGREE_LAT, RoadMatcher
+
+# Main St runs north from 35.0 to 35.01 along -78.0; Cross St runs east
+# along 35.005, in two parts with a gap between them.
+CENTERLINES = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"OBJECTID": 1, "FULLNAME": "Main St"},
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[-78.0, 35.0], [-78.0, 35.01]],
+            },
+        },
+        {
+            "type": "Feature",
+            "properties": {"OBJECTID": 2, "FULLNAME": "Cross St"},
+            "geometry": {
+                "type": "MultiLineString",
+                "coordinates": [
+                    [[-78.002, 35.005], [-78.001, 35.005]],
+                    [[-78.0005, 35.005], [-77.99, 35.005]],
+                ],
+            },
+        },
+        {"type": "Feature", "properties": {"OBJECTID": 3}, "geometry": None},
+    ],
+}
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    path = tmp_path / "centerlines.geojson"
+    path.write_text(json.dumps(CENTERLINES))
+    return RoadMatcher(str(path))
+
+
+def test_snaps_to_nearest_road_with_offset_along_it(matcher):
+    result = matcher.match([35.002], [-77.99995])
+    assert result["segment_id"].tolist() == [1]
+    assert result["street_name"].tolist() == ["Main St"]
+    assert result["offset_m"][0] == pytest.approx(
+        0.002 * METERS_PER_DEGREE_LAT, abs=0.5
+    )
+    assert result["distance_m"][0] == pytest.approx(4.6, abs=0.2)
+
+
+def test_heading_breaks_ties_near_an_intersection(matcher):
+    # ~4.6 m east of Main St and ~5.5 m north of Cross St
+    lats, lons = [35.00505, 35.00505], [-77.99995, -77.99995]
+    assert matcher.match(lats, lons)["street_name"].tolist() == ["Main St", "Main St"]
+    result = matcher.match(lats, lons, headings=[90.0, np.nan])
+    assert result["street_name"].tolist() == ["Cross St", "Main St"]
+    # Roads run both ways, so driving west matches as well as east
+    assert matcher.match(lats[:1], lons[:1], headings=[270.0])[
+        "segment_id"
+    ].tolist() == [2]
+
+
+def test_offsets_continue_across_multipart_segments(matcher):
+    result = matcher.match([35.005], [-77.999], headings=[90.0])
+    first_part = 0.001 * matcher.lon_scale
+    into_second_part = 0.0015 * matcher.lon_scale
+    assert result["segment_id"].tolist() == [2]
+    assert result["offset_m"][0] == pytest.approx(
+        first_part + into_second_part, abs=1.0
+    )
+
+
+def test_points_beyond_max_distance_stay_unmatched(matcher):
+    result = matcher.match([35.002, 35.002], [-77.9997, -77.99995])
+    assert result["segment_id"].tolist() == [None, 1]
+    assert np.isnan(result["offset_m"][0]) and np.isnan(result["distance_m"][0])
+    assert len(matcher.match([], [])["segment_id"]) == 0
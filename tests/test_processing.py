@@ -0,0 +1,89 @@
+# tests/test_processing.py
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from imaging import NearDuplicateFilter
+from processing import TelemetryObject
+from test_imaging import jpeg, noise_frame
+
+
+def _stream(frames):
+    for index, jpeg_bytes in enumerate(frames):
+        yield jpeg_bytes, float(index), f"clip_{index + 1:04d}.jpg"
+
+
+def test_stream_runs_quality_gate_before_dedupe(bare_processor, make_track):
+    bare_processor.track = make_track(speed=0.0)  # Stopped truck
+    flat = jpeg(np.full((240, 320, 3), 128))
+    textured = noise_frame()
+
+    objects = bare_processor.create_telemetry_objects_from_stream(
+        _stream([flat, flat, textured, textured]),
+        upload=False,
+        dedupe_filter=NearDuplicateFilter(threshold=5),
+        quality_gate=True,
+    )
+
+    reasons = [obj.analysis_results.get("skipped_reason") for obj in objects]
+    assert reasons == ["blurry", "blurry", None, None]
+    # The skipped flat frames are never a dedupe reference
+    assert [obj.duplicate_of for obj in objects] == [None, None, None, "clip_0003.jpg"]
+
+    passed, skipped = bare_processor.apply_quality_gate(objects, already_scored=True)
+    assert [obj.filename for obj in skipped] == ["clip_0001.jpg", "clip_0002.jpg"]
+    assert len(passed) == 2
+
+
+def _frame(name, duplicate_of=None):
+    obj = TelemetryObject(filename=name, filepath=name)
+    obj.duplicate_of = duplicate_of
+    return obj
+
+
+def test_duplicates_of_unanalyzed_frames_are_kept_as_skipped(bare_processor):
+    analyzed = _frame("a.jpg")
+    analyzed.add_analysis_results({"pothole": "yes"})
+    rechecked = [analyzed]
+    other = _frame("b.jpg")
+    duplicates = [
+        _frame("a2.jpg", "a.jpg"),
+        _frame("b2.jpg", "b.jpg"),  # Kept frame analyzed but not re-checked
+        _frame("c2.jpg", "c.jpg"),  # Kept frame never analyzed
+    ]
+
+    merged, unanalyzed = bare_processor.inherit_duplicate_analyses(
+        rechecked, duplicates, analyzed=[analyzed, other]
+    )
+
+    assert [obj.filename for obj in merged] == ["a.jpg", "a2.jpg"]
+    assert merged[1].analysis_results == {"pothole": "yes"}
+    assert [obj.filename for obj in unanalyzed] == ["c2.jpg"]
+    assert unanalyzed[0].analysis_results == {
+        "skipped_reason": "duplicate_not_analyzed"
+    }
+
+
+def test_pipeline_removes_workspace_when_timing_log_cannot_open(
+    bare_processor, tmp_path, monkeypatch
+):
+    real_open = open
+
+    def failing_open(path, *args, **kwargs):
+        if str(path).startswith("logs"):
+            raise PermissionError(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", failing_open)
+    bare_processor.processing_stages = {}
+    bare_processor.status_callback = None
+
+    with pytest.raises(PermissionError):
+        asyncio.run(
+            bare_processor.process_video_pipeline(
+                "GX010229.MP4", workspace_root=str(tmp_path)
+            )
+        )
+    assert os.listdir(tmp_path) == []
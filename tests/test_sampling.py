@@ -0,0 +1,104 @@
+# tests/test_sampling.py
+import datetime
+import os
+
+import numpy as np
+
+import sampling
+from sampling import distance_target_timestamps, get_sampler
+
+
+def _straight_track(points=10, step_m=20.0):
+    offsets = np.arange(points, dtype=np.float64)
+    lats = 35.0 + offsets * step_m / 110_540
+    lons = np.full(points, -78.0)
+    return offsets, lats, lons
+
+
+def _processor_with_track(processor, speeds):
+    offsets, lats, lons = _straight_track(points=len(speeds))
+    processor.telemetry_data = [
+        {
+            "timestamp": processor.base_timestamp
+            + datetime.timedelta(seconds=float(offset)),
+            "lat": lat,
+            "lon": lon,
+            "speed": speed,
+        }
+        for offset, lat, lon, speed in zip(offsets, lats, lons, speeds)
+    ]
+    return processor
+
+
+def test_distance_sampling_without_speed_channel_uses_geometry():
+    offsets, lats, lons = _straight_track()
+    from_geometry = distance_target_timestamps(offsets, lats, lons, spacing_m=10.0)
+    from_nan = distance_target_timestamps(
+        offsets, lats, lons, spacing_m=10.0, speeds=[float("nan")] * len(offsets)
+    )
+    assert from_nan == from_geometry
+    assert len(from_nan) == 19  # 180 m at 10 m spacing, both ends included
+
+
+def test_distance_sampling_with_partial_speeds():
+    offsets, lats, lons = _straight_track()
+    speeds = np.full(len(offsets), 20.0)
+    speeds[4] = np.nan
+    timestamps = distance_target_timestamps(
+        offsets, lats, lons, spacing_m=10.0, speeds=speeds
+    )
+    assert all(np.isfinite(timestamps))
+    assert np.allclose(np.diff(timestamps), 0.5, atol=0.01)
+
+
+def test_processor_keeps_speed_channel_with_one_missing_value(bare_processor):
+    # Speeds say 40 m/s while the positions move 20 m/s, so the result shows
+    # which source each step came from
+    speeds = [40.0] * 10
+    speeds[4] = None
+    processor = _processor_with_track(bare_processor, speeds)
+    timestamps = processor.get_distance_sample_timestamps(spacing_m=10.0)
+    steps = np.diff(timestamps)
+    assert np.isclose(steps.min(), 0.25, atol=0.01)  # From the speed channel
+    assert np.isclose(steps.max(), 0.5, atol=0.01)  # Geometry around the gap
+
+
+def test_processor_without_speeds_samples_by_geometry(bare_processor):
+    processor = _processor_with_track(bare_processor, [None] * 10)
+    timestamps = processor.get_distance_sample_timestamps(spacing_m=10.0)
+    assert len(timestamps) == 19
+
+
+def _fake_segment_ffmpeg(short_segment):
+    """Stand-in for ffmpeg that writes one frame less in ``short_segment``."""
+
+    def run(command, check=False):
+        pattern = command[-1]
+        count = int(command[command.index("-frames:v") + 1])
+        if f"_seg{short_segment:03d}_" in pattern:
+            count -= 1
+        for number in range(1, count + 1):
+            with open(pattern.replace("%04d", f"{number:04d}"), "wb") as f:
+                f.write(b"jpeg")
+
+    return run
+
+
+def test_parallel_extraction_keeps_later_segments_after_a_short_one(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(sampling.subprocess, "run", _fake_segment_ffmpeg(1))
+    sampler = get_sampler("stride", frame_rate=1)
+    timestamps = sampler.target_timestamps(30, 30 * 40)
+
+    frames = sampler.extract_parallel(
+        "clip.mp4", 30, 30 * 40, output_folder=str(tmp_path), workers=4
+    )
+
+    assert len(frames) == 39
+    assert [timestamp for _, timestamp in frames] == [
+        t for t in timestamps if t != timestamps[19]
+    ]
+    assert [os.path.basename(path) for path, _ in frames][-1] == "clip_0039.jpg"
+    assert all(os.path.exists(path) for path, _ in frames)
+    assert not [name for name in os.listdir(tmp_path) if "_seg" in name]
@@ -0,0 +1,67 @@
+# tests/test_sessions.py
+import datetime
+
+import pytest
+
+from gpmf import gps_time_span
+from sessions import group_sessions, parse_chapter_name
+from test_gpmf import _gps5_payload, _write_mp4
+
+START = datetime.datetime(2025, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+def _spans(**starts):
+    """time_span callable: file name -> (start, 600 s) from minute offsets."""
+    return lambda name: (
+        (START + datetime.timedelta(minutes=starts[name]), 600.0)
+        if name in starts
+        else None
+    )
+
+
+def test_parse_chapter_name_conventions():
+    assert parse_chapter_name("GX020229.MP4") == ("GX0229", 2)
+    assert parse_chapter_name("GOPR0229.MP4") == ("GP0229", 0)
+    assert parse_chapter_name("GP010229.MP4") == ("GP0229", 1)
+    assert parse_chapter_name("dashcam.mp4") is None
+
+
+def test_group_sessions_by_file_number():
+    sessions = group_sessions(["GX020229.MP4", "other.mp4", "GX010229.MP4"])
+    assert [session.chapters for session in sessions] == [
+        ["GX010229.MP4", "GX020229.MP4"],
+        ["other.mp4"],
+    ]
+
+
+def test_group_sessions_splits_chapters_apart_in_gps_time():
+    names = ["GX010229.MP4", "GX020229.MP4", "GX030229.MP4"]
+    # Chapter 3 starts 20 minutes after chapter 2 ended
+    spans = _spans(**{"GX010229.MP4": 0, "GX020229.MP4": 10, "GX030229.MP4": 40})
+    sessions = group_sessions(names, time_span=spans)
+    assert [session.chapters for session in sessions] == [
+        ["GX010229.MP4", "GX020229.MP4"],
+        ["GX030229.MP4"],
+    ]
+    assert sessions[1].name == "GX030229"
+
+
+def test_group_sessions_keeps_chapters_without_gps_time_together():
+    names = ["GX010229.MP4", "GX020229.MP4"]
+    sessions = group_sessions(names, time_span=_spans(**{"GX010229.MP4": 0}))
+    assert [session.chapters for session in sessions] == [names]
+
+
+def test_gps_time_span_reads_gpmf(tmp_path):
+    path = _write_mp4(
+        tmp_path / "GX010229.MP4",
+        [_gps5_payload(10), _gps5_payload(10, gpsu="250101120001.000")],
+    )
+    start, duration = gps_time_span(str(path))
+    assert start.replace(tzinfo=None) == datetime.datetime(2025, 1, 1, 12)
+    assert duration == pytest.approx(2.0)
+
+
+def test_session_metadata_needs_a_video(bare_processor):
+    with pytest.raises(ValueError, match="at least one video"):
+        bare_processor.extract_session_metadata([])
@@ -0,0 +1,113 @@
+# tests/test_telemetry.py
+import datetime
+
+import numpy as np
+import pytest
+
+from telemetry import Track
+
+
+def _track(lat, fix=None, dop=None, step_ms=1000):
+    lat = np.asarray(lat, dtype=np.float64)
+    return Track(
+        time=np.datetime64("2025-01-01T12:00:00", "ms")
+        + (np.arange(len(lat)) * step_ms).astype("timedelta64[ms]"),
+        lat=lat,
+        lon=np.full(len(lat), -78.0),
+        fix=fix,
+        dop=dop,
+        offset=np.arange(len(lat)) * step_ms / 1000,
+    )
+
+
+def test_gps_issues_flags_spike_but_not_its_good_neighbour():
+    # Index 1 jumps ~1.1 km and back; index 0 is only next to the spike
+    track = _track([35.0, 35.01, 35.0001, 35.0002, 35.0003])
+    assert track.gps_issues().tolist() == [None, "jump", None, None, None]
+
+
+def test_gps_issues_does_not_flag_last_point_next_to_spike():
+    track = _track([35.0, 35.0001, 35.0002, 35.01, 35.0003])
+    assert track.gps_issues().tolist() == [None, None, None, "jump", None]
+
+
+def test_gps_issues_reasons():
+    track = _track(
+        [0.0, 35.0001, 35.0002, 35.0003],
+        fix=[3, 0, 3, 3],
+        dop=[1.0, 1.0, 9.0, 1.0],
+    )
+    track.lon[0] = 0.0
+    assert track.gps_issues().tolist() == ["zero", "no_fix", "high_dop", None]
+
+
+def test_frame_issues_inherit_from_bracketing_points_and_flag_gaps():
+    track = _track([35.0, 35.01, 35.0001, 35.0002, 35.0003])
+    joined = track.join([0.5, 2.5, 3.0, 12.0], track.time[0].astype(object))
+    issues = track.frame_issues(joined).tolist()
+    assert issues == ["jump", None, None, "gap"]
+
+
+def test_join_interpolates_between_bracketing_points(make_track):
+    track = make_track(points=5)
+    joined = track.join([1.25, 3.0])
+    assert joined["before"].tolist() == [1, 3]
+    assert joined["after"].tolist() == [2, 4]
+    assert joined["index"].tolist() == [1, 3]
+    np.testing.assert_allclose(
+        joined["lat"], track.lat[0] + np.array([12.5, 30.0]) / 111_195
+    )
+    assert joined["time"][0] == track.time[1] + np.timedelta64(250, "ms")
+
+
+def test_join_nearest_takes_earlier_point_on_ties(make_track):
+    track = make_track(points=5)
+    joined = track.join([1.5, 1.6, 2.0], method="nearest")
+    assert joined["index"].tolist() == [1, 2, 2]
+    assert joined["lat"].tolist() == track.lat[[1, 2, 2]].tolist()
+
+
+def test_join_clamps_offsets_outside_the_track(make_track):
+    track = make_track(points=5)
+    joined = track.join([-3.0, 10.0])
+    assert joined["index"].tolist() == [0, 4]
+    assert joined["lat"].tolist() == [track.lat[0], track.lat[4]]
+
+
+def test_join_accepts_an_explicit_base_time(make_track):
+    track = make_track(points=5)
+    later = track.base_time + datetime.timedelta(seconds=2)
+    assert track.join([1.0], later)["index"].tolist() == [3]
+
+
+def test_join_rejects_unknown_method_and_empty_track(make_track):
+    with pytest.raises(ValueError, match="Unknown join method"):
+        make_track(points=5).join([0.0], method="cubic")
+    with pytest.raises(ValueError, match="empty track"):
+        _track([]).join([0.0])
+
+
+def test_join_interpolates_speed_and_dop_and_takes_nearest_fix():
+    track = _track([35.0, 35.0001, 35.0002], fix=[3, 2, 3], dop=[1.0, 3.0, 1.0])
+    track.speed_2d[:] = [10.0, 20.0, 30.0]
+    joined = track.join([0.25, 0.75, 1.5], track.time[0].astype(object))
+    np.testing.assert_allclose(joined["speed"], [12.5, 17.5, 25.0])
+    np.testing.assert_allclose(joined["dop"], [1.5, 2.5, 2.0])
+    assert joined["fix"].tolist() == [3, 2, 2]
+
+
+def test_join_interpolates_heading_across_north():
+    track = _track([35.0, 35.0001, 35.0002])
+    track._heading = np.array([350.0, 10.0, 10.0])
+    joined = track.join([0.5, 0.25], track.time[0].astype(object))
+    np.testing.assert_allclose(joined["heading"] % 360, [0.0, 355.0], atol=0.1)
+
+
+def test_join_nearest_copies_channels_without_interpolating():
+    track = _track([35.0, 35.0001, 35.0002], dop=[1.0, 3.0, 1.0])
+    track.speed_2d[:] = [10.0, 20.0, 30.0]
+    track._heading = np.array([350.0, 10.0, 10.0])
+    joined = track.join([0.4, 0.6], track.time[0].astype(object), method="nearest")
+    assert joined["speed"].tolist() == [10.0, 20.0]
+    assert joined["heading"].tolist() == [350.0, 10.0]
+    assert joined["dop"].tolist() == [1.0, 3.0]
@@ -0,0 +1,65 @@
+# tests/test_video_info.py
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import video_info
+from video_info import VideoInfo
+
+PROBE = {
+    "streams": [
+        {
+            "index": 0,
+            "codec_type": "video",
+            "width": 1920,
+            "height": 1080,
+            "avg_frame_rate": "30000/1001",
+            "nb_frames": "300",
+            "duration": "10.010000",
+            "start_time": "1.001000",
+        },
+        {"index": 3, "codec_type": "data", "codec_tag_string": "gpmd"},
+    ],
+    "format": {"duration": "10.010000", "tags": {"creation_time": "2025-01-01"}},
+}
+# Keyframes every 15 frames, timed from the 1.001 s start PTS
+PACKETS = "\n".join(
+    f"{1.001 + n * 1001 / 30000:.6f},{'K__' if n % 15 == 0 else '___'}"
+    for n in range(60)
+)
+
+
+@pytest.fixture
+def fake_ffprobe(monkeypatch):
+    def run(command, **kwargs):
+        output = PACKETS if "-select_streams" in command else json.dumps(PROBE)
+        return SimpleNamespace(stdout=output)
+
+    monkeypatch.setattr(video_info.subprocess, "run", run)
+
+
+def test_keyframe_indices_start_at_first_frame(fake_ffprobe, tmp_path):
+    video = tmp_path / "GX010229.MP4"
+    video.write_bytes(b"")
+    info = VideoInfo.probe(str(video), "ffprobe")
+    assert info.start_time == pytest.approx(1.001)
+    assert info.gpmd_stream_index == 3
+    assert info.get_keyframe_indices("ffprobe", cache_path=None) == [0, 15, 30, 45]
+
+
+def test_cache_entries_without_start_time_are_probed_again(fake_ffprobe, tmp_path):
+    video = tmp_path / "GX010229.MP4"
+    video.write_bytes(b"")
+    cache_path = tmp_path / "cache.json"
+    stale = VideoInfo.probe(str(video), "ffprobe").to_dict()
+    del stale["start_time"]
+    stale["keyframe_indices"] = [30, 45]
+    stat = video.stat()
+    key = VideoInfo.cache_key(str(video), stat.st_size, stat.st_mtime_ns)
+    cache_path.write_text(json.dumps({key: stale}))
+
+    info = VideoInfo.load(str(video), "ffprobe", cache_path=str(cache_path))
+
+    assert info.keyframe_indices is None
+    assert info.get_keyframe_indices("ffprobe", cache_path=None)[0] == 0
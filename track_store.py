@@ -0,0 +1,130 @@
+# track_store.py
+import os
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from logging_config import logger
+from telemetry import Track, read_gpx, read_track_header
+
+GPX_FOLDER = "GPX_files"
+TRACK_EXTENSION = ".track"
+
+
+class TrackStore:
+    """
+    The columnar ``.track`` files kept next to each GPX copy, opened with
+    ``numpy.memmap``.
+
+    Only the small JSON headers are read to find which tracks cover a time
+    range; the columns are mapped, not read, and slicing by time returns
+    views. Opening a month of fleet tracks therefore costs one header read
+    and one mapping per file.
+    """
+
+    def __init__(self, folder=GPX_FOLDER):
+        """
+        Args:
+            folder (str): Directory holding the ``.gpx`` and ``.track`` files.
+        """
+        self.folder = folder
+        self.headers = {}  # path -> header, filled by ``index``
+
+    def paths(self) -> list:
+        if not os.path.isdir(self.folder):
+            return []
+        return sorted(
+            os.path.join(self.folder, name)
+            for name in os.listdir(self.folder)
+            if name.endswith(TRACK_EXTENSION)
+        )
+
+    def index(self) -> dict:
+        """
+        Read the header of every track in the folder.
+
+        Returns:
+            dict: Track path -> header (count, start, end, base_time, source, columns).
+        """
+        self.headers = {}
+        for path in self.paths():
+            try:
+                self.headers[path] = read_track_header(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable track file {path}: {e}")
+        return self.headers
+
+    def load_range(self, start, end) -> dict:
+        """
+        Open every track with points in ``[start, end)``, sliced to that range.
+
+        Args:
+            start (datetime): Inclusive UTC start.
+            end (datetime): Exclusive UTC end.
+
+        Returns:
+            dict: Track name (video base name) -> memory-mapped Track.
+        """
+        headers = self.headers or self.index()
+        start, end = np.datetime64(start, "ms"), np.datetime64(end, "ms")
+
+        tracks = {}
+        for path, header in headers.items():
+            if not header["count"]:
+                continue
+            if (
+                np.datetime64(header["end"]) < start
+                or np.datetime64(header["start"]) >= end
+            ):
+                continue
+            track = Track.load(path).between(start, end)
+            if len(track):
+                name = os.path.basename(path)[: -len(TRACK_EXTENSION)]
+                tracks[name] = track
+        logger.info(
+            f"Opened {len(tracks)} tracks between {start} and {end} from {self.folder}."
+        )
+        return tracks
+
+    def load_day(self, day: datetime.date) -> dict:
+        """
+        Open every track with points on a UTC calendar day.
+
+        Args:
+            day (date): The day to load.
+
+        Returns:
+            dict: Track name -> memory-mapped Track sliced to the day.
+        """
+        start = datetime.datetime.combine(day, datetime.time())
+        return self.load_range(start, start + datetime.timedelta(days=1))
+
+    def backfill(self, max_workers=None) -> int:
+        """
+        Write a ``.track`` file for every GPX file in the folder that lacks one.
+
+        Args:
+            max_workers (int): Threads parsing GPX files at once.
+
+        Returns:
+            int: Number of track files written.
+        """
+        if not os.path.isdir(self.folder):
+            return 0
+        missing = [
+            os.path.join(self.folder, name)
+            for name in sorted(os.listdir(self.folder))
+            if name.lower().endswith(".gpx")
+            and not os.path.exists(
+                os.path.join(self.folder, os.path.splitext(name)[0] + TRACK_EXTENSION)
+            )
+        ]
+
+        def _convert(gpx_path):
+            track = read_gpx(gpx_path)
+            track.save(os.path.splitext(gpx_path)[0] + TRACK_EXTENSION)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_convert, missing))
+        self.headers = {}
+        logger.info(f"Wrote {len(missing)} track files in {self.folder}.")
+        return len(missing)
@@ -1,10 +1,7 @@
 import sqlite3
 
 
-conn = sqlite3.connect("v2_points.db")
-cursor = conn.cursor()
-
-command = """CREATE TABLE points (
+POINTS_TABLE_SCHEMA = """CREATE TABLE IF NOT EXISTS points (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     source_filename TEXT NOT NULL,
     frame_filename TEXT NOT NULL,
@@ -19,3 +16,12 @@ command = """CREATE TABLE points (
     analysis TEXT)"""
 
 
+def create_points_table(db_path="v2_points.db"):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(POINTS_TABLE_SCHEMA)
+    conn.close()
+
+
+if __name__ == "__main__":
+    create_points_table()
@@ -3,12 +3,26 @@ from datetime import datetime
 import os
 import sqlite3
 import json
+from concurrent.futures import ProcessPoolExecutor
 
 
+INSERT_POINT = """INSERT INTO points (source_filename, frame_filename, process_datetime, timestamp_ms, width, height, fps, analysis)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+SAMPLING_METHODS = ("grab", "seek", "read")
+
+
+def insert_points(rows, db_path="v2_points.db"):
+    """Write frame rows with one executemany in a single transaction."""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(INSERT_POINT, rows)
+    conn.close()
+
 
 class VideoProcessor:
     @staticmethod
-    def extract_all_frames(video, output_folder="v2_frames"):
+    def extract_all_frames(video, output_folder="v2_frames", db_path="v2_points.db"):
         cap = cv2.VideoCapture(video)
         if not cap.isOpened():
             raise RuntimeError(f'Cannot open video {video}')
@@ -16,11 +30,11 @@ class VideoProcessor:
         source_filename = os.path.basename(video)
         process_datetime = datetime.now()
         fps = cap.get(cv2.CAP_PROP_FPS)
+        width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        analysis = json.dumps({})
         
-        conn = sqlite3.connect("v2_points.db")
-        cursor = conn.cursor()
-        
-        
+        rows = []
         saved_count = 0
         
         while True: 
@@ -31,27 +45,31 @@ class VideoProcessor:
             filepath = f"{output_folder}/{filename}"
             cv2.imwrite(filepath, frame)
             
-            width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-            height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
             timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
-            analysis = json.dumps({})
-
-            
-            command = """INSERT INTO points (source_filename, frame_filename, process_datetime, timestamp_ms, width, height, fps, analysis)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
-                
-            cursor.execute(command, (source_filename, filename, process_datetime, timestamp_ms, width, height, fps, analysis))
-                
+            rows.append((source_filename, filename, process_datetime, timestamp_ms, width, height, fps, analysis))
             saved_count += 1
             
         cap.release()
-        conn.commit()
-        cursor.close()
+        if db_path:
+            insert_points(rows, db_path)
         
         print(f"Extracted {saved_count} frames.")
+        return rows
 
     @staticmethod
-    def extract_frame_per_x_seconds(video, seconds, output_folder="v2_frames"):
+    def extract_frame_per_x_seconds(video, seconds, output_folder="v2_frames", method="grab", db_path="v2_points.db"):
+        """
+        Save one frame every ``seconds`` seconds and record a row per frame.
+
+        method "grab" demuxes skipped frames with ``grab()`` and only decodes
+        the kept ones; "seek" jumps straight to each kept frame, which wins
+        when frames are far apart relative to the keyframe interval; "read"
+        decodes every frame (the original loop, kept for benchmarking).
+        Rows are returned, and written in one transaction unless ``db_path`` is None.
+        """
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method '{method}'. Choose from: {', '.join(SAMPLING_METHODS)}")
+        
         cap = cv2.VideoCapture(video)
         if not cap.isOpened():
             raise RuntimeError(f'Cannot open video {video}')
@@ -59,52 +77,78 @@ class VideoProcessor:
         source_filename = os.path.basename(video)
         process_datetime = datetime.now()
         fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_interval = int(fps*seconds)
-        
-        conn = sqlite3.connect("v2_points.db")
-        cursor = conn.cursor()
+        frame_interval = max(int(fps*seconds), 1)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        analysis = json.dumps({})
+        if method == "seek" and total_frames <= 0:
+            method = "grab"  # Container has no frame count to seek against
         
+        rows = []
         frame_count = 0
         saved_count = 0
         
-        while True: 
-            ret, frame = cap.read()
+        while method != "seek" or frame_count < total_frames:
+            if method == "seek":
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count)
+            
+            keep = frame_count % frame_interval == 0
+            if method == "read" or keep:
+                ret, frame = cap.read()
+            else:
+                ret, frame = cap.grab(), None
             if not ret:
                 break
             
-            if frame_count % frame_interval == 0:
-                filename = f"frame_{saved_count:04d}.png"
+            if keep:
+                filename = f"{source_filename}_{saved_count:04d}.png"
                 filepath = f"{output_folder}/{filename}"
                 cv2.imwrite(filepath, frame)
                 
-                width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-                height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
                 timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
-                analysis = json.dumps({})
-                
-                command = """INSERT INTO points (source_filename, frame_filename, process_datetime, timestamp_ms, width, height, fps, analysis)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
-                
-                cursor.execute(command, (source_filename, filename, process_datetime, timestamp_ms, width, height, fps, analysis))
-                
+                rows.append((source_filename, filename, process_datetime, timestamp_ms, width, height, fps, analysis))
                 saved_count += 1
             
-            frame_count += 1
+            frame_count += frame_interval if method == "seek" else 1
             
         cap.release()
-        conn.commit()
-        cursor.close()
+        if db_path:
+            insert_points(rows, db_path)
         
-        print(f"Extracted {saved_count} frames from a total of {frame_count} (ratio: {(saved_count/frame_count * fps):.1f})")
+        frame_count = min(frame_count, total_frames) if total_frames > 0 else frame_count
+        print(f"Extracted {saved_count} frames from a total of {frame_count} (ratio: {(saved_count/max(frame_count, 1) * fps):.1f})")
+        return rows
         
     @staticmethod
-    def extract_frames(video:str, seconds_per_frame=None, output_folder:str="v2_frames"):
+    def extract_frames(video:str, seconds_per_frame=None, output_folder:str="v2_frames", method:str="grab", db_path="v2_points.db"):
         
         
         if seconds_per_frame:
-            VideoProcessor.extract_frame_per_x_seconds(video, seconds_per_frame, output_folder)
+            return VideoProcessor.extract_frame_per_x_seconds(video, seconds_per_frame, output_folder, method, db_path)
         else: 
-            VideoProcessor.extract_all_frames(video, output_folder)
+            return VideoProcessor.extract_all_frames(video, output_folder, db_path)
+    
+    @staticmethod
+    def extract_videos(videos:list, seconds_per_frame=None, output_folder:str="v2_frames", method:str="grab", db_path="v2_points.db", max_workers=None):
+        """
+        Extract frames from several videos in a process pool.
+
+        Workers only decode and save frames; the parent writes every row in
+        one transaction, so processes never contend for the sqlite lock.
+        """
+        rows = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(VideoProcessor.extract_frames, video, seconds_per_frame, output_folder, method, None)
+                for video in videos
+            ]
+            for future in futures:
+                rows.extend(future.result())
+        
+        if db_path:
+            insert_points(rows, db_path)
+        return rows
         
     
     
@@ -116,4 +160,4 @@ def main():
     VideoProcessor.extract_frames(video)
     
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
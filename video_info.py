@@ -0,0 +1,252 @@
+# video_info.py
+import os
+import json
+import subprocess
+import threading
+from fractions import Fraction
+from logging_config import logger
+
+VIDEO_INFO_CACHE = "video_info_cache.json"
+
+_cache_lock = threading.Lock()
+
+
+class VideoInfo:
+    """
+    Everything the pipeline needs to know about a video file, from a single
+    ffprobe call.
+
+    Results are cached on disk keyed by path, size and modification time, so
+    reprocessing an unchanged file never runs ffprobe again.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        size: int,
+        mtime_ns: int,
+        width: int,
+        height: int,
+        frame_rate: str,
+        frame_count: int,
+        duration: float,
+        video_stream_index: int,
+        gpmd_stream_index: int = None,
+        creation_time: str = None,
+        streams: list = None,
+        keyframe_indices: list = None,
+        start_time: float = 0.0,
+    ):
+        self.video_path = video_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate  # Exact rational as a string, e.g. "30000/1001"
+        self.frame_count = frame_count
+        self.duration = duration
+        self.video_stream_index = video_stream_index
+        self.gpmd_stream_index = gpmd_stream_index
+        self.creation_time = creation_time
+        self.streams = streams or []
+        self.keyframe_indices = keyframe_indices  # Filled in on first request
+        self.start_time = start_time  # PTS of the video stream's first frame, seconds
+
+    @property
+    def fps(self) -> float:
+        return float(Fraction(self.frame_rate))
+
+    @property
+    def fraction(self) -> Fraction:
+        return Fraction(self.frame_rate)
+
+    @staticmethod
+    def cache_key(video_path, size, mtime_ns) -> str:
+        return f"{os.path.abspath(video_path)}|{size}|{mtime_ns}"
+
+    def to_dict(self):
+        return {
+            "video_path": self.video_path,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "width": self.width,
+            "height": self.height,
+            "frame_rate": self.frame_rate,
+            "frame_count": self.frame_count,
+            "duration": self.duration,
+            "video_stream_index": self.video_stream_index,
+            "gpmd_stream_index": self.gpmd_stream_index,
+            "creation_time": self.creation_time,
+            "streams": self.streams,
+            "keyframe_indices": self.keyframe_indices,
+            "start_time": self.start_time,
+        }
+
+    @classmethod
+    def load(cls, video_path, ffprobe_path, cache_path=VIDEO_INFO_CACHE):
+        """
+        Return the VideoInfo for a file, probing it only if the cache has no
+        entry for its current size and modification time.
+
+        Args:
+            video_path (str): Path to the video file.
+            ffprobe_path (str): Path to the ffprobe binary.
+            cache_path (str): JSON cache file; None disables the disk cache.
+
+        Returns:
+            VideoInfo: Probed or cached information about the video.
+        """
+        stat = os.stat(video_path)
+        key = cls.cache_key(video_path, stat.st_size, stat.st_mtime_ns)
+
+        cache = _read_cache(cache_path)
+        # Entries written before start_time was recorded have shifted keyframes
+        if key in cache and "start_time" in cache[key]:
+            logger.info(f"Using cached video info for {video_path}.")
+            return cls(**cache[key])
+
+        info = cls.probe(video_path, ffprobe_path, stat)
+        info.save(cache_path)
+        return info
+
+    @classmethod
+    def probe(cls, video_path, ffprobe_path, stat=None):
+        """
+        Run ffprobe once over the container and all of its streams.
+
+        Args:
+            video_path (str): Path to the video file.
+            ffprobe_path (str): Path to the ffprobe binary.
+            stat (os.stat_result): Stat of the file, if already taken.
+
+        Returns:
+            VideoInfo: Information about the video.
+        """
+        stat = stat or os.stat(video_path)
+        command = [
+            ffprobe_path,
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration:format_tags=creation_time:"
+            "stream=index,codec_type,codec_name,codec_tag_string,width,height,"
+            "nb_frames,avg_frame_rate,r_frame_rate,duration,start_time:"
+            "stream_tags=handler_name",
+            "-of",
+            "json",
+            video_path,
+        ]
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        probe = json.loads(result.stdout)
+        streams = probe.get("streams", [])
+        container = probe.get("format", {})
+
+        video = next(s for s in streams if s.get("codec_type") == "video")
+        frame_rate = video.get("avg_frame_rate", "0/0")
+        if frame_rate in ("0/0", ""):
+            frame_rate = video["r_frame_rate"]
+        # Keep fractional rates like "30000/1001" exact; segment seeks depend on it
+        frame_rate = str(Fraction(frame_rate))
+
+        duration = float(video.get("duration") or container.get("duration") or 0)
+        if video.get("nb_frames", "N/A") != "N/A":
+            frame_count = int(video["nb_frames"])
+        else:
+            frame_count = int(round(duration * Fraction(frame_rate)))
+
+        gpmd_stream_index = next(
+            (
+                s["index"]
+                for s in streams
+                if s.get("codec_tag_string") == "gpmd"
+                or "GoPro MET" in s.get("tags", {}).get("handler_name", "")
+            ),
+            None,
+        )
+
+        logger.info(
+            f"Probed {video_path}: {video['width']}x{video['height']} at {frame_rate} fps, "
+            f"{frame_count} frames, GPMD stream {gpmd_stream_index}."
+        )
+        return cls(
+            video_path=video_path,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            width=int(video["width"]),
+            height=int(video["height"]),
+            frame_rate=frame_rate,
+            frame_count=frame_count,
+            duration=duration,
+            video_stream_index=video["index"],
+            gpmd_stream_index=gpmd_stream_index,
+            creation_time=container.get("tags", {}).get("creation_time"),
+            streams=streams,
+            start_time=float(video.get("start_time") or 0),
+        )
+
+    def get_keyframe_indices(self, ffprobe_path, cache_path=VIDEO_INFO_CACHE) -> list:
+        """
+        List the frame indices of the keyframes in the video stream.
+
+        Only packet headers are read (no decoding). Packet times are taken
+        relative to the stream's ``start_time``, so index 0 is the first
+        frame. The result is stored with the rest of the info, so it is read
+        once per file.
+
+        Args:
+            ffprobe_path (str): Path to the ffprobe binary.
+            cache_path (str): JSON cache file; None disables the disk cache.
+
+        Returns:
+            list[int]: Sorted frame indices of keyframes.
+        """
+        if self.keyframe_indices is not None:
+            return self.keyframe_indices
+
+        command = [
+            ffprobe_path,
+            "-v",
+            "error",
+            "-select_streams",
+            f"{self.video_stream_index}",
+            "-show_entries",
+            "packet=pts_time,flags",
+            "-of",
+            "csv=p=0",
+            self.video_path,
+        ]
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        indices = set()
+        for line in result.stdout.splitlines():
+            pts_time, _, flags = line.partition(",")
+            if "K" in flags and pts_time not in ("", "N/A"):
+                indices.add(round((float(pts_time) - self.start_time) * self.fps))
+
+        self.keyframe_indices = sorted(indices)
+        self.save(cache_path)
+        return self.keyframe_indices
+
+    def save(self, cache_path=VIDEO_INFO_CACHE):
+        """Write this entry into the disk cache."""
+        if not cache_path:
+            return
+        with _cache_lock:
+            cache = _read_cache(cache_path)
+            cache[self.cache_key(self.video_path, self.size, self.mtime_ns)] = (
+                self.to_dict()
+            )
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, "w") as cache_file:
+                json.dump(cache, cache_file, indent=2)
+            os.replace(temp_path, cache_path)
+
+
+def _read_cache(cache_path) -> dict:
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path) as cache_file:
+            return json.load(cache_file)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable video info cache {cache_path}: {e}")
+        return {}
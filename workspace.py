@@ -0,0 +1,68 @@
+# workspace.py
+import os
+import shutil
+import tempfile
+from logging_config import logger
+
+TMPFS_ROOT = "/dev/shm"
+TMPFS_MIN_FREE_BYTES = 4 * 1024**3  # Leave RAM-backed space alone below this
+
+
+class Workspace:
+    """
+    Private working directory for one pipeline run.
+
+    Holds the run's temporary metadata files, extracted frames and work order
+    frames, so several videos can be processed at the same time. Use it as a
+    context manager; the directory is removed on exit whether or not the run
+    succeeded.
+    """
+
+    def __init__(self, name="pipeline", root=None, use_tmpfs=True, path=None):
+        """
+        Args:
+            name (str): Prefix for the directory name, e.g. the video name.
+            root (str): Parent directory. Defaults to tmpfs when available
+                and large enough, otherwise the system temp directory.
+            use_tmpfs (bool): Allow the RAM-backed default root.
+            path (str): Use this existing directory instead of creating one.
+                It is not removed on cleanup.
+        """
+        self.owned = path is None
+        if path is None:
+            root = root or self.default_root(use_tmpfs)
+            path = tempfile.mkdtemp(prefix=f"{name}_", dir=root)
+        self.path = path
+
+        self.frames_dir = os.path.join(self.path, "frames")
+        self.work_order_dir = os.path.join(self.path, "work_order_frames")
+        self.bin_file = os.path.join(self.path, "temp_metadata.bin")
+        self.gpx_file = os.path.join(self.path, "temp_metadata.gpx")
+        os.makedirs(self.frames_dir, exist_ok=True)
+        os.makedirs(self.work_order_dir, exist_ok=True)
+
+    @classmethod
+    def current_directory(cls):
+        """The fixed paths in the working directory used before workspaces existed."""
+        return cls(path=".")
+
+    @staticmethod
+    def default_root(use_tmpfs=True):
+        if use_tmpfs and os.path.isdir(TMPFS_ROOT) and os.access(TMPFS_ROOT, os.W_OK):
+            if shutil.disk_usage(TMPFS_ROOT).free >= TMPFS_MIN_FREE_BYTES:
+                return TMPFS_ROOT
+        return tempfile.gettempdir()
+
+    def cleanup(self):
+        """Remove the workspace directory, if this workspace created it."""
+        if self.owned and os.path.isdir(self.path):
+            shutil.rmtree(self.path, ignore_errors=True)
+            logger.info(f"Removed workspace {self.path}")
+
+    def __enter__(self):
+        logger.info(f"Using workspace {self.path}")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False